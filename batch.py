@@ -0,0 +1,129 @@
+"""Render parameterized scene variants from a manifest, without prompts.
+
+    python batch.py batch.example.toml
+    python batch.py jobs.json -j 4
+
+A manifest (TOML or JSON) has optional defaults at the top level and a list
+of ``jobs``; every job names a scene and may set its ``quality``, its output
+``name`` and ``params``, which override that scene's class attributes
+(``title`` of ``TitleVideo``, ``field`` of ``ContinuousMotion``, durations,
+resolutions...)::
+
+    module = "scenes"
+    quality = "l"
+
+    [[jobs]]
+    scene = "TitleVideo"
+    name = "ep01_title"
+    params = { title = "Episódio 1" }
+
+Jobs run in a pool of long-lived worker processes.  Each worker imports the
+scenes of the manifest once and keeps them, with the TeX, streamline and field caches it
+has warmed, for every job it takes; the TeX strings of the module are also
+batch-compiled once up front (see ``tex_batch.py``).
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from manim import tempconfig
+
+from render_all import QUALITIES, add_diagnostic_options, export_diagnostics, render_scene
+from tex_batch import precompile_module
+
+
+def load_manifest(path):
+    path = Path(path)
+    with open(path, "rb") as f:
+        manifest = json.load(f) if path.suffix == ".json" else tomllib.load(f)
+    defaults = {key: value for key, value in manifest.items() if key != "jobs"}
+    jobs = []
+    for i, job in enumerate(manifest.get("jobs", [])):
+        if "scene" not in job:
+            raise ValueError(f"job {i} of {path} has no scene")
+        job = {**defaults, **job}
+        job.setdefault("module", "scenes")
+        job.setdefault("quality", "l")
+        job.setdefault("media_dir", "./media")
+        job.setdefault("name", f"{job['scene']}_{i:03d}")
+        job.setdefault("params", {})
+        if job["quality"] not in QUALITIES:
+            raise ValueError(f"job {job['name']}: unknown quality {job['quality']!r}, expected one of {', '.join(QUALITIES)}")
+        jobs.append(job)
+    names = [job["name"] for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate job names: {', '.join(duplicates)}")
+    return jobs
+
+
+def _warm_up(scenes):
+    # runs once per worker; the scenes stay imported for all of its jobs
+    for module_name, scene_name in scenes:
+        getattr(importlib.import_module(module_name), scene_name)
+
+
+def run_job(job):
+    return render_scene(
+        job["module"],
+        job["scene"],
+        QUALITIES[job["quality"]],
+        job["media_dir"],
+        job["params"],
+        job["name"],
+    )
+
+
+def run_batch(jobs, workers=None):
+    modules = sorted({job["module"] for job in jobs})
+    start = time.perf_counter()
+    for name in modules:
+        for media_dir in sorted({job["media_dir"] for job in jobs if job["module"] == name}):
+            with tempconfig({"media_dir": media_dir}):
+                precompile_module(importlib.import_module(name))
+
+    results, failures = {}, {}
+    with ProcessPoolExecutor(
+        max_workers=workers or min(len(jobs), os.cpu_count()),
+        initializer=_warm_up,
+        initargs=(sorted({(job["module"], job["scene"]) for job in jobs}),),
+    ) as pool:
+        futures = {pool.submit(run_job, job): job["name"] for job in jobs}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                failures[name] = e
+                print(f"failed: {name}: {e}", flush=True)
+            else:
+                print(f"done: {name} ({results[name][1]:.1f}s)", flush=True)
+    total = time.perf_counter() - start
+
+    width = max(len(job["name"]) for job in jobs)
+    print(f"\n{'job':<{width}}  {'wall (s)':>9}  {'cpu (s)':>9}  movie")
+    for job in jobs:
+        if job["name"] in results:
+            path, wall, cpu = results[job["name"]]
+            print(f"{job['name']:<{width}}  {wall:>9.2f}  {cpu:>9.2f}  {path}")
+    print(f"{'total':<{width}}  {total:>9.2f}")
+    if failures:
+        raise SystemExit(f"{len(failures)} of {len(jobs)} jobs failed")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the jobs of a batch manifest")
+    parser.add_argument("manifest")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    add_diagnostic_options(parser)
+    args = parser.parse_args()
+
+    export_diagnostics(args)
+    run_batch(load_manifest(args.manifest), args.workers)
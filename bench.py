@@ -0,0 +1,409 @@
+"""Benchmarks of the field/streamline/surface primitives and of every scene.
+
+    python bench.py run                        # everything, results in media/benchmarks
+    python bench.py run --micro -k streamlines
+    python bench.py run --macro -o before.json
+    python bench.py run --startup
+    python bench.py compare before.json after.json --threshold 0.1
+    python bench.py list
+
+Micro-benchmarks time one construction or evaluation, stock manim classes
+next to the batch ones of this repo, at several sizes.  Each is called enough
+times per sample to last about 0.2 s, and ``--repeat`` samples are taken.
+
+Startup benchmarks time fresh interpreters from launch to exit: listing the
+scenes, importing one scene, and rendering a title card.  A first run, which
+compiles bytecode and fills the text cache, is left out of the samples.
+
+Macro-benchmarks render each scene of the ``scenes`` package at low quality
+with ``dry_run``: every frame is rasterized but nothing is encoded or written.
+Each render runs in a fresh process with empty streamline and text caches;
+the TeX of the module is compiled once beforehand, outside the timings, since
+that cost depends on the LaTeX installation rather than on this code.
+
+Results are JSON files with the timings and a description of the machine
+(CPU, core count, Python/NumPy/manim versions, git commit).  ``compare``
+lines up two of them and exits with status 1 when a benchmark got slower
+than ``threshold`` allows.  Nothing needs network access or a GPU.
+"""
+
+import argparse
+import fnmatch
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+
+from manim import ArrowVectorField, StreamLines, Surface, __version__ as manim_version, config, tempconfig
+
+from field_dsl import expression_field
+from fields import BatchStreamLines, PackedArrowVectorField, as_batch_field
+from morph import DepthSortedCamera, MorphSurface, cylinder_breaks, cylinder_uv, sphere_uv
+from particles import ParticleCloud
+from render_all import scene_names
+from streamline_cache import default_cache as streamline_cache
+from surfaces import BatchSurface
+from tex_batch import precompile_module
+from text_cache import default_cache as text_cache
+
+RESULTS_VERSION = 1
+SAMPLE_SECONDS = 0.2
+# opt-in render instrumentation, kept out of timed runs
+INSTRUMENTATION = ("PROFILE_RENDERS", "MEMORY_WATCH", "MEMORY_BUDGET_MB")
+
+# ContinuousMotion's field, as a per-point lambda and as an expression
+FIELD = lambda pos: np.array([np.sin(pos[0] / 2) - np.cos(pos[1] / 2), np.sin(pos[0] / 2), 0 * pos[0]])
+FIELD_EXPRESSION = "[sin(x / 2) - cos(y / 2), sin(x / 2)]"
+# Mountain's surface, without its axes
+SURFACE = lambda u, v: np.array([u, v, np.sin(u) * np.cos(v)])
+
+MICRO = {}
+
+# fresh-interpreter commands, run from this directory with {media_dir!r} filled in
+STARTUP = {
+    "startup/list_scenes": ["render_all.py", "--list"],
+    "startup/import_scene[TitleVideo]": ["-c", "import scenes; scenes.TitleVideo"],
+    "startup/render_scene[TitleVideo]": [
+        "-c",
+        "import scenes; from manim import tempconfig\n"
+        "options = {'quality': 'low_quality', 'media_dir': {media_dir!r}, 'dry_run': True, "
+        "'progress_bar': 'none', 'verbosity': 'WARNING'}\n"
+        "scenes.TitleVideo.title = 'Benchmark'\n"
+        "with tempconfig(options): scenes.TitleVideo().render()",
+    ],
+}
+
+
+def micro(group, **params):
+    """Register ``setup(**params) -> callable`` for every combination of ``params``."""
+
+    def register(setup):
+        keys = list(params)
+        for values in product(*params.values()):
+            combination = dict(zip(keys, values))
+            label = ",".join(f"{k}={v}" for k, v in combination.items())
+            MICRO[f"{group}/{setup.__name__}[{label}]"] = (setup, combination)
+        return setup
+
+    return register
+
+
+def plane_points(step):
+    x, y = np.meshgrid(np.arange(-7, 7 + step / 2, step), np.arange(-4, 4 + step / 2, step))
+    return np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+
+
+@micro("field", step=[0.5, 0.1])
+def per_point(step):
+    points = plane_points(step)
+    return lambda: np.array([FIELD(p) for p in points])
+
+
+@micro("field", step=[0.5, 0.1])
+def batch(step):
+    points = plane_points(step)
+    field = as_batch_field(FIELD)
+    field.batch(points)  # the vectorization check runs once
+    return lambda: field.batch(points)
+
+
+@micro("field", step=[0.5, 0.1])
+def expression(step):
+    points = plane_points(step)
+    field = expression_field(FIELD_EXPRESSION)
+    field.batch(points)
+    return lambda: field.batch(points)
+
+
+@micro("arrows", step=[1, 0.5, 0.25])
+def arrow_vector_field(step):
+    return lambda: ArrowVectorField(FIELD, x_range=[-7, 7, step], y_range=[-4, 4, step])
+
+
+@micro("arrows", step=[1, 0.5, 0.25])
+def packed_arrow_vector_field(step):
+    return lambda: PackedArrowVectorField(FIELD, x_range=[-7, 7, step], y_range=[-4, 4, step])
+
+
+@micro("streamlines", step=[1, 0.5])
+def stream_lines(step):
+    return lambda: StreamLines(FIELD, x_range=[-7, 7, step], y_range=[-4, 4, step], stroke_width=1, max_anchors_per_line=10)
+
+
+@micro("streamlines", step=[1, 0.5])
+def batch_stream_lines(step):
+    return lambda: BatchStreamLines(
+        FIELD, x_range=[-7, 7, step], y_range=[-4, 4, step], stroke_width=1, max_anchors_per_line=10
+    )
+
+
+@micro("streamlines", separation=[0.5, 0.35])
+def even_stream_lines(separation):
+    return lambda: BatchStreamLines(FIELD, stroke_width=1, max_anchors_per_line=10, seeding="even", separation=separation)
+
+
+@micro("particles", count=[10000, 50000])
+def particle_step(count):
+    cloud = ParticleCloud(expression_field(FIELD_EXPRESSION), count=count)
+    return lambda: cloud.step(1 / 30)
+
+
+@micro("morph", resolution=[18, 36])
+def morph_frame(resolution):
+    # what a frame of Axes3DExplanation's morph costs before drawing: blend, order, shading
+    morph = MorphSurface(sphere_uv(2), cylinder_uv(2, 0.1), resolution=resolution, v_breaks=cylinder_breaks(2, 0.1))
+    camera = DepthSortedCamera()
+    light = camera.light_source.points[0]
+    alphas = iter(np.linspace(0, 1, 1000000))
+
+    def frame():
+        morph.set_blend(next(alphas))
+        camera.get_mobjects_to_display([morph])
+        morph.light_offsets(light)
+
+    return frame
+
+
+@micro("surface", resolution=[16, 32, 64])
+def surface(resolution):
+    return lambda: Surface(SURFACE, u_range=[0, 5], v_range=[0, 5], resolution=resolution)
+
+
+@micro("surface", resolution=[16, 32, 64])
+def batch_surface(resolution):
+    return lambda: BatchSurface(SURFACE, u_range=[0, 5], v_range=[0, 5], resolution=resolution)
+
+
+@micro("surface", resolution=[16, 32, 64])
+def adaptive_surface(resolution):
+    return lambda: BatchSurface(
+        SURFACE, u_range=[0, 5], v_range=[0, 5], resolution=resolution, base_resolution=8, tolerance=0.02
+    )
+
+
+def summarize(times, **extra):
+    return {
+        **extra,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def time_micro(setup, params, repeat):
+    """Seconds per call of the benchmark, ``repeat`` samples."""
+    call = setup(**params)
+    start = time.perf_counter()
+    call()
+    first = time.perf_counter() - start
+    number = max(1, int(SAMPLE_SECONDS / max(first, 1e-9)))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        times.append((time.perf_counter() - start) / number)
+    return summarize(times, kind="micro", params=params, number=number)
+
+
+def time_startup(arguments, media_dir, repeat):
+    """Seconds from launch to exit of a fresh interpreter, ``repeat`` samples."""
+    command = [sys.executable, *(a.replace("{media_dir!r}", repr(media_dir)) for a in arguments)]
+    env = {k: v for k, v in os.environ.items() if k not in (*INSTRUMENTATION, "RENDER_PREVIEW")}
+    env["TEXT_CACHE_DIR"] = str(Path(media_dir) / "text")
+    env["STREAMLINE_CACHE_DIR"] = str(Path(media_dir) / "streamlines")
+    times = []
+    for i in range(repeat + 1):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=Path(__file__).parent, env=env, check=True, stdout=subprocess.DEVNULL)
+        if i:
+            times.append(time.perf_counter() - start)
+    return summarize(times, kind="startup", params={"command": arguments})
+
+
+def render_macro(module_name, scene_name, media_dir):
+    """Render one scene without output; runs in its own process."""
+    for name in INSTRUMENTATION:
+        os.environ.pop(name, None)
+    # every run lays out its texts and integrates its streamlines from
+    # scratch, in caches of its own
+    for cache, name in ((streamline_cache, "streamlines"), (text_cache, "text")):
+        cache.directory = Path(media_dir) / name
+        cache.clear()
+    module = importlib.import_module(module_name)
+    options = {"quality": "low_quality", "media_dir": media_dir, "dry_run": True, "progress_bar": "none", "verbosity": "WARNING"}
+    with tempconfig(options):
+        scene = getattr(module, scene_name)()
+        start = time.perf_counter()
+        scene.render()
+        seconds = time.perf_counter() - start
+        frames = round(scene.renderer.time * config.frame_rate)
+    return seconds, frames
+
+
+def time_macro(module_name, scene_name, media_dir, repeat):
+    times = []
+    for _ in range(repeat):
+        # a fresh interpreter per render, so no run inherits another's warm state
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            seconds, frames = pool.submit(render_macro, module_name, scene_name, media_dir).result()
+        times.append(seconds)
+    return summarize(times, kind="macro", params={"quality": "low_quality"}, frames=frames)
+
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True
+        )
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=Path(__file__).parent, capture_output=True, text=True
+        )
+    except OSError:
+        return None
+    if result.returncode:
+        return None
+    return result.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+
+
+def cpu_model():
+    try:
+        for line in Path("/proc/cpuinfo").read_text().splitlines():
+            if line.startswith("model name"):
+                return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def machine_info():
+    return {
+        "cpu": cpu_model(),
+        "cores": os.cpu_count(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "manim": manim_version,
+        "commit": git_commit(),
+        # thread pools of the BLAS NumPy is linked against
+        "threads": {key: os.environ[key] for key in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS") if key in os.environ},
+    }
+
+
+def run(patterns=None, kinds=("micro", "startup", "macro"), repeat=5, macro_repeat=1, module_name="scenes", output=None):
+    selected = lambda name: not patterns or any(fnmatch.fnmatch(name, f"*{p}*") for p in patterns)
+    results = {}
+
+    if "micro" in kinds:
+        for name, (setup, params) in MICRO.items():
+            if selected(name):
+                results[name] = time_micro(setup, params, repeat)
+                print(f"{name:<56} {results[name]['median'] * 1e3:>10.2f} ms", flush=True)
+
+    if "startup" in kinds:
+        with tempfile.TemporaryDirectory(prefix="bench-") as media_dir:
+            for name, arguments in STARTUP.items():
+                if selected(name):
+                    results[name] = time_startup(arguments, media_dir, repeat)
+                    print(f"{name:<56} {results[name]['median'] * 1e3:>10.0f} ms", flush=True)
+
+    if "macro" in kinds:
+        module = importlib.import_module(module_name)
+        scenes = [name for name in scene_names(module) if selected(f"scene/{name}")]
+        with tempfile.TemporaryDirectory(prefix="bench-") as media_dir:
+            if scenes:
+                with tempconfig({"quality": "low_quality", "media_dir": media_dir}):
+                    precompile_module(module)
+            for scene_name in scenes:
+                name = f"scene/{scene_name}"
+                results[name] = time_macro(module_name, scene_name, media_dir, macro_repeat)
+                print(f"{name:<56} {results[name]['median']:>10.2f} s", flush=True)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "options": {"repeat": repeat, "macro_repeat": macro_repeat, "module": module_name},
+        "results": results,
+    }
+    if output is None:
+        output = Path("media") / "benchmarks" / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(json.dumps(report, indent=1))
+    print(f"\n{output}")
+    return report
+
+
+def compare(base_path, new_path, threshold=0.1, stat="median"):
+    """Print the change of every benchmark in both files; returns the regressions."""
+    base, new = json.loads(Path(base_path).read_text()), json.loads(Path(new_path).read_text())
+    for key in ("cpu", "cores", "python", "numpy", "manim"):
+        if base["machine"].get(key) != new["machine"].get(key):
+            print(f"warning: {key} differs: {base['machine'].get(key)} -> {new['machine'].get(key)}")
+
+    names = [name for name in base["results"] if name in new["results"]]
+    regressions = []
+    width = max([len(name) for name in names] + [9])
+    print(f"{'benchmark':<{width}}  {'before':>10}  {'after':>10}  {'change':>8}")
+    for name in names:
+        before, after = base["results"][name][stat], new["results"][name][stat]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold:
+            flag = "SLOWER"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            flag = "faster"
+        else:
+            flag = ""
+        print(f"{name:<{width}}  {before:>10.4f}  {after:>10.4f}  {ratio - 1:>+7.1%}  {flag}")
+    for name in sorted(set(base["results"]) ^ set(new["results"])):
+        print(f"{name:<{width}}  only in {base_path if name in base['results'] else new_path}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the primitives and scenes")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run benchmarks and save the results")
+    run_parser.add_argument("-k", "--select", nargs="+", default=None, help="substrings of the benchmark names")
+    kind = run_parser.add_mutually_exclusive_group()
+    kind.add_argument("--micro", action="store_const", dest="kinds", const=("micro",))
+    kind.add_argument("--startup", action="store_const", dest="kinds", const=("startup",))
+    kind.add_argument("--macro", action="store_const", dest="kinds", const=("macro",))
+    run_parser.add_argument("-r", "--repeat", type=int, default=5, help="samples per micro or startup benchmark")
+    run_parser.add_argument("--macro-repeat", type=int, default=1, help="renders per scene")
+    run_parser.add_argument("-m", "--module", default="scenes")
+    run_parser.add_argument("-o", "--output", default=None)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=0.1, help="relative slowdown to flag")
+    compare_parser.add_argument("--stat", choices=("min", "median", "mean"), default="median")
+
+    commands.add_parser("list", help="list the micro and startup benchmarks")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.select, args.kinds or ("micro", "startup", "macro"), args.repeat, args.macro_repeat, args.module, args.output)
+    elif args.command == "compare":
+        regressions = compare(args.base, args.new, args.threshold, args.stat)
+        if regressions:
+            sys.exit(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    else:
+        print("\n".join([*MICRO, *STARTUP]))
@@ -0,0 +1,170 @@
+"""Divergence, curl and gradient of fields on a grid, drawn as a heatmap.
+
+The derivatives are central finite differences (``np.gradient``) over a
+regular grid on which the field is evaluated in one batch, so any field
+accepted by ``axis_vector_field`` works, time-dependent ones included.
+``FieldHeatmap`` shows one of these quantities as a single ``ImageMobject``
+stretched over the plane; every frame of a time-dependent field only rewrites
+its pixel array.
+"""
+
+import warnings
+from math import ceil, floor
+
+import numpy as np
+
+from manim import BLACK, BLUE_E, RED_E, WHITE, YELLOW, ImageMobject, config
+from manim.mobject.types.image_mobject import RESAMPLING_ALGORITHMS
+from manim.utils.color import ManimColor
+
+from fields import BatchField, as_batch_field, as_time_field, is_time_dependent
+from preview import coarser
+
+DIVERGING_COLORS = [BLUE_E, WHITE, RED_E]
+SEQUENTIAL_COLORS = [BLACK, RED_E, YELLOW]
+
+
+def evaluate_scalar(func, points):
+    """A scalar field ``pos -> value`` over (N, 3) points, in one call when possible."""
+    expected = np.array([func(p) for p in points[:5]], dtype=float)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            values = np.asarray(func(points.T), dtype=float)
+        if values.shape == (len(points),) and np.allclose(values[:5], expected, equal_nan=True):
+            return values
+    except Exception:
+        pass
+    return np.array([func(p) for p in points], dtype=float)
+
+
+def gradient_field(func, h=1e-4):
+    """``BatchField`` of the gradient of a scalar field, by central differences."""
+
+    def batch(points):
+        result = np.zeros_like(points)
+        for axis in range(2):
+            step = np.zeros(3)
+            step[axis] = h
+            result[:, axis] = (evaluate_scalar(func, points + step) - evaluate_scalar(func, points - step)) / (2 * h)
+        return result
+
+    return BatchField.from_batch(batch)
+
+
+class FieldDerivatives:
+    """Finite-difference operators on a regular grid over the plane.
+
+    The grid is laid out like an image: row 0 is the top edge
+    (``y_range[1]``) and column 0 the left edge (``x_range[0]``).
+    """
+
+    def __init__(self, x_range=None, y_range=None, resolution=0.05):
+        self.x_range = x_range or [floor(-config.frame_width / 2), ceil(config.frame_width / 2)]
+        self.y_range = y_range or [floor(-config.frame_height / 2), ceil(config.frame_height / 2)]
+        self.xs = np.arange(self.x_range[0], self.x_range[1] + resolution / 2, resolution)
+        self.ys = np.arange(self.y_range[1], self.y_range[0] - resolution / 2, -resolution)
+        x, y = np.meshgrid(self.xs, self.ys)
+        self.points = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+        self.shape = x.shape
+
+    def vectors(self, func):
+        return as_batch_field(func).batch(self.points).reshape(*self.shape, 3)
+
+    def divergence(self, func):
+        v = self.vectors(func)
+        return np.gradient(v[..., 0], self.xs, axis=1) + np.gradient(v[..., 1], self.ys, axis=0)
+
+    def curl(self, func):
+        """The z component of the curl, the only one of a planar field."""
+        v = self.vectors(func)
+        return np.gradient(v[..., 1], self.xs, axis=1) - np.gradient(v[..., 0], self.ys, axis=0)
+
+    def gradient_magnitude(self, func):
+        """``|grad f|`` of a scalar field ``pos -> value``."""
+        f = evaluate_scalar(func, self.points).reshape(self.shape)
+        return np.hypot(np.gradient(f, self.xs, axis=1), np.gradient(f, self.ys, axis=0))
+
+    def compute(self, kind, func):
+        if kind == "divergence":
+            return self.divergence(func)
+        if kind == "curl":
+            return self.curl(func)
+        if kind == "gradient":
+            return self.gradient_magnitude(func)
+        raise ValueError(f"unknown quantity {kind!r}, expected divergence, curl or gradient")
+
+
+class FieldHeatmap(ImageMobject):
+    """One raster image of the divergence, curl or gradient magnitude of a field.
+
+    Divergence and curl use a diverging palette centred on zero, the gradient
+    magnitude a sequential one.  The color range is fixed by the first frame
+    unless ``vmax`` is given, so that a time-dependent field does not flicker.
+    """
+
+    def __init__(
+        self,
+        func,
+        kind="divergence",
+        x_range=None,
+        y_range=None,
+        resolution=0.05,
+        colors=None,
+        vmax=None,
+        opacity=0.6,
+        **kwargs,
+    ):
+        self.kind = kind
+        self.time_field = as_time_field(func) if is_time_dependent(func) else None
+        self.time = 0.0
+        self.func = func
+        self.derivatives = FieldDerivatives(x_range, y_range, coarser(resolution))
+        self.diverging = kind != "gradient"
+        colors = colors or (DIVERGING_COLORS if self.diverging else SEQUENTIAL_COLORS)
+        self.rgbs = np.array([ManimColor(c).to_rgb() for c in colors]) * 255
+        values = self.derivatives.compute(kind, self.current_func())
+        self.vmax = vmax or float(np.max(np.abs(values))) or 1.0
+
+        pixels = np.zeros((*self.derivatives.shape, 4), dtype=np.uint8)
+        pixels[..., 3] = round(255 * opacity)
+        super().__init__(pixels, **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["bilinear"])
+        d = self.derivatives
+        self.stretch_to_fit_width(d.xs[-1] - d.xs[0])
+        self.stretch_to_fit_height(d.ys[0] - d.ys[-1])
+        self.move_to([(d.xs[0] + d.xs[-1]) / 2, (d.ys[0] + d.ys[-1]) / 2, 0])
+        self.set_values(values)
+
+    def current_func(self):
+        return self.time_field.at(self.time) if self.time_field else self.func
+
+    def set_values(self, values):
+        """Write the colors of ``values`` into the pixel array, keeping its alpha."""
+        low = -self.vmax if self.diverging else 0
+        alpha = np.clip((values - low) / (self.vmax - low), 0, 1) * (len(self.rgbs) - 1)
+        stops = np.arange(len(self.rgbs))
+        for channel in range(3):
+            self.pixel_array[..., channel] = np.interp(alpha, stops, self.rgbs[:, channel])
+        return self
+
+    def set_time(self, t):
+        self.time = t
+        return self.set_values(self.derivatives.compute(self.kind, self.current_func()))
+
+    def start_time_updates(self, speed=1):
+        """Follow a time-dependent field with the scene clock."""
+        if self.time_field is None:
+            raise ValueError("start_time_updates needs a field F(pos, t)")
+
+        def updater(mob, dt):
+            if dt:
+                mob.set_time(mob.time + speed * dt)
+
+        self.time_updater = updater
+        self.add_updater(updater)
+        return self
+
+    def stop_time_updates(self):
+        self.remove_updater(self.time_updater)
+        return self
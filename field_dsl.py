@@ -0,0 +1,264 @@
+"""Vector fields written once, as a string, for both evaluation and display.
+
+    field = expression_field("(sin(x), y**2)")
+    field.batch(points)          # one NumPy call over (N, 3) points
+    field.tex().to_edge(UP)      # MathTex F(x, y) = (\\sin x, y^{2})
+
+The expression is a tuple (or list) of two or three components in ``x``,
+``y``, ``z`` and optionally ``t`` (a time-dependent field), using numbers,
+``+ - * / ** %`` and the functions of ``EXPRESSION_NAMESPACE``.  It is parsed
+and checked once, then compiled into a kernel that fills an (N, 3) array
+component by component; compiled kernels are cached per expression.  The
+LaTeX label comes from the same syntax tree, so it cannot drift from the
+field.
+"""
+
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+from manim import MathTex
+
+from fields import BatchField, TimeField
+from memory_watch import register_cache
+
+# names an expression may use besides x, y, z and t
+EXPRESSION_NAMESPACE = {
+    name: getattr(np, name)
+    for name in (
+        "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh", "tanh",
+        "exp", "log", "sqrt", "abs", "hypot", "minimum", "maximum", "sign", "pi", "e",
+    )
+}
+VARIABLES = ("x", "y", "z", "t")
+
+_BINARY = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod)
+_UNARY = (ast.UAdd, ast.USub)
+
+# LaTeX operator names of the functions shown as \sin x, \cos^{2} x...
+_OPERATORS = {
+    "sin": r"\sin", "cos": r"\cos", "tan": r"\tan", "arcsin": r"\arcsin", "arccos": r"\arccos",
+    "arctan": r"\arctan", "sinh": r"\sinh", "cosh": r"\cosh", "tanh": r"\tanh", "log": r"\ln",
+    "sign": r"\operatorname{sgn}",
+}
+# precedence of the printed forms, loosest first
+_SUM, _PRODUCT, _UNARY_MINUS, _POWER, _ATOM = range(5)
+
+
+def parse_expression(expression):
+    """Component syntax trees of ``expression``; ValueError if it is not a field."""
+    if "^" in expression:
+        raise ValueError(f"use ** for powers in field {expression!r}")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"invalid field {expression!r}: {e.msg}") from None
+    if not isinstance(tree, (ast.Tuple, ast.List)) or len(tree.elts) not in (2, 3):
+        raise ValueError(f"field {expression!r} must have 2 or 3 components, as in '(x, -y)'")
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Tuple, ast.List)) and node is not tree:
+            raise ValueError(f"nested tuple in field {expression!r}")
+        if isinstance(node, ast.Name):
+            if node.id not in EXPRESSION_NAMESPACE and node.id not in VARIABLES:
+                raise ValueError(f"unknown name {node.id!r} in field {expression!r}")
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or not callable(EXPRESSION_NAMESPACE.get(node.func.id)):
+                raise ValueError(f"unknown function {ast.unparse(node.func)!r} in field {expression!r}")
+            if node.keywords:
+                raise ValueError(f"keyword arguments in field {expression!r}")
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError(f"only numbers are allowed as constants in field {expression!r}")
+        elif isinstance(node, ast.BinOp):
+            if not isinstance(node.op, _BINARY):
+                raise ValueError(f"operator {type(node.op).__name__} not allowed in field {expression!r}")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, _UNARY):
+                raise ValueError(f"operator {type(node.op).__name__} not allowed in field {expression!r}")
+        elif not isinstance(node, (ast.Load, ast.operator, ast.unaryop, ast.Tuple, ast.List)):
+            raise ValueError(f"{type(node).__name__} not allowed in field {expression!r}")
+    return tree.elts
+
+
+class CompiledExpression:
+    """A parsed field expression, its kernel and its LaTeX components."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.components = parse_expression(expression)
+        names = {node.id for c in self.components for node in ast.walk(c) if isinstance(node, ast.Name)}
+        self.uses_time = "t" in names
+        self.variables = ["x", "y"] + (["z"] if "z" in names else [])
+        self.kernel = self._compile()
+        self.latex_components = [to_latex(c) for c in self.components]
+
+    def _compile(self):
+        lines = [
+            "def kernel(points, t=0.0):",
+            "    x, y, z = points[:, 0], points[:, 1], points[:, 2]",
+            "    out = np.zeros(points.shape)",
+        ]
+        lines += [f"    out[:, {i}] = {ast.unparse(c)}" for i, c in enumerate(self.components)]
+        lines.append("    return out")
+        namespace = {"np": np, **EXPRESSION_NAMESPACE}
+        exec(compile("\n".join(lines), f"<field {self.expression}>", "exec"), namespace)
+        return namespace["kernel"]
+
+    def label(self, name="F"):
+        arguments = [*self.variables, *(["t"] if self.uses_time else [])]
+        components = list(self.latex_components)
+        # a third component that is literally zero is left out, as in F(x, y) = (-y, x)
+        if len(components) == 3 and components[2] == "0" and "z" not in self.variables:
+            components = components[:2]
+        return rf"{name}({', '.join(arguments)}) = \left({', '.join(components)}\right)"
+
+    def key(self):
+        return ast.dump(ast.Tuple(elts=self.components, ctx=ast.Load()))
+
+
+@lru_cache(maxsize=None)
+def compile_expression(expression):
+    return CompiledExpression(expression)
+
+
+# about 9 kB per expression: syntax tree, kernel and LaTeX, measured with tracemalloc
+register_cache(
+    "compiled_expressions",
+    lambda scene: compile_expression.cache_info().currsize * 9000,
+    lambda scene: compile_expression.cache_clear(),
+)
+
+
+class ExpressionFieldMixin:
+    """What fields compiled from an expression add to ``BatchField``/``TimeField``."""
+
+    def label(self, name="F"):
+        """LaTeX of the field, such as ``F(x, y) = \\left(\\sin x, y^{2}\\right)``."""
+        return self.compiled.label(name)
+
+    def tex(self, name="F", **kwargs):
+        return MathTex(self.label(name), **kwargs)
+
+    def cache_key(self):
+        # the syntax tree, so that spacing does not change fingerprints
+        return ("expression", self.compiled.key())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.compiled.expression!r})"
+
+
+class ExpressionField(ExpressionFieldMixin, BatchField):
+    def __init__(self, expression):
+        self.compiled = compile_expression(expression)
+        kernel = self.compiled.kernel
+        super().__init__(lambda pos: kernel(np.asarray(pos, dtype=float).reshape(1, 3))[0], kernel)
+
+
+class TimeExpressionField(ExpressionFieldMixin, TimeField):
+    def __init__(self, expression):
+        self.compiled = compile_expression(expression)
+        kernel = self.compiled.kernel
+        super().__init__(lambda pos, t: kernel(np.asarray(pos, dtype=float).reshape(1, 3), t)[0], kernel)
+
+
+def expression_field(expression):
+    """Field from a string such as ``"(sin(x / 2), -y)"``.
+
+    Expressions that use ``t`` give a ``TimeExpressionField``, evaluated as
+    ``F(pos, t)``; the others an ``ExpressionField``.  A missing z component
+    is zero.
+    """
+    if compile_expression(expression).uses_time:
+        return TimeExpressionField(expression)
+    return ExpressionField(expression)
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _latex(node):
+    """``(latex, precedence)`` of an expression node."""
+    if isinstance(node, ast.Constant):
+        return _number(node.value), _ATOM
+    if isinstance(node, ast.Name):
+        return {"pi": r"\pi", "e": "e"}.get(node.id, node.id), _ATOM
+    if isinstance(node, ast.UnaryOp):
+        operand = _wrap(node.operand, _PRODUCT)
+        return ("-" if isinstance(node.op, ast.USub) else "+") + operand, _UNARY_MINUS
+    if isinstance(node, ast.Call):
+        return _call_latex(node.func.id, node.args)
+    op = type(node.op)
+    if op is ast.Div:
+        return rf"\frac{{{to_latex(node.left)}}}{{{to_latex(node.right)}}}", _ATOM
+    if op is ast.Pow:
+        if isinstance(node.left, ast.Call) and node.left.func.id in _OPERATORS and len(node.left.args) == 1:
+            # sin(x)**2 -> \sin^{2} x
+            name = _OPERATORS[node.left.func.id]
+            return rf"{name}^{{{to_latex(node.right)}}}{_operator_argument(node.left.args[0])}", _PRODUCT
+        return rf"{_wrap(node.left, _ATOM)}^{{{to_latex(node.right)}}}", _POWER
+    if op in (ast.Add, ast.Sub):
+        right = _wrap(node.right, _SUM + 1) if op is ast.Sub else _wrap(node.right, _SUM)
+        if op is ast.Sub and isinstance(node.right, ast.UnaryOp):
+            right = rf"\left({right}\right)"
+        elif op is ast.Add and right.startswith("-"):
+            return f"{_wrap(node.left, _SUM)} - {right[1:]}", _SUM
+        return f"{_wrap(node.left, _SUM)} {'+' if op is ast.Add else '-'} {right}", _SUM
+    if op is ast.Mult:
+        left, right = _wrap(node.left, _PRODUCT), _wrap(node.right, _PRODUCT + 1)
+        if isinstance(node.right, ast.UnaryOp):
+            right = rf"\left({right}\right)"
+        elif _is_operator(node.right):
+            right = to_latex(node.right)
+        # juxtapose, 2 x or x \sin y, unless that would run two numbers
+        # together or put a factor after the argument of \sin
+        if right[0].isdigit() or _is_operator(node.left):
+            return rf"{left} \cdot {right}", _PRODUCT
+        return f"{left} {right}", _PRODUCT
+    # %
+    return rf"{_wrap(node.left, _PRODUCT)} \bmod {_wrap(node.right, _PRODUCT + 1)}", _PRODUCT
+
+
+def _is_operator(node):
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        node = node.left
+    return isinstance(node, ast.Call) and node.func.id in _OPERATORS
+
+
+def _wrap(node, precedence):
+    text, own = _latex(node)
+    return rf"\left({text}\right)" if own < precedence else text
+
+
+def _operator_argument(node):
+    # \sin x for a plain symbol or number, \sin\left(x + y\right) otherwise
+    text, precedence = _latex(node)
+    if isinstance(node, (ast.Name, ast.Constant)):
+        return " " + text
+    return rf"\left({text}\right)"
+
+
+def _call_latex(name, args):
+    parts = [to_latex(a) for a in args]
+    if name in _OPERATORS and len(args) == 1:
+        return _OPERATORS[name] + _operator_argument(args[0]), _PRODUCT
+    if name == "exp":
+        return f"e^{{{parts[0]}}}", _POWER
+    if name == "sqrt":
+        return rf"\sqrt{{{parts[0]}}}", _ATOM
+    if name == "abs":
+        return rf"\left|{parts[0]}\right|", _ATOM
+    if name == "hypot":
+        return rf"\sqrt{{{_wrap(args[0], _ATOM)}^{{2}} + {_wrap(args[1], _ATOM)}^{{2}}}}", _ATOM
+    if name in ("minimum", "maximum"):
+        return rf"\{name[:3]}\left({', '.join(parts)}\right)", _ATOM
+    if name == "arctan2":
+        return rf"\operatorname{{atan2}}\left({', '.join(parts)}\right)", _ATOM
+    return rf"\operatorname{{{name}}}\left({', '.join(parts)}\right)", _ATOM
+
+
+def to_latex(node):
+    return _latex(node)[0]
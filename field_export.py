@@ -0,0 +1,387 @@
+"""Export of the flow scenes as data for a browser player, instead of video.
+
+    python field_export.py VectorFieldScene Divergence ContinuousMotion
+    python field_export.py ContinuousMotion --chunk-mb 1 -o media/export
+    python -m http.server -d media/export/ContinuousMotion    # open /player.html
+
+A rendered flow scene is hundreds of rasterized, encoded frames of a few
+arrays: the arrows, the stream lines and the particles, all determined by
+one field.  Here the scene's ``construct`` runs without a renderer
+(``SceneRecorder``): animations are not played but timed, which gives when
+every arrow field, stream line set, particle cloud and number plane enters
+and leaves the scene.  Their geometry is then written as float16 arrays,
+next to a ``manifest.json`` describing shapes, chunks, timing and styles:
+
+- the field, sampled on a grid covering the frame (``field_step`` apart);
+- arrows, as their 7-vertex outlines and color values;
+- stream lines, as anchors with per-line offsets, and the timing of their
+  flowing windows;
+- particle clouds, as parameters: the player advects them through the
+  sampled field, like ``ParticleCloud`` does through the exact one;
+- number planes, as line segments per stroke style.
+
+Time-dependent fields are sampled every ``time_step`` seconds.  Arrays are
+raw little-endian files that ``np.memmap`` (see ``load_export``) and a
+browser ``fetch`` read as they are; ``chunk_bytes`` splits them along their
+first axis.  ``field_player.html`` is copied next to the manifest and draws
+the scene on a canvas.  Titles, formulas and heatmaps are not exported.
+"""
+
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from manim import DEFAULT_WAIT_TIME, NumberPlane, config, logger, tempconfig
+from manim.animation.animation import prepare_animation
+from manim.utils.color import ManimColor
+
+from fields import BatchStreamLines, PackedArrowVectorField
+from particles import ParticleCloud
+from streamline_cache import field_fingerprint
+
+EXPORT_VERSION = 1
+PLAYER = Path(__file__).with_name("field_player.html")
+FLOAT16_MAX = float(np.finfo(np.float16).max)
+
+
+class SceneRecorder:
+    """Scene mixin that runs ``construct`` without rendering.
+
+    ``play`` and ``wait`` only advance ``clock``; ``layers`` collects every
+    exported mobject with the times it enters and leaves the scene, and how
+    long it fades in and out.  What is on the scene is compared whenever the
+    clock moves, so removing and adding back (``bring_to_back``) in between
+    does not count.
+    """
+
+    recorded_types = (PackedArrowVectorField, BatchStreamLines, ParticleCloud, NumberPlane)
+
+    def __init__(self, *args, **kwargs):
+        self.clock = 0.0
+        self.layers = []
+        self._shown = {}
+        super().__init__(*args, **kwargs)
+
+    def play(self, *args, run_time=None, **kwargs):
+        animations = [prepare_animation(a) for a in args]
+        if run_time is None:
+            run_time = max((a.get_run_time() for a in animations), default=0)
+        self._sync(self.clock, 0)
+        for anim in animations:
+            if anim.is_introducer():
+                self.add(anim.mobject)
+            # FadeTransform shows its target from the start
+            if hasattr(anim, "to_add_on_completion"):
+                self.add(anim.to_add_on_completion)
+        self._sync(self.clock, run_time)
+        for anim in animations:
+            # what Animation.clean_up_from_scene does
+            if anim.is_remover():
+                self.remove(anim.mobject)
+            if hasattr(anim, "to_add_on_completion"):
+                # FadeTransform animates Group(source, copy of the target)
+                self.remove(*anim.mobject.submobjects)
+        self.clock += run_time
+        self._sync(self.clock, run_time)
+
+    def wait(self, duration=DEFAULT_WAIT_TIME, *args, **kwargs):
+        self._sync(self.clock, 0)
+        self.clock += duration
+
+    def record(self):
+        self.construct()
+        self._sync(self.clock, 0)
+        for layer in self.layers:
+            if layer["end"] is None:
+                layer["end"] = self.clock
+        return self
+
+    def _sync(self, now, fade):
+        """Start layers for recorded mobjects that appeared and end those that left."""
+        on_scene = {
+            id(mob): mob
+            for mob in self.get_mobject_family_members()
+            if isinstance(mob, self.recorded_types)
+        }
+        for key in list(self._shown):
+            if key not in on_scene:
+                layer = self._shown.pop(key)
+                layer["end"], layer["fade_out"] = now, fade
+        for key, mob in on_scene.items():
+            if key not in self._shown:
+                self._shown[key] = {"mobject": mob, "start": now, "fade_in": fade, "end": None, "fade_out": 0}
+                self.layers.append(self._shown[key])
+
+
+def record_scene(scene_class):
+    """A ``SceneRecorder`` of ``scene_class`` whose ``construct`` has run."""
+    recorder = type(scene_class.__name__, (SceneRecorder, scene_class), {})
+    with tempconfig({"dry_run": True}):
+        return recorder().record()
+
+
+class ExportWriter:
+    """Writes arrays into ``directory`` and their descriptions into ``arrays``."""
+
+    def __init__(self, directory, chunk_bytes=None):
+        self.directory = Path(directory)
+        self.chunk_bytes = chunk_bytes
+        self.arrays = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def array(self, name, values, dtype="float16"):
+        values = np.asarray(values)
+        entry = {"dtype": dtype, "shape": list(values.shape)}
+        if dtype == "float16":
+            finite = np.clip(np.nan_to_num(values.astype(float)), -FLOAT16_MAX, FLOAT16_MAX)
+            data = finite.astype("<f2")
+            entry["max_error"] = float(np.abs(data.astype(float) - values).max()) if values.size else 0.0
+        else:
+            data = values.astype(np.dtype(dtype).newbyteorder("<"))
+        rows = len(data) if data.ndim else 1
+        row_bytes = data[:1].nbytes if data.ndim and rows else data.nbytes
+        per_chunk = max(1, self.chunk_bytes // max(row_bytes, 1)) if self.chunk_bytes else max(rows, 1)
+        entry["chunks"] = []
+        for index, start in enumerate(range(0, max(rows, 1), per_chunk)):
+            stop = min(start + per_chunk, rows)
+            file = f"{name}.bin" if per_chunk >= rows else f"{name}.{index:03d}.bin"
+            (data[start:stop] if data.ndim else data).tofile(self.directory / file)
+            entry["chunks"].append({"file": file, "start": start, "stop": stop})
+        self.arrays[name] = entry
+        return name
+
+    def size(self):
+        return sum((self.directory / c["file"]).stat().st_size for e in self.arrays.values() for c in e["chunks"])
+
+
+def load_export(directory):
+    """The manifest of an export and its arrays, memory-mapped where they are one chunk."""
+    directory = Path(directory)
+    manifest = json.loads((directory / "manifest.json").read_text())
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        dtype = np.dtype(entry["dtype"]).newbyteorder("<")
+        shape = tuple(entry["shape"])
+        row_shape = shape[1:]
+        pieces = []
+        for chunk in entry["chunks"]:
+            rows = chunk["stop"] - chunk["start"]
+            piece_shape = (rows, *row_shape) if shape else ()
+            if rows and np.prod(piece_shape, dtype=int):
+                pieces.append(np.memmap(directory / chunk["file"], dtype=dtype, mode="r", shape=piece_shape))
+            else:
+                pieces.append(np.zeros(piece_shape, dtype=dtype))
+        arrays[name] = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+    return manifest, arrays
+
+
+def color_style(mob):
+    """How the player colors a field mobject: one color, or a gradient over values."""
+    if mob.single_color:
+        return {"color": ManimColor(mob.color).to_hex()}
+    return {
+        "colors": mob.rgbs.tolist(),
+        "min": mob.min_color_scheme_value,
+        "max": mob.max_color_scheme_value,
+    }
+
+
+def sample_times(field, duration, time_step):
+    if field.time_field is None:
+        return np.zeros(1)
+    return np.arange(0, max(duration, time_step), time_step)
+
+
+def line_anchors(line):
+    # the flow animation draws from its starting copy of the line
+    shape = line.anim.starting_mobject if hasattr(line, "anim") else line
+    points = shape.points
+    if not len(points):
+        return np.empty((0, 3))
+    return np.concatenate([points[::4], points[-1:]])
+
+
+def export_arrows(writer, name, mob, duration, time_step):
+    times = sample_times(mob, duration, time_step)
+    outlines, values = [], []
+    for t in times:
+        if mob.time_field is not None:
+            mob.set_time(t)
+        outlines.append(mob.outlines[:, :, :2].copy())
+        values.append(mob.values.copy())
+    return {
+        "kind": "arrows",
+        "times": times.tolist(),
+        "outlines": writer.array(f"{name}.outlines", outlines),
+        "values": writer.array(f"{name}.values", values),
+        "opacity": mob.opacity,
+        **color_style(mob),
+    }
+
+
+def export_stream_lines(writer, name, mob, duration, time_step):
+    times = sample_times(mob, duration, time_step)
+    anchors, values, lengths = [], [], []
+    for t in times:
+        if mob.time_field is not None:
+            mob.set_time(t)
+        for line in mob.stream_lines:
+            points = line_anchors(line)
+            anchors.append(points[:, :2])
+            values.append(mob.batch_color_values(mob.field.batch(points)) if len(points) else np.empty(0))
+            lengths.append(len(points))
+    flowing = hasattr(mob, "flow_mobject") or any(hasattr(line, "anim") for line in mob.stream_lines)
+    line_times = getattr(mob, "line_times", None)
+    if line_times is None:
+        line_times = np.random.default_rng(0).random(len(mob.stream_lines)) * mob.virtual_time
+    return {
+        "kind": "stream_lines",
+        "times": times.tolist(),
+        "lines": len(mob.stream_lines),
+        "points": writer.array(f"{name}.points", np.concatenate(anchors) if anchors else np.empty((0, 2))),
+        "offsets": writer.array(f"{name}.offsets", np.concatenate([[0], np.cumsum(lengths)]), "uint32"),
+        "values": writer.array(f"{name}.values", np.concatenate(values) if values else np.empty(0)),
+        "line_times": writer.array(f"{name}.line_times", line_times),
+        "flowing": flowing,
+        "virtual_time": mob.virtual_time,
+        "duration": mob.stream_lines[0].duration if mob.stream_lines else 0,
+        "flow_speed": getattr(mob, "flow_speed", 1),
+        "time_width": getattr(mob, "time_width", 0.3),
+        "stroke_width": mob.stroke_width,
+        "opacity": mob.stream_lines[0].opacity if mob.stream_lines else 1,
+        **color_style(mob),
+    }
+
+
+def export_particles(writer, name, mob, duration, time_step):
+    return {
+        "kind": "particles",
+        "count": mob.count,
+        "color": ManimColor(mob.particle_rgb).to_hex(),
+        "lower": mob.lower.tolist(),
+        "upper": mob.upper.tolist(),
+        "lifetime": list(mob.lifetime_range),
+        "fade_time": mob.fade_time,
+        "warm_up": bool((mob.ages < 0).any()),
+        "flowing": hasattr(mob, "flow_updater"),
+        "flow_speed": getattr(mob, "flow_speed", 1),
+        "stroke_width": mob.stroke_width,
+    }
+
+
+def export_plane(writer, name, mob, duration, time_step):
+    styles = {}
+    for part in mob.family_members_with_points():
+        if not part.get_stroke_width() or not part.get_stroke_opacity():
+            continue
+        style = (ManimColor(part.get_stroke_color()).to_hex(), part.get_stroke_width(), part.get_stroke_opacity())
+        styles.setdefault(style, []).append(part.points[[0, -1], :2])
+    return {
+        "kind": "plane",
+        "styles": [
+            {
+                "color": color,
+                "stroke_width": width,
+                "opacity": opacity,
+                "segments": writer.array(f"{name}.segments{index}", segments),
+            }
+            for index, ((color, width, opacity), segments) in enumerate(styles.items())
+        ],
+    }
+
+
+EXPORTERS = {
+    PackedArrowVectorField: export_arrows,
+    BatchStreamLines: export_stream_lines,
+    ParticleCloud: export_particles,
+    NumberPlane: export_plane,
+}
+
+
+def export_field(writer, name, field, duration, field_step, time_step):
+    """``field`` (a ``BatchField`` or ``TimeField``) on a grid covering the frame."""
+    x = np.arange(-config.frame_width / 2, config.frame_width / 2 + field_step, field_step)
+    y = np.arange(-config.frame_height / 2, config.frame_height / 2 + field_step, field_step)
+    grid = np.stack([*np.meshgrid(x, y), np.zeros((len(y), len(x)))], axis=-1).reshape(-1, 3)
+    time_dependent = not hasattr(field, "batch")
+    times = np.arange(0, max(duration, time_step), time_step) if time_dependent else np.zeros(1)
+    vectors = [(field.at(t) if time_dependent else field).batch(grid)[:, :2] for t in times]
+    return {
+        "x": [x[0], x[-1], len(x)],
+        "y": [y[0], y[-1], len(y)],
+        "times": times.tolist(),
+        "vectors": writer.array(f"{name}.vectors", np.reshape(vectors, (len(times), len(y), len(x), 2))),
+    }
+
+
+def export_scene(scene_class, directory, chunk_bytes=None, field_step=0.125, time_step=0.1):
+    """Record ``scene_class`` and write its export into ``directory``; returns the manifest."""
+    start = time.perf_counter()
+    recorder = record_scene(scene_class)
+    writer = ExportWriter(directory, chunk_bytes)
+    fields, field_ids, layers = [], {}, []
+    for index, layer in enumerate(recorder.layers):
+        mob = layer["mobject"]
+        duration = layer["end"] - layer["start"]
+        exporter = next(e for cls, e in EXPORTERS.items() if isinstance(mob, cls))
+        entry = {
+            **exporter(writer, f"layer{index}", mob, duration, time_step),
+            **{k: layer[k] for k in ("start", "end", "fade_in", "fade_out")},
+        }
+        field = getattr(mob, "time_field", None) or getattr(mob, "field", None)
+        if field is not None and not isinstance(mob, NumberPlane):
+            # a field that cannot be fingerprinted is exported on its own
+            key = field_fingerprint(field) or id(field)
+            if key not in field_ids:
+                field_ids[key] = len(fields)
+                fields.append(export_field(writer, f"field{len(fields)}", field, duration, field_step, time_step))
+            entry["field"] = field_ids[key]
+        layers.append(entry)
+
+    manifest = {
+        "version": EXPORT_VERSION,
+        "scene": scene_class.__name__,
+        "duration": recorder.clock,
+        "frame": {
+            "width": config.frame_width,
+            "height": config.frame_height,
+            "pixel_width": config.pixel_width,
+            "pixel_height": config.pixel_height,
+            "background": ManimColor(config.background_color).to_hex(),
+        },
+        "fields": fields,
+        "layers": layers,
+        "arrays": writer.arrays,
+    }
+    (writer.directory / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    shutil.copyfile(PLAYER, writer.directory / "player.html")
+    logger.info(
+        f"{scene_class.__name__}: {len(layers)} layers, {writer.size() / 1e6:.2f} MB "
+        f"in {time.perf_counter() - start:.1f}s -> {writer.directory}"
+    )
+    return manifest
+
+
+if __name__ == "__main__":
+    import scenes
+
+    parser = argparse.ArgumentParser(description="Export flow scenes for field_player.html")
+    parser.add_argument("scenes", nargs="+", help="scene names, e.g. ContinuousMotion")
+    parser.add_argument("-o", "--output", default=str(Path("media") / "export"))
+    parser.add_argument("--chunk-mb", type=float, default=None, help="split arrays into chunks of this size")
+    parser.add_argument("--field-step", type=float, default=0.125, help="spacing of the sampled field grid")
+    parser.add_argument("--time-step", type=float, default=0.1, help="sampling period of time-dependent fields")
+    args = parser.parse_args()
+
+    chunk_bytes = int(args.chunk_mb * 1024 * 1024) if args.chunk_mb else None
+    for name in args.scenes:
+        directory = Path(args.output) / name
+        export_scene(scenes.load(name), directory, chunk_bytes, args.field_step, args.time_step)
+        size = sum(f.stat().st_size for f in directory.iterdir() if f.suffix in (".bin", ".json"))
+        videos = sorted(Path(config.media_dir).glob(f"videos/**/{name}.mp4"))
+        comparison = f" ({size / videos[-1].stat().st_size:.1%} of {videos[-1]})" if videos else ""
+        print(f"{name}: {size / 1e6:.2f} MB{comparison} -> {directory / 'player.html'}")
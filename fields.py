@@ -0,0 +1,1050 @@
+"""Vector fields evaluated on whole arrays of points at once.
+
+manim's ``ArrowVectorField`` and ``StreamLines`` call the field function once per
+grid point and once per integration step.  The classes here keep the same
+constructor signatures but evaluate the field as a single NumPy call over an
+(N, 3) array of points, so denser grids stay cheap.
+"""
+
+import inspect
+import warnings
+from collections import deque
+from math import ceil, floor
+
+import numpy as np
+from PIL import Image
+
+from manim import ORIGIN, ArrowVectorField, StreamLines, UpdateFromAlphaFunc, Vector, VectorField, VMobject, config
+from manim.constants import DEFAULT_ARROW_TIP_LENGTH, RendererType
+from manim.mobject.utils import get_vectorized_mobject_class
+from manim.mobject.vector_field import DEFAULT_SCALAR_FIELD_COLORS
+from manim.utils.bezier import get_smooth_cubic_bezier_handle_points
+from manim.utils.color import color_to_rgb, rgb_to_color
+from manim.utils.rate_functions import ease_out_sine, linear
+from manim.utils.simple_functions import sigmoid
+
+from preview import DRAFT_SCALES, coarser, preview_scale
+
+
+class BatchField:
+    """A vector field that can be evaluated on an (N, 3) array of points.
+
+    ``func`` is the usual per-point field (``pos -> np.array([vx, vy, vz])``).
+    Lambdas written with component-wise NumPy operations also work when ``pos``
+    is a (3, N) array; this is detected on first use and the whole batch is then
+    evaluated in one call.  Anything else falls back to a per-point loop.
+    """
+
+    def __init__(self, func, batch_func=None):
+        self.func = func
+        self._batch = batch_func
+
+    @classmethod
+    def from_batch(cls, batch_func):
+        """Wrap a function that already maps (N, 3) points to (N, 3) vectors."""
+        return cls(lambda pos: batch_func(np.asarray(pos, dtype=float).reshape(1, 3))[0], batch_func)
+
+    def __call__(self, pos):
+        return np.asarray(self.func(pos), dtype=float)
+
+    def cache_key(self):
+        # the batch function computes the same vectors, and which one is
+        # used is decided lazily, so only func says what the field is
+        return ("batch", self.func)
+
+    @property
+    def is_vectorized(self):
+        if self._batch is None:
+            self._batch = self._choose_batch()
+        # every attribute access makes a new bound method, so compare by value
+        return self._batch != self._loop
+
+    def batch(self, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self._batch is None:
+            self._batch = self._choose_batch()
+        return self._batch(points)
+
+    def _loop(self, points):
+        return np.array([self.func(p) for p in points], dtype=float).reshape(-1, 3)
+
+    def _transposed(self, points):
+        return np.asarray(self.func(points.T), dtype=float).T
+
+    def _choose_batch(self):
+        # Compare the (3, N) evaluation against the per-point one on a few
+        # sample points; any error or mismatch means the lambda is not
+        # component-wise and we keep the loop.
+        probe = np.random.default_rng(0).uniform(-4, 4, (5, 3))
+        expected = self._loop(probe)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                result = self._transposed(probe)
+        except Exception:
+            return self._loop
+        if result.shape != expected.shape or not np.allclose(result, expected, equal_nan=True):
+            return self._loop
+        return self._transposed
+
+
+def as_batch_field(func):
+    if isinstance(func, BatchField):
+        return func
+    return BatchField(func)
+
+
+class TimeField:
+    """A time-dependent field ``F(pos, t)``.
+
+    ``at(t)`` freezes it into a ``BatchField``.  Whether ``func`` accepts
+    (3, N) arrays is worked out once, on the first frozen field, instead of
+    on every frame.
+    """
+
+    def __init__(self, func, batch_func=None):
+        self.func = func
+        self._batch = batch_func
+        self._vectorized = None
+
+    @classmethod
+    def from_batch(cls, batch_func):
+        """Wrap a function mapping ((N, 3) points, t) to (N, 3) vectors."""
+        return cls(lambda pos, t: batch_func(np.asarray(pos, dtype=float).reshape(1, 3), t)[0], batch_func)
+
+    def __call__(self, pos, t):
+        return np.asarray(self.func(pos, t), dtype=float)
+
+    def cache_key(self):
+        return ("time", self.func)
+
+    def at(self, t):
+        func = self.func
+        if self._batch is not None:
+            batch = self._batch
+            return BatchField(lambda pos: func(pos, t), lambda points: batch(points, t))
+        frozen = BatchField(lambda pos: func(pos, t))
+        if self._vectorized is None:
+            self._vectorized = frozen.is_vectorized
+        elif self._vectorized:
+            frozen._batch = frozen._transposed
+        else:
+            frozen._batch = frozen._loop
+        return frozen
+
+
+def is_time_dependent(func):
+    """True for a ``TimeField`` or a callable taking ``(pos, t)``."""
+    if isinstance(func, TimeField):
+        return True
+    if isinstance(func, BatchField):
+        return False
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    positional = [
+        p
+        for p in parameters
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty
+    ]
+    return len(positional) >= 2
+
+
+def as_time_field(func):
+    if isinstance(func, TimeField):
+        return func
+    return TimeField(func)
+
+
+def field_ranges(x_range, y_range, z_range, three_dimensions):
+    # Same defaults and step handling as ArrowVectorField/StreamLines.
+    x_range = list(x_range) if x_range else [floor(-config.frame_width / 2), ceil(config.frame_width / 2)]
+    y_range = list(y_range) if y_range else [floor(-config.frame_height / 2), ceil(config.frame_height / 2)]
+    ranges = [x_range, y_range]
+    if three_dimensions or z_range:
+        ranges.append(list(z_range) if z_range else y_range.copy())
+    else:
+        ranges.append([0, 0])
+    for r in ranges:
+        if len(r) == 2:
+            r.append(0.5)
+        r[2] = coarser(r[2])
+        r[1] += r[2]
+    return ranges
+
+
+def grid_points(ranges):
+    # Same ordering as it.product(x_range, y_range, z_range).
+    axes = [np.arange(*r) for r in ranges]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+def _apply(func, values):
+    try:
+        result = np.asarray(func(values), dtype=float)
+        if result.shape == values.shape:
+            return result
+    except Exception:
+        pass
+    return np.array([func(v) for v in values], dtype=float)
+
+
+class BatchColorMixin:
+    def _setup_batch_colors(self, min_color_scheme_value, max_color_scheme_value, colors):
+        self.min_color_scheme_value = min_color_scheme_value
+        self.max_color_scheme_value = max_color_scheme_value
+        if not self.single_color:
+            self.rgbs = np.array([color_to_rgb(c) for c in colors])
+
+    def batch_color_values(self, vectors):
+        if getattr(self, "_default_color_scheme", True):
+            return np.linalg.norm(vectors, axis=1)
+        return np.array([self.color_scheme(v) for v in vectors], dtype=float)
+
+    def batch_rgbs(self, points):
+        return self.values_to_rgbs(self.batch_color_values(self.field.batch(points)))
+
+    def values_to_rgbs(self, values):
+        vmin, vmax = self.min_color_scheme_value, self.max_color_scheme_value
+        values = np.clip(values, vmin, vmax)
+        alpha = (values - vmin) / (vmax - vmin) * (len(self.rgbs) - 1)
+        lower = alpha.astype(int)
+        upper = np.minimum(lower + 1, len(self.rgbs) - 1)
+        alpha = (alpha % 1)[:, None]
+        return (1 - alpha) * self.rgbs[lower] + alpha * self.rgbs[upper]
+
+    def get_colored_background_image(self, sampling_rate=5):
+        if self.single_color:
+            raise ValueError(
+                "There is no point in generating an image if the vector field uses a single color.",
+            )
+        ph = int(config.pixel_height / sampling_rate)
+        pw = int(config.pixel_width / sampling_rate)
+        x = np.linspace(-config.frame_width / 2, config.frame_width / 2, pw)
+        y = np.linspace(config.frame_height / 2, -config.frame_height / 2, ph)
+        points = np.zeros((ph, pw, 3))
+        points[:, :, 0] = x[None, :]
+        points[:, :, 1] = y[:, None]
+        rgbs = self.batch_rgbs(points.reshape(-1, 3)).reshape(ph, pw, 3)
+        return Image.fromarray((rgbs * 255).astype("uint8"))
+
+
+class BatchArrowVectorField(BatchColorMixin, ArrowVectorField):
+    """``ArrowVectorField`` that evaluates the whole grid in one field call."""
+
+    def __init__(
+        self,
+        func,
+        color=None,
+        color_scheme=None,
+        min_color_scheme_value=0,
+        max_color_scheme_value=2,
+        colors=DEFAULT_SCALAR_FIELD_COLORS,
+        x_range=None,
+        y_range=None,
+        z_range=None,
+        three_dimensions=False,
+        length_func=lambda norm: 0.45 * sigmoid(norm),
+        opacity=1.0,
+        vector_config=None,
+        **kwargs,
+    ):
+        self.field = as_batch_field(func)
+        self.ranges = field_ranges(x_range, y_range, z_range, three_dimensions)
+        self.x_range, self.y_range, self.z_range = self.ranges
+        self._default_color_scheme = color_scheme is None
+        VectorField.__init__(
+            self,
+            self.field,
+            color,
+            color_scheme,
+            min_color_scheme_value,
+            max_color_scheme_value,
+            colors,
+            **kwargs,
+        )
+        self._setup_batch_colors(min_color_scheme_value, max_color_scheme_value, colors)
+        self.length_func = length_func
+        self.opacity = opacity
+        self.vector_config = vector_config or {}
+        self.func = self.field
+
+        points = grid_points(self.ranges)
+        self.add(*self.get_vectors(points))
+        self.set_opacity(self.opacity)
+
+    def scaled_vectors(self, points):
+        vectors = self.field.batch(points)
+        norms = np.linalg.norm(vectors, axis=1)
+        nonzero = norms != 0
+        scale = np.ones_like(norms)
+        scale[nonzero] = _apply(self.length_func, norms[nonzero]) / norms[nonzero]
+        return vectors * scale[:, None]
+
+    def get_vectors(self, points):
+        vectors = self.scaled_vectors(points)
+        rgbs = None if self.single_color else self.batch_rgbs(points)
+        arrows = []
+        for i, (point, output) in enumerate(zip(points, vectors)):
+            vect = Vector(output, **self.vector_config)
+            vect.shift(point)
+            vect.set_color(self.color if self.single_color else rgb_to_color(rgbs[i]))
+            arrows.append(vect)
+        return arrows
+
+    def get_vector(self, point):
+        return self.get_vectors(np.asarray(point, dtype=float).reshape(1, 3))[0]
+
+
+def arrow_outlines(
+    origins,
+    vectors,
+    stroke_width=6,
+    max_tip_length_to_length_ratio=0.25,
+    max_stroke_width_to_length_ratio=5,
+    out=None,
+):
+    """Closed 7-vertex outlines (shaft and tip) of many arrows at once.
+
+    Sizes follow ``Vector``: the tip is ``min(0.35, 0.25 * length)`` long and
+    as wide as it is long, and the shaft is as wide as the stroke of an arrow
+    of that length would be (1 stroke width unit = 0.01 scene units in Cairo).
+    Returns an array of shape (N, 7, 3), written into ``out`` when given.
+    """
+    lengths = np.linalg.norm(vectors, axis=1)
+    safe = np.where(lengths == 0, 1, lengths)
+    direction = vectors / safe[:, None]
+    normal = np.stack([-direction[:, 1], direction[:, 0], np.zeros(len(direction))], axis=1)
+    tip_length = np.minimum(DEFAULT_ARROW_TIP_LENGTH, max_tip_length_to_length_ratio * lengths)
+    half_shaft = 0.005 * np.minimum(stroke_width, max_stroke_width_to_length_ratio * lengths)
+    half_tip = tip_length / 2
+
+    tip = origins + vectors
+    neck = tip - direction * tip_length[:, None]
+    shaft = normal * half_shaft[:, None]
+    head = normal * half_tip[:, None]
+    if out is None:
+        out = np.empty((len(origins), 7, 3))
+    np.add(origins, shaft, out=out[:, 0])
+    np.add(neck, shaft, out=out[:, 1])
+    np.add(neck, head, out=out[:, 2])
+    out[:, 3] = tip
+    np.subtract(neck, head, out=out[:, 4])
+    np.subtract(neck, shaft, out=out[:, 5])
+    np.subtract(origins, shaft, out=out[:, 6])
+    return out
+
+
+def polygons_to_bezier_points(polygons, out=None):
+    """Closed polygons (N, k, 3) as the (N * k * 4, 3) points of straight cubic curves."""
+    n, k, _ = polygons.shape
+    if out is None:
+        out = np.empty((n * k * 4, 3))
+    curves = out.reshape(n, k, 4, 3)
+    curves[:, :, 0] = polygons
+    curves[:, :-1, 3] = polygons[:, 1:]
+    curves[:, -1, 3] = polygons[:, 0]
+    np.multiply(curves[:, :, 0], 2 / 3, out=curves[:, :, 1])
+    curves[:, :, 1] += curves[:, :, 3] / 3
+    np.multiply(curves[:, :, 0], 1 / 3, out=curves[:, :, 2])
+    curves[:, :, 2] += curves[:, :, 3] * (2 / 3)
+    return out
+
+
+class PackedArrowVectorField(BatchColorMixin, VectorField):
+    """Arrow field stored as arrays instead of one ``Vector`` per sample.
+
+    Every arrow is a filled 7-vertex outline.  The outlines live in one
+    (N, 7, 3) buffer, next to per-arrow ``lengths`` and color ``values``.
+    Cairo draws one color per path, so arrows are grouped into
+    ``color_bins`` submobjects along the color gradient (one when a single
+    ``color`` is given); fades and transforms then touch a handful of
+    mobjects whatever the arrow density, and ``update_arrows`` refreshes the
+    geometry and colors in place.
+
+    ``func`` may also be a time-dependent field ``F(pos, t)`` (or a
+    ``TimeField``); ``start_time_updates`` then rewrites the arrows from the
+    field at the scene time on every frame, reusing the same buffers.
+
+    Shifts and point functions (``rotate``, ``scale``, ``apply_function``...)
+    also move the arrow ``origins`` and ``outlines``, so updates sample the
+    field where the arrows now are and recoloring keeps them there.
+    """
+
+    def __init__(
+        self,
+        func,
+        color=None,
+        color_scheme=None,
+        min_color_scheme_value=0,
+        max_color_scheme_value=2,
+        colors=DEFAULT_SCALAR_FIELD_COLORS,
+        x_range=None,
+        y_range=None,
+        z_range=None,
+        three_dimensions=False,
+        length_func=lambda norm: 0.45 * sigmoid(norm),
+        opacity=1.0,
+        stroke_width=6,
+        color_bins=32,
+        **kwargs,
+    ):
+        self.time_field = as_time_field(func) if is_time_dependent(func) else None
+        self.time = 0.0
+        self.field = self.time_field.at(self.time) if self.time_field else as_batch_field(func)
+        self.ranges = field_ranges(x_range, y_range, z_range, three_dimensions)
+        self.x_range, self.y_range, self.z_range = self.ranges
+        self._default_color_scheme = color_scheme is None
+        VectorField.__init__(
+            self,
+            self.field,
+            color,
+            color_scheme,
+            min_color_scheme_value,
+            max_color_scheme_value,
+            colors,
+            **kwargs,
+        )
+        self._setup_batch_colors(min_color_scheme_value, max_color_scheme_value, colors)
+        self.func = self.field
+        self.length_func = length_func
+        self.opacity = opacity
+        self.stroke_width = stroke_width
+        self.origins = grid_points(self.ranges)
+
+        n = len(self.origins)
+        self.vectors = np.zeros((n, 3))
+        self.lengths = np.zeros(n)
+        self.values = np.zeros(n)
+        self.outlines = np.zeros((n, 7, 3))
+        self._sorted_outlines = np.zeros_like(self.outlines)
+        self._points = np.zeros((n * 7 * 4, 3))
+
+        n_bins = 1 if self.single_color else color_bins
+        if self.single_color:
+            bin_colors = [self.color]
+        else:
+            span = self.max_color_scheme_value - self.min_color_scheme_value
+            centers = self.min_color_scheme_value + span * np.linspace(0, 1, n_bins)
+            bin_colors = [rgb_to_color(rgb) for rgb in self.values_to_rgbs(centers)]
+        self.add(*[VMobject(fill_color=c, fill_opacity=opacity, stroke_width=0) for c in bin_colors])
+        self.update_arrows()
+
+    def update_arrows(self, func=None):
+        """Re-evaluate the field (or a new ``func``) and rewrite every arrow."""
+        if func is not None:
+            self.field = self.func = as_batch_field(func)
+        vectors = self.field.batch(self.origins)
+        norms = np.linalg.norm(vectors, axis=1)
+        nonzero = norms != 0
+        scale = np.ones_like(norms)
+        scale[nonzero] = _apply(self.length_func, norms[nonzero]) / norms[nonzero]
+        np.multiply(vectors, scale[:, None], out=self.vectors)
+        np.multiply(norms, scale, out=self.lengths)
+        if not self.single_color:
+            self.values[:] = self.batch_color_values(vectors)
+        arrow_outlines(self.origins, self.vectors, self.stroke_width, out=self.outlines)
+        self.set_arrow_points()
+        return self
+
+    def shift(self, *vectors):
+        super().shift(*vectors)
+        total = sum(np.asarray(v, dtype=float) for v in vectors)
+        self.origins += total
+        self.outlines += total
+        return self
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        if about_point is None:
+            about_point = self.get_critical_point(ORIGIN if about_edge is None else about_edge)
+        super().apply_points_function_about_point(func, about_point)
+        self.origins = func(self.origins - about_point) + about_point
+        outlines = func(self.outlines.reshape(-1, 3) - about_point) + about_point
+        self.outlines[:] = outlines.reshape(self.outlines.shape)
+        return self
+
+    def set_time(self, t):
+        """Show the time-dependent field at time ``t``."""
+        self.time = t
+        return self.update_arrows(self.time_field.at(t))
+
+    def start_time_updates(self, speed=1):
+        """Advance the time-dependent field with the scene clock."""
+        if self.time_field is None:
+            raise ValueError("start_time_updates needs a field F(pos, t)")
+
+        def updater(mob, dt):
+            if dt:
+                mob.set_time(mob.time + speed * dt)
+
+        self.time_updater = updater
+        self.add_updater(updater)
+        return self
+
+    def stop_time_updates(self):
+        self.remove_updater(self.time_updater)
+        return self
+
+    def get_bin_indices(self):
+        if self.single_color:
+            return np.zeros(len(self.origins), dtype=int)
+        vmin, vmax = self.min_color_scheme_value, self.max_color_scheme_value
+        alpha = np.clip((self.values - vmin) / (vmax - vmin), 0, 1)
+        return np.rint(alpha * (len(self.submobjects) - 1)).astype(int)
+
+    def set_arrow_points(self):
+        bins = self.get_bin_indices()
+        order = np.argsort(bins, kind="stable")
+        counts = np.bincount(bins, minlength=len(self.submobjects))
+        np.take(self.outlines, order, axis=0, out=self._sorted_outlines)
+        polygons_to_bezier_points(self._sorted_outlines, out=self._points)
+        per_arrow = 4 * self.outlines.shape[1]
+        start = 0
+        for mob, count in zip(self.submobjects, counts):
+            # views into the shared buffer: nothing is reallocated per frame
+            mob.points = self._points[start * per_arrow : (start + count) * per_arrow]
+            start += count
+        return self
+
+    def set_color_values(self, values):
+        """Recolor from per-arrow values, without touching the geometry."""
+        self.values[:] = values
+        return self.set_arrow_points()
+
+
+def integrate_streamlines(field, start_points, dt, max_steps, lower, upper):
+    """Euler-integrate every seed at once.
+
+    Mirrors the loop in ``StreamLines``: a line stops at the first step that
+    leaves the ``[lower, upper]`` box.  Returns a list of (k, 3) trajectories.
+    """
+    n = len(start_points)
+    path = np.empty((max_steps + 1, n, 3))
+    path[0] = start_points
+    pos = np.array(start_points, dtype=float)
+    lengths = np.ones(n, dtype=int)
+    alive = np.arange(n)
+    for step in range(1, max_steps + 1):
+        if not len(alive):
+            break
+        new = pos[alive] + dt * field.batch(pos[alive])
+        inside = np.all((new >= lower) & (new <= upper), axis=1)
+        alive = alive[inside]
+        pos[alive] = new[inside]
+        path[step, alive] = new[inside]
+        lengths[alive] += 1
+    return [path[:k, i] for i, k in enumerate(lengths)]
+
+
+class SpatialHash:
+    """2D points bucketed in square cells, for radius queries up to the cell size."""
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.buckets = {}
+
+    def key(self, point):
+        return floor(point[0] / self.cell), floor(point[1] / self.cell)
+
+    def add(self, point, tag=None):
+        self.buckets.setdefault(self.key(point), []).append((point[0], point[1], tag))
+
+    def near(self, point, radius, ignore=None):
+        """Whether a stored point lies within ``radius``; ``ignore(tag)`` skips points."""
+        i, j = self.key(point)
+        x, y = point[0], point[1]
+        r2 = radius * radius
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for px, py, tag in self.buckets.get((i + di, j + dj), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 < r2 and not (ignore and ignore(tag)):
+                        return True
+        return False
+
+
+def evenly_spaced_streamlines(
+    field, lower, upper, separation, test_ratio=0.5, step_ratio=0.2, max_steps=2000, initial=()
+):
+    """Jobard-Lefer evenly spaced streamlines of a planar field.
+
+    Lines are traced both ways from a seed with midpoint steps of
+    ``step_ratio * separation`` along the normalized field, and stop when they
+    leave the ``[lower, upper]`` box, reach a zero of the field, or come
+    closer than ``test_ratio * separation`` to another line (or to an
+    earlier part of themselves).  New seeds are taken ``separation`` away on
+    either side of the accepted lines, then from a grid sweep of the box so
+    that unreached regions get lines too.  Separation tests go through a
+    ``SpatialHash``, so each one looks at a handful of points.
+
+    ``initial`` lines, typically the result of a coarser separation, are kept
+    as they are and seed the search, so that only the lines fitting between
+    them are traced.
+    """
+    d_test = test_ratio * separation
+    h = step_ratio * separation
+    # points of the same line closer than this along the line never count as collisions
+    lag = ceil(2 * separation / h)
+    lower = np.asarray(lower, dtype=float)[:2]
+    upper = np.asarray(upper, dtype=float)[:2]
+    grid = SpatialHash(separation)
+
+    def direction(p):
+        v = field(np.array([p[0], p[1], 0.0]))[:2]
+        norm = np.hypot(v[0], v[1])
+        return v / norm if norm > 1e-9 else None
+
+    def inside(p):
+        return lower[0] <= p[0] <= upper[0] and lower[1] <= p[1] <= upper[1]
+
+    def trace(seed, sign, own):
+        points = []
+        p = seed
+        for k in range(1, max_steps + 1):
+            d1 = direction(p)
+            if d1 is None:
+                break
+            d2 = direction(p + sign * 0.5 * h * d1)
+            if d2 is None:
+                break
+            q = p + sign * h * d2
+            index = sign * k
+            if (
+                not inside(q)
+                or grid.near(q, d_test)
+                or own.near(q, d_test, ignore=lambda i: abs(i - index) < lag)
+            ):
+                break
+            own.add(q, index)
+            points.append(q)
+            p = q
+        return points
+
+    def candidates(line):
+        tangent = np.gradient(line, axis=0)
+        normal = np.stack([-tangent[:, 1], tangent[:, 0]], axis=1)
+        normal /= np.maximum(np.linalg.norm(normal, axis=1, keepdims=True), 1e-12)
+        for p, n in zip(line, normal):
+            yield p + separation * n
+            yield p - separation * n
+
+    def sweep():
+        for x in np.arange(lower[0] + separation / 2, upper[0], separation):
+            for y in np.arange(lower[1] + separation / 2, upper[1], separation):
+                yield np.array([x, y])
+
+    lines = []
+    queue = deque()
+    for line in initial:
+        for p in line[:, :2]:
+            grid.add(p)
+        queue.extend(candidates(line[:, :2]))
+        lines.append(line)
+    sweeper = sweep()
+    center = (lower + upper) / 2
+    pending = [center]
+    while True:
+        if pending:
+            seed = pending.pop()
+        elif queue:
+            seed = queue.popleft()
+        else:
+            seed = next(sweeper, None)
+            if seed is None:
+                break
+        if not inside(seed) or grid.near(seed, separation) or direction(seed) is None:
+            continue
+        own = SpatialHash(separation)
+        own.add(seed, 0)
+        backward = trace(seed, -1, own)
+        forward = trace(seed, 1, own)
+        line = np.array(backward[::-1] + [seed] + forward)
+        if len(line) < 3:
+            continue
+        for p in line:
+            grid.add(p)
+        queue.extend(candidates(line))
+        lines.append(np.column_stack([line, np.zeros(len(line))]))
+    return lines
+
+
+def partial_cubics(curves, a, b):
+    """The pieces ``[a, b]`` of many cubic Bezier curves, shape (N, 4, 3).
+
+    Control points of the piece are the blossom of the curve at
+    (a, a, a), (a, a, b), (a, b, b) and (b, b, b), evaluated with three
+    de Casteljau steps for every curve at once.
+    """
+    a = np.asarray(a, dtype=float)[:, None, None]
+    b = np.asarray(b, dtype=float)[:, None, None]
+
+    def blossom(t1, t2, t3):
+        q = curves[:, :-1] + t1 * (curves[:, 1:] - curves[:, :-1])
+        r = q[:, :-1] + t2 * (q[:, 1:] - q[:, :-1])
+        return (r[:, 0] + t3[:, 0] * (r[:, 1] - r[:, 0]))
+
+    return np.stack([blossom(a, a, a), blossom(a, a, b), blossom(a, b, b), blossom(b, b, b)], axis=1)
+
+
+class BatchStreamLines(BatchColorMixin, StreamLines):
+    """``StreamLines`` whose seeds are all integrated together.
+
+    Pass a ``streamline_cache.TrajectoryCache`` as ``cache`` to reuse the
+    trajectories of previous renders of the same field.
+
+    For a time-dependent field ``F(pos, t)`` the lines are integrated through
+    the field frozen at the current time, and ``start_time_updates``
+    re-integrates them into the same line mobjects every ``refresh`` seconds.
+    Their colors then come from the anchors rather than from a background
+    image, which Cairo caches once per image.
+
+    ``seeding="even"`` replaces the jittered seed grid by Jobard-Lefer evenly
+    spaced lines (see ``evenly_spaced_streamlines``) ``separation`` apart,
+    traced inside the ranges without ``padding``; ``test_ratio`` sets how
+    close, relative to ``separation``, a line may get to another one.
+
+    ``seed`` seeds the jitter of the grid seeds; 0 places the lines where
+    ``StreamLines`` does.
+    """
+
+    def __init__(
+        self,
+        func,
+        color=None,
+        color_scheme=None,
+        min_color_scheme_value=0,
+        max_color_scheme_value=2,
+        colors=DEFAULT_SCALAR_FIELD_COLORS,
+        x_range=None,
+        y_range=None,
+        z_range=None,
+        three_dimensions=False,
+        noise_factor=None,
+        n_repeats=1,
+        dt=0.05,
+        virtual_time=3,
+        max_anchors_per_line=100,
+        padding=3,
+        stroke_width=1,
+        opacity=1,
+        cache=None,
+        seeding="grid",
+        separation=None,
+        test_ratio=0.5,
+        seed=0,
+        **kwargs,
+    ):
+        self.time_field = as_time_field(func) if is_time_dependent(func) else None
+        if seeding not in ("grid", "even"):
+            raise ValueError(f"unknown seeding {seeding!r}, expected grid or even")
+        if seeding == "even" and (self.time_field is not None or three_dimensions or z_range):
+            raise ValueError("even seeding needs a static planar field")
+        self.seeding = seeding
+        self.test_ratio = test_ratio
+        self.time = 0.0
+        self.field = self.time_field.at(self.time) if self.time_field else as_batch_field(func)
+        self.cache = cache
+        self.ranges = field_ranges(x_range, y_range, z_range, three_dimensions)
+        self.x_range, self.y_range, self.z_range = self.ranges
+        self._default_color_scheme = color_scheme is None
+        VectorField.__init__(
+            self,
+            self.field,
+            color,
+            color_scheme,
+            min_color_scheme_value,
+            max_color_scheme_value,
+            colors,
+            **kwargs,
+        )
+        self._setup_batch_colors(min_color_scheme_value, max_color_scheme_value, colors)
+        self.func = self.field
+        self.noise_factor = noise_factor if noise_factor is not None else self.y_range[2] / 2
+        self.n_repeats = n_repeats
+        self.dt = dt
+        self.virtual_time = virtual_time
+        self.max_anchors_per_line = max_anchors_per_line
+        self.padding = padding
+        self.stroke_width = stroke_width
+        # the default follows the seed grid step, already coarser in a preview
+        self.separation = coarser(separation) if separation else self.y_range[2]
+
+        half_noise = self.noise_factor / 2
+        # a local generator with StreamLines' seed: the same jitter as the
+        # stock class, without resetting NumPy's global random state
+        rng = np.random.RandomState(seed)
+        grid = np.tile(grid_points(self.ranges), (n_repeats, 1))
+        start_points = grid - half_noise + self.noise_factor * rng.random_sample(grid.shape)
+
+        steps = np.array([r[2] for r in self.ranges])
+        lower = np.array([r[0] for r in self.ranges]) - padding
+        upper = np.array([r[1] for r in self.ranges]) + padding - steps
+        max_steps = ceil(virtual_time / dt) + 1
+        self.start_points, self.lower, self.upper, self.max_steps = start_points, lower, upper, max_steps
+
+        if not self.single_color and self.time_field is None:
+            self.background_img = self.get_colored_background_image()
+            if config.renderer == RendererType.OPENGL:
+                self.values_to_rgbas = self.get_vectorized_rgba_gradient_function(
+                    min_color_scheme_value,
+                    max_color_scheme_value,
+                    colors,
+                )
+
+        if seeding == "even":
+            trajectories = self.integrate_evenly()
+        else:
+            trajectories = self.integrate(start_points, dt, max_steps, lower, upper)
+        for points in trajectories:
+            self.add(self.make_line(points, max_steps * dt, opacity))
+        self.stream_lines = [*self.submobjects]
+
+    def integrate(self, start_points, dt, max_steps, lower, upper):
+        def compute():
+            return integrate_streamlines(self.field, start_points, dt, max_steps, lower, upper)
+
+        # frozen time fields may close over live solver state, so they are not cached
+        if self.cache is None or self.time_field is not None:
+            return compute()
+        key = self.cache.key(
+            self.field,
+            start_points,
+            stroke_width=self.stroke_width,
+            max_anchors_per_line=self.max_anchors_per_line,
+            virtual_time=self.virtual_time,
+            dt=dt,
+            lower=tuple(lower),
+            upper=tuple(upper),
+        )
+        return self.cache.get_or_compute(key, compute)
+
+    def integrate_evenly(self):
+        lower = np.array([r[0] for r in self.ranges])
+        upper = np.array([r[1] - r[2] for r in self.ranges])
+
+        def key(separation):
+            return self.cache.key(
+                self.field,
+                np.empty((0, 3)),
+                seeding="even",
+                separation=separation,
+                test_ratio=self.test_ratio,
+                lower=tuple(lower),
+                upper=tuple(upper),
+            )
+
+        def compute():
+            initial = ()
+            if self.cache is not None and preview_scale() == 1:
+                # refine the lines of a draft render rather than start over
+                for scale in DRAFT_SCALES:
+                    draft = self.cache.load(key(self.separation * scale))
+                    if draft is not None:
+                        initial = draft[0]
+                        break
+            return evenly_spaced_streamlines(
+                self.field, lower, upper, self.separation, self.test_ratio, initial=initial
+            )
+
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(key(self.separation), compute)
+
+    def make_line(self, points, duration, opacity):
+        line = get_vectorized_mobject_class()()
+        line.duration = duration
+        line.opacity = opacity
+        step = max(1, int(len(points) / self.max_anchors_per_line))
+        line.set_points_smoothly(points[::step])
+        if self.single_color:
+            line.set_stroke(color=self.color, width=self.stroke_width, opacity=opacity)
+        elif config.renderer == RendererType.OPENGL:
+            line.set_stroke(width=self.stroke_width / 4.0)
+            self.color_line(line, line)
+        else:
+            if self.time_field is not None or np.any(np.array(self.z_range) != np.array([0, 0.5, 0.5])):
+                self.color_line(line, line)
+            else:
+                line.color_using_background_image(self.background_img)
+            line.set_stroke(width=self.stroke_width, opacity=opacity)
+        return line
+
+    def color_line(self, line, shape):
+        # shape holds the full path; while flowing, line only shows part of it
+        if config.renderer == RendererType.OPENGL:
+            norms = self.batch_color_values(self.field.batch(shape.points))
+            line.set_rgba_array_direct(self.values_to_rgbas(norms, line.opacity), name="stroke_rgba")
+        else:
+            anchors = shape.get_anchors()
+            rgbas = np.empty((len(anchors), 4))
+            rgbas[:, :3] = self.batch_rgbs(anchors)
+            rgbas[:, 3] = line.opacity
+            # what set_stroke(colors) stores, without a ManimColor per anchor
+            line.stroke_rgbas = rgbas
+
+    def set_time(self, t):
+        """Re-integrate every line through the field frozen at time ``t``."""
+        self.time = t
+        self.field = self.func = self.time_field.at(t)
+        trajectories = integrate_streamlines(
+            self.field, self.start_points, self.dt, self.max_steps, self.lower, self.upper
+        )
+        for line, points in zip(self.stream_lines, trajectories):
+            # the flow animation redraws the line from its starting copy
+            shape = line.anim.starting_mobject if hasattr(line, "anim") else line
+            step = max(1, int(len(points) / self.max_anchors_per_line))
+            anchors = points[::step]
+            if len(anchors) < 2:
+                shape.set_points_smoothly(anchors)
+            else:
+                # set_points_smoothly on a single path, without splitting it into subpaths first
+                h1, h2 = get_smooth_cubic_bezier_handle_points(anchors)
+                shape.set_anchors_and_handles(anchors[:-1], h1, h2, anchors[1:])
+            if not self.single_color:
+                self.color_line(line, shape)
+        if hasattr(self, "packed_curves"):
+            self.pack_lines()
+        return self
+
+    def start_animation(self, warm_up=True, flow_speed=1, time_width=0.3, packed=False, **kwargs):
+        """``StreamLines.start_animation``, or with ``packed=True`` one updater for all lines.
+
+        In packed mode the Bezier curves of every line live in one array and
+        each frame advances all time windows at once, cutting the visible
+        pieces out of that array and drawing them as the subpaths of a single
+        mobject.  That needs one paint for every line, so it applies to a
+        single ``color`` or the default background-image coloring under
+        Cairo; otherwise this falls back to the per-line animations.
+        """
+        packable = config.renderer == RendererType.CAIRO and (
+            self.single_color or getattr(self, "background_img", None) is not None
+        )
+        if not packed or not packable or kwargs:
+            return super().start_animation(warm_up=warm_up, flow_speed=flow_speed, time_width=time_width, **kwargs)
+
+        self.flow_speed = flow_speed
+        self.time_width = time_width
+        self.pack_lines()
+        rng = np.random.default_rng(0)
+        self.line_times = rng.random(len(self.stream_lines)) * self.virtual_time
+        if warm_up:
+            self.line_times *= -1
+        self.run_times = np.array([line.duration for line in self.stream_lines]) / flow_speed
+
+        self.flow_mobject = get_vectorized_mobject_class()()
+        if self.single_color:
+            self.flow_mobject.set_stroke(color=self.color, width=self.stroke_width, opacity=self.stream_lines[0].opacity)
+        else:
+            self.flow_mobject.color_using_background_image(self.background_img)
+            self.flow_mobject.set_stroke(width=self.stroke_width, opacity=self.stream_lines[0].opacity)
+        self.remove(*self.stream_lines)
+        self.add(self.flow_mobject)
+
+        def updater(mob, dt):
+            mob.line_times += dt * mob.flow_speed
+            mob.line_times[mob.line_times >= mob.virtual_time] -= mob.virtual_time
+            mob.update_flow()
+
+        self.add_updater(updater)
+        self.flow_animation = updater
+        self.update_flow()
+        return self
+
+    def pack_lines(self):
+        """Gather the curves of every line into ``packed_curves`` with per-line offsets."""
+        counts = np.array([line.get_num_curves() for line in self.stream_lines])
+        self.curve_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.curve_counts = counts
+        points = [line.points for line in self.stream_lines if len(line.points)]
+        self.packed_curves = np.concatenate(points).reshape(-1, 4, 3) if points else np.empty((0, 4, 3))
+        return self
+
+    def update_flow(self):
+        """Show every line's ``ShowPassingFlash`` window at the current line times."""
+        return self.show_windows(*self.flash_windows(self.line_times))
+
+    def flash_windows(self, line_times):
+        # ShowPassingFlash._get_bounds for every line
+        alpha = np.clip(line_times / self.run_times, 0, 1)
+        upper = alpha * (1 + self.time_width)
+        lower = np.maximum(upper - self.time_width, 0)
+        return lower, np.minimum(upper, 1)
+
+    def show_windows(self, lower, upper):
+        """Draw the part ``[lower, upper]`` of every line (as in ``pointwise_become_partial``)."""
+        visible = (upper > lower) & (self.curve_counts > 0)
+        n = self.curve_counts[visible]
+        lower, upper = lower[visible], upper[visible]
+
+        # integer_interpolate(0, n, a) for the window ends
+        lower_index = np.minimum((lower * n).astype(int), n - 1)
+        lower_residue = lower * n - lower_index
+        upper_index = np.minimum((upper * n).astype(int), n - 1)
+        upper_residue = upper * n - upper_index
+
+        spans = upper_index - lower_index + 1
+        ends = np.cumsum(spans)
+        starts = ends - spans
+        local = np.arange(ends[-1] if len(ends) else 0) - np.repeat(starts, spans)
+        index = np.repeat(self.curve_offsets[:-1][visible] + lower_index, spans) + local
+        # every visible curve is whole, except the first and last of each window
+        a = np.zeros(len(index))
+        b = np.ones(len(index))
+        a[starts] = lower_residue
+        b[ends - 1] = upper_residue
+        pieces = self.packed_curves[index]
+        cut = (a > 0) | (b < 1)
+        pieces[cut] = partial_cubics(pieces[cut], a[cut], b[cut])
+        self.flow_mobject.points = pieces.reshape(-1, 3)
+        return self
+
+    def end_animation(self):
+        """``StreamLines.end_animation`` as one animation over the packed lines."""
+        if not hasattr(self, "flow_mobject"):
+            return super().end_animation()
+        if self.flow_animation is None:
+            raise ValueError("You have to start the animation before fading it out.")
+        self.remove_updater(self.flow_animation)
+        self.flow_animation = None
+
+        max_run_time = self.virtual_time / self.flow_speed
+        creation_rate_func = ease_out_sine
+        creation_run_time = max_run_time / (1 + self.time_width) * creation_rate_func(0.001) * 1000
+        start_times = self.line_times.copy()
+        waiting = start_times <= 0
+        # lines that have not started stay hidden until their turn, the others
+        # finish their flash; then every line is drawn in full
+        wait = np.where(waiting, -start_times / self.flow_speed, max_run_time - start_times / self.flow_speed)
+        run_time = wait.max() + creation_run_time
+
+        def update(mob, alpha):
+            elapsed = alpha * run_time
+            lower, upper = mob.flash_windows(start_times + elapsed * mob.flow_speed)
+            lower[waiting] = upper[waiting] = 0
+            creating = elapsed >= wait
+            progress = np.clip((elapsed - wait[creating]) / creation_run_time, 0, 1)
+            lower[creating] = 0
+            # ease_out_sine, which only takes scalars
+            upper[creating] = np.sin(progress * np.pi / 2)
+            mob.show_windows(lower, upper)
+
+        return UpdateFromAlphaFunc(self, update, run_time=run_time, rate_func=linear)
+
+    def start_time_updates(self, speed=1, refresh=0.5):
+        """Follow the time-dependent field, refreshing the lines every ``refresh`` seconds."""
+        if self.time_field is None:
+            raise ValueError("start_time_updates needs a field F(pos, t)")
+        self.time_elapsed = 0.0
+
+        def updater(mob, dt):
+            mob.time_elapsed += speed * dt
+            if mob.time_elapsed - mob.time >= refresh:
+                mob.set_time(mob.time_elapsed)
+
+        self.time_updater = updater
+        self.add_updater(updater)
+        return self
+
+    def stop_time_updates(self):
+        self.remove_updater(self.time_updater)
+        return self
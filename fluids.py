@@ -0,0 +1,241 @@
+"""Stable Fluids (Jos Stam, 1999) on a NumPy grid.
+
+Semi-Lagrangian advection, implicit diffusion and pressure projection, both
+solved with Jacobi iterations.  Every array the solver touches during a step is
+allocated once in ``__init__`` and reused.  The grid covers the manim frame by
+default and ``velocity_field()`` returns a ``BatchField`` that can be handed to
+``axis_vector_field``, ``PackedArrowVectorField`` or ``BatchStreamLines``;
+``time_field()`` returns the evolving velocity for animating the flow.
+
+Benchmark::
+
+    python fluids.py --resolution 256 --steps 100
+"""
+
+import argparse
+import time
+from math import ceil, log
+
+import numpy as np
+
+from fields import BatchField, TimeField
+from preview import fewer
+
+
+def bilinear(field, x, y, out=None):
+    """Sample ``field`` at fractional grid coordinates ``x``, ``y``.
+
+    Coordinates must already be clamped to ``[0, n - 1]`` along each axis.
+    """
+    i0 = np.minimum(x.astype(np.intp), field.shape[0] - 2)
+    j0 = np.minimum(y.astype(np.intp), field.shape[1] - 2)
+    s = x - i0
+    t = y - j0
+    flat = field.ravel()
+    idx = i0 * field.shape[1] + j0
+    stride = field.shape[1]
+    result = (1 - s) * ((1 - t) * flat[idx] + t * flat[idx + 1]) + s * (
+        (1 - t) * flat[idx + stride] + t * flat[idx + stride + 1]
+    )
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def sample_velocity(u, v, points, origin, h):
+    """Interpolate the (u, v) grid at an (N, 3) array of scene points."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    nx, ny = u.shape[0] - 2, u.shape[1] - 2
+    # cell i is centred on origin + (i - 0.5) * h
+    x = np.clip((points[:, 0] - origin[0]) / h + 0.5, 0.5, nx + 0.5)
+    y = np.clip((points[:, 1] - origin[1]) / h + 0.5, 0.5, ny + 0.5)
+    result = np.zeros_like(points)
+    result[:, 0] = bilinear(u, x, y)
+    result[:, 1] = bilinear(v, x, y)
+    return result
+
+
+class StableFluids:
+    def __init__(
+        self,
+        resolution=256,
+        x_range=(-7.2, 7.2),
+        y_range=(-4, 4),
+        viscosity=0.0001,
+        iterations=40,
+        force=None,
+    ):
+        self.nx = fewer(resolution)
+        self.h = (x_range[1] - x_range[0]) / self.nx
+        self.ny = max(1, round((y_range[1] - y_range[0]) / self.h))
+        self.origin = np.array([x_range[0], y_range[0]])
+        self.viscosity = viscosity
+        self.iterations = iterations
+        # force(points, t) -> (N, 3) acceleration at the given scene points
+        self.force = force
+        self.time = 0.0
+
+        shape = (self.nx + 2, self.ny + 2)
+        inner = (self.nx, self.ny)
+        self.u = np.zeros(shape)
+        self.v = np.zeros(shape)
+        self.u_prev = np.zeros(shape)
+        self.v_prev = np.zeros(shape)
+        self.p = np.zeros(shape)
+        self.div = np.zeros(shape)
+        self._sum = np.zeros(inner)
+        self._x = np.zeros(inner)
+        self._y = np.zeros(inner)
+
+        i, j = np.meshgrid(np.arange(1, self.nx + 1), np.arange(1, self.ny + 1), indexing="ij")
+        self._i = i.astype(float)
+        self._j = j.astype(float)
+        self.points = np.zeros((self.nx * self.ny, 3))
+        self.points[:, 0] = self.origin[0] + (self._i.ravel() - 0.5) * self.h
+        self.points[:, 1] = self.origin[1] + (self._j.ravel() - 0.5) * self.h
+
+    def set_boundary(self, b, x):
+        # b = 1: x velocity, b = 2: y velocity (both reflect at the walls),
+        # b = 0: scalar field (zero normal derivative)
+        x[0, 1:-1] = -x[1, 1:-1] if b == 1 else x[1, 1:-1]
+        x[-1, 1:-1] = -x[-2, 1:-1] if b == 1 else x[-2, 1:-1]
+        x[1:-1, 0] = -x[1:-1, 1] if b == 2 else x[1:-1, 1]
+        x[1:-1, -1] = -x[1:-1, -2] if b == 2 else x[1:-1, -2]
+        x[0, 0] = 0.5 * (x[1, 0] + x[0, 1])
+        x[0, -1] = 0.5 * (x[1, -1] + x[0, -2])
+        x[-1, 0] = 0.5 * (x[-2, 0] + x[-1, 1])
+        x[-1, -1] = 0.5 * (x[-2, -1] + x[-1, -2])
+
+    def linear_solve(self, b, x, x0, a, c, iterations=None):
+        s = self._sum
+        for _ in range(iterations or self.iterations):
+            np.add(x[:-2, 1:-1], x[2:, 1:-1], out=s)
+            s += x[1:-1, :-2]
+            s += x[1:-1, 2:]
+            s *= a
+            s += x0[1:-1, 1:-1]
+            s /= c
+            x[1:-1, 1:-1] = s
+            self.set_boundary(b, x)
+
+    def diffuse(self, b, x, x0, dt):
+        a = dt * self.viscosity / self.h**2
+        if a == 0:
+            x[...] = x0
+            return
+        # Jacobi contracts the error by 4a / (1 + 4a) per sweep, which for
+        # typical viscosities is tiny; stop once it is below 1e-6
+        rate = 4 * a / (1 + 4 * a)
+        iterations = min(self.iterations, max(1, ceil(log(1e-6) / log(rate))))
+        self.linear_solve(b, x, x0, a, 1 + 4 * a, iterations)
+
+    def advect(self, b, d, d0, u, v, dt):
+        dt0 = dt / self.h
+        x, y = self._x, self._y
+        np.multiply(u[1:-1, 1:-1], -dt0, out=x)
+        x += self._i
+        np.clip(x, 0.5, self.nx + 0.5, out=x)
+        np.multiply(v[1:-1, 1:-1], -dt0, out=y)
+        y += self._j
+        np.clip(y, 0.5, self.ny + 0.5, out=y)
+        bilinear(d0, x, y, out=d[1:-1, 1:-1])
+        self.set_boundary(b, d)
+
+    def project(self, u, v, p, div):
+        h = self.h
+        div[1:-1, 1:-1] = u[2:, 1:-1]
+        div[1:-1, 1:-1] -= u[:-2, 1:-1]
+        div[1:-1, 1:-1] += v[1:-1, 2:]
+        div[1:-1, 1:-1] -= v[1:-1, :-2]
+        div[1:-1, 1:-1] *= -0.5 * h
+        p.fill(0)
+        self.set_boundary(0, div)
+        self.set_boundary(0, p)
+        self.linear_solve(0, p, div, 1, 4)
+        u[1:-1, 1:-1] -= 0.5 / h * (p[2:, 1:-1] - p[:-2, 1:-1])
+        v[1:-1, 1:-1] -= 0.5 / h * (p[1:-1, 2:] - p[1:-1, :-2])
+        self.set_boundary(1, u)
+        self.set_boundary(2, v)
+
+    def add_force(self, dt):
+        if self.force is None:
+            return
+        f = np.asarray(self.force(self.points, self.time), dtype=float)
+        self.u[1:-1, 1:-1] += dt * f[:, 0].reshape(self.nx, self.ny)
+        self.v[1:-1, 1:-1] += dt * f[:, 1].reshape(self.nx, self.ny)
+
+    def step(self, dt=0.05):
+        self.add_force(dt)
+
+        self.u, self.u_prev = self.u_prev, self.u
+        self.v, self.v_prev = self.v_prev, self.v
+        self.diffuse(1, self.u, self.u_prev, dt)
+        self.diffuse(2, self.v, self.v_prev, dt)
+        self.project(self.u, self.v, self.p, self.div)
+
+        self.u, self.u_prev = self.u_prev, self.u
+        self.v, self.v_prev = self.v_prev, self.v
+        self.advect(1, self.u, self.u_prev, self.u_prev, self.v_prev, dt)
+        self.advect(2, self.v, self.v_prev, self.u_prev, self.v_prev, dt)
+        self.project(self.u, self.v, self.p, self.div)
+
+        self.time += dt
+        return self
+
+    def run(self, duration, dt=0.05):
+        for _ in range(round(duration / dt)):
+            self.step(dt)
+        return self
+
+    def sample(self, points):
+        return sample_velocity(self.u, self.v, points, self.origin, self.h)
+
+    def velocity_field(self):
+        """Snapshot of the current velocity as a ``BatchField``."""
+        u, v, origin, h = self.u.copy(), self.v.copy(), self.origin.copy(), self.h
+        return BatchField.from_batch(lambda points: sample_velocity(u, v, points, origin, h))
+
+    def time_field(self, dt=0.05):
+        """The velocity as a ``TimeField`` that steps the solver as ``t`` grows.
+
+        ``t`` counts from the solver's current time and may only move forward;
+        the field always samples the live grids, so it does not copy them.
+        """
+        start = self.time
+
+        def batch(points, t):
+            while self.time < start + t - dt / 2:
+                self.step(dt)
+            return self.sample(points)
+
+        return TimeField.from_batch(batch)
+
+
+def benchmark(resolution=256, steps=100, dt=0.05, iterations=40):
+    """Return the solver's steps per second on a resolution x resolution grid."""
+
+    def force(points, t):
+        f = np.zeros_like(points)
+        f[:, 0] = 4 * np.exp(-((points[:, 0] + 4) ** 2 + points[:, 1] ** 2))
+        return f
+
+    # square domain so that the grid is resolution x resolution
+    solver = StableFluids(resolution, (-4, 4), (-4, 4), iterations=iterations, force=force)
+    solver.step(dt)
+    start = time.perf_counter()
+    for _ in range(steps):
+        solver.step(dt)
+    return steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stable Fluids steps-per-second benchmark")
+    parser.add_argument("--resolution", type=int, nargs="+", default=[64, 128, 256])
+    parser.add_argument("--steps", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=40)
+    args = parser.parse_args()
+
+    for resolution in args.resolution:
+        rate = benchmark(resolution, args.steps, iterations=args.iterations)
+        print(f"{resolution}x{resolution} grid: {rate:.1f} steps/s")
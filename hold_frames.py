@@ -0,0 +1,63 @@
+"""Encode static waits as a single held frame.
+
+For a ``self.wait(...)`` where nothing can change, manim already rasterizes a
+single frame (``Scene.should_update_mobjects`` is false when there are no
+scene updaters, no time-based mobject updaters and no stop condition).  It
+still hands that frame to the encoder once per output frame, though, so a
+12 second wait at 60 fps converts and encodes 720 identical images.
+
+``HoldFrameFileWriter`` encodes the frame once and holds it by jumping the
+presentation timestamps; a second copy at the last timestamp keeps the
+segment's duration.  Waits that do move keep every frame: the ambient camera
+rotation of ``ThreeDScene`` and the flow of ``StreamLines.start_animation``
+are both time-based updaters, so manim never treats those waits as frozen.
+"""
+
+import av
+
+from manim import config, logger
+from manim.constants import RendererType
+from manim.scene.scene_file_writer import SceneFileWriter
+
+
+class HoldFrameFileWriter(SceneFileWriter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.next_pts = 0
+        self.held_frames = 0
+
+    def open_partial_movie_stream(self, file_path=None):
+        self.next_pts = 0
+        super().open_partial_movie_stream(file_path)
+
+    def encode_and_write_frame(self, frame, num_frames):
+        if num_frames <= 0:
+            return
+        if num_frames == 1:
+            timestamps = [self.next_pts]
+        else:
+            timestamps = [self.next_pts, self.next_pts + num_frames - 1]
+            self.held_frames += num_frames - 2
+        for pts in timestamps:
+            av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+            av_frame.pts = pts
+            for packet in self.video_stream.encode(av_frame):
+                self.video_container.mux(packet)
+        self.next_pts += num_frames
+
+    def finish(self):
+        super().finish()
+        if self.held_frames:
+            logger.info(f"{self.held_frames} static frames held instead of encoded")
+
+
+class HoldStaticFrames:
+    """Scene mixin that installs ``HoldFrameFileWriter`` for Cairo renders.
+
+    Use it as the first base class: ``class Gradiente(HoldStaticFrames, Scene)``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if config.renderer == RendererType.CAIRO:
+            self.renderer.file_writer = HoldFrameFileWriter(self.renderer, type(self).__name__)
@@ -0,0 +1,377 @@
+"""Opt-in tracking of mobjects and memory across the segments of a render.
+
+Set ``MEMORY_WATCH=1`` (or ``render_all.py --memory``/``batch.py
+--memory``) and every scene using the ``WatchMemory`` mixin takes a
+snapshot after each ``play`` and ``wait``:
+
+- live mobjects, and how many of them are on the scene;
+- bytes of the NumPy arrays those mobjects hold (points, colors and the
+  buffers of the packed mobjects), each buffer counted once however many
+  views share it;
+- updaters on the scene, and on mobjects that are no longer on it;
+- mobjects removed from the scene that something still references;
+- resident memory and the size of every registered cache.
+
+Snapshots cost a garbage collection and a walk over the objects it tracks,
+tens of milliseconds, so they are taken between animations only.  At the end
+of the render, removed mobjects still alive are logged with what refers to
+them, and the timeline goes to ``media/memory/<Scene>.memory.json`` (or the
+directory ``MEMORY_WATCH`` names).
+
+``MEMORY_BUDGET_MB`` sets a resident memory budget: when a snapshot is over
+it, the caches in ``CACHES`` are dropped, largest first, until it is under.
+Modules holding a cache of their own add it with ``register_cache``, as
+``field_dsl`` does for its compiled expressions.  For CI::
+
+    python memory_watch.py media/memory/*.memory.json --max-rss-mb 3000 --max-removed-alive 0
+"""
+
+import argparse
+import gc
+import json
+import os
+import types
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+from manim import Mobject, config, logger
+from manim.mobject.svg import svg_mobject
+
+from profiling import MB, resident_memory_mb, watch_segments
+
+
+def memory_directory():
+    """Where reports go, or None when tracking is off."""
+    value = os.environ.get("MEMORY_WATCH", "")
+    if value in ("", "0"):
+        return None
+    if value == "1":
+        return Path(config.media_dir) / "memory"
+    return Path(value)
+
+
+def memory_budget_mb():
+    value = os.environ.get("MEMORY_BUDGET_MB", "")
+    return float(value) if value else None
+
+
+def array_bytes(objects):
+    """Bytes of the arrays held in the attributes of ``objects``, each buffer once."""
+    seen = set()
+    total = 0
+    for obj in objects:
+        for value in vars(obj).values():
+            if not isinstance(value, np.ndarray):
+                continue
+            base = value
+            while isinstance(base.base, np.ndarray):
+                base = base.base
+            if id(base) not in seen:
+                seen.add(id(base))
+                total += base.nbytes
+    return total
+
+
+def _svg_cache_bytes(scene):
+    return array_bytes(m for mob in svg_mobject.SVG_HASH_TO_MOB_MAP.values() for m in mob.get_family())
+
+
+def _svg_cache_clear(scene):
+    svg_mobject.SVG_HASH_TO_MOB_MAP.clear()
+
+
+def _background_cache(scene):
+    # keyed by str(image), which for the images BatchStreamLines makes is
+    # their address: one frame-sized array per stream line set ever drawn
+    displayer = getattr(scene.renderer.camera, "background_colored_vmobject_displayer", None)
+    return displayer.file_name_to_pixel_array_map if displayer is not None else {}
+
+
+# name -> (bytes(scene), clear(scene))
+CACHES = {
+    "svg_mobjects": (_svg_cache_bytes, _svg_cache_clear),
+    "background_images": (
+        lambda scene: sum(a.nbytes for a in _background_cache(scene).values()),
+        lambda scene: _background_cache(scene).clear(),
+    ),
+}
+
+
+def register_cache(name, size, clear):
+    """Let a memory budget drop a cache: ``size(scene)`` in bytes, ``clear(scene)``."""
+    CACHES[name] = (size, clear)
+
+
+def _key_of(mapping, value):
+    for key, item in mapping.items():
+        if item is value:
+            return key
+    return None
+
+
+def _attribute(owner, value):
+    """``Type.attribute`` of ``owner`` that is ``value``, or None."""
+    key = _key_of(vars(owner), value)
+    if key is None:
+        return None
+    if isinstance(owner, types.ModuleType):
+        return f"global {owner.__name__}.{key}"
+    return f"{type(owner).__name__}.{key}"
+
+
+def _dict_owner(mapping):
+    for owner in gc.get_referrers(mapping):
+        if getattr(owner, "__dict__", None) is mapping:
+            return owner
+    return None
+
+
+def _owner(container):
+    """The attribute (or module global) through which ``container`` is reached, if any."""
+    for ref in gc.get_referrers(container):
+        # objects with inline attributes refer to their values directly
+        owner = _dict_owner(ref) if isinstance(ref, dict) else ref
+        if owner is not None and hasattr(owner, "__dict__") and not isinstance(owner, type):
+            name = _attribute(owner, container)
+            if name is not None:
+                return name
+    return None
+
+
+def _closure_owner(cell):
+    for closure in gc.get_referrers(cell):
+        if isinstance(closure, tuple):
+            for func in gc.get_referrers(closure):
+                if isinstance(func, types.FunctionType) and func.__closure__ is closure:
+                    return func
+    return None
+
+
+def describe_referrers(obj, limit=5):
+    """What holds ``obj``: owner attributes, containers, closures, frames and modules.
+
+    ``obj`` refers back to itself through the updaters and functions stored
+    on it and its family; those cycles do not keep it alive and are left out.
+    """
+    family = obj.get_family() if isinstance(obj, Mobject) else [obj]
+    family_ids = {id(m) for m in family}
+    own_functions = {id(f) for m in family for f in [*getattr(m, "updaters", ()), *vars(m).values()]}
+    found = []
+    for ref in gc.get_referrers(obj):
+        if ref is family:
+            continue
+        if isinstance(ref, types.FrameType):
+            # the frames looking at obj right now
+            if ref.f_code.co_filename == __file__:
+                continue
+            found.append(f"local of {ref.f_code.co_name}() in {Path(ref.f_code.co_filename).name}")
+        elif isinstance(ref, types.CellType):
+            func = _closure_owner(ref)
+            if func is not None and id(func) in own_functions:
+                continue
+            found.append(f"closure of {func.__qualname__}" if func is not None else "closure")
+        elif isinstance(ref, (list, tuple, set, dict)):
+            owner = _dict_owner(ref) if isinstance(ref, dict) else None
+            if owner is not None:
+                if id(owner) in family_ids:
+                    continue
+                found.append(_attribute(owner, obj) or type(owner).__name__)
+            else:
+                found.append(f"{type(ref).__name__} of {len(ref)} in {_owner(ref) or 'unknown'}")
+        elif hasattr(ref, "__dict__") and not isinstance(ref, type):
+            if id(ref) in family_ids:
+                continue
+            found.append(_attribute(ref, obj) or type(ref).__name__)
+        else:
+            found.append(type(ref).__name__)
+        if len(found) == limit:
+            break
+    return found
+
+
+class MemoryTimeline:
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.segments = []
+        self.budget_mb = memory_budget_mb()
+        # id -> (weakref, name, segment) of mobjects taken off the scene
+        self.removed = {}
+        self.on_scene = {}
+
+    def snapshot(self, kind, name, scene):
+        gc.collect()
+        live = [o for o in gc.get_objects() if isinstance(o, Mobject)]
+        family = scene.get_mobject_family_members()
+        family_ids = {id(m) for m in family}
+        orphans = [m for m in live if id(m) not in family_ids and m.updaters]
+        self._track_removed(scene)
+        alive = [(ref(), label) for ref, label, _ in self.removed.values() if ref() is not None]
+        alive_bytes = array_bytes(m for obj, _ in alive for m in obj.get_family())
+
+        segment = {
+            "kind": kind,
+            "name": name,
+            "time": getattr(scene.renderer, "time", 0.0),
+            "mobjects_live": len(live),
+            "mobjects_on_scene": len(family),
+            "array_mb": array_bytes(live) / MB,
+            "scene_array_mb": array_bytes(family) / MB,
+            "updaters": sum(len(m.updaters) for m in family) + len(scene.updaters),
+            "orphan_updaters": sum(len(m.updaters) for m in orphans),
+            "removed_alive": len(alive),
+            "removed_alive_mb": alive_bytes / MB,
+            "removed_alive_types": sorted({label for _, label in alive}),
+            "caches_mb": {cache: size(scene) / MB for cache, (size, _) in CACHES.items()},
+            "rss_mb": resident_memory_mb(),
+            "dropped": [],
+        }
+        del live, family, orphans, alive
+        if self.budget_mb is not None and segment["rss_mb"] > self.budget_mb:
+            self.enforce_budget(segment, scene)
+        self.segments.append(segment)
+        return segment
+
+    def _track_removed(self, scene):
+        top = {id(m): m for m in [*scene.mobjects, *scene.foreground_mobjects]}
+        for key in list(self.on_scene):
+            if key not in top:
+                ref, label = self.on_scene.pop(key)
+                if ref() is not None:
+                    self.removed[key] = (ref, label, len(self.segments))
+        for key, mob in top.items():
+            self.removed.pop(key, None)
+            if key not in self.on_scene:
+                try:
+                    self.on_scene[key] = (weakref.ref(mob), type(mob).__name__)
+                except TypeError:
+                    pass
+        for key in [k for k, (ref, _, _) in self.removed.items() if ref() is None]:
+            del self.removed[key]
+
+    def enforce_budget(self, segment, scene):
+        """Drop caches, largest first, until resident memory is within the budget."""
+        for name in sorted(segment["caches_mb"], key=segment["caches_mb"].get, reverse=True):
+            if not segment["caches_mb"][name]:
+                continue
+            CACHES[name][1](scene)
+            gc.collect()
+            segment["dropped"].append(name)
+            segment["rss_mb"] = resident_memory_mb()
+            if segment["rss_mb"] <= self.budget_mb:
+                break
+        level = logger.info if segment["rss_mb"] <= self.budget_mb else logger.warning
+        level(
+            f"memory budget {self.budget_mb:.0f} MB: dropped {', '.join(segment['dropped']) or 'nothing'}, "
+            f"{segment['rss_mb']:.0f} MB resident"
+        )
+
+    def leaks(self):
+        """Removed mobjects still alive, with what refers to them."""
+        gc.collect()
+        report = []
+        for ref, label, segment in self.removed.values():
+            obj = ref()
+            if obj is not None:
+                report.append({"type": label, "removed_after": segment, "held_by": describe_referrers(obj)})
+            del obj
+        return report
+
+    def table(self):
+        header = f"{'#':>3}  {'segment':<40} {'live':>6} {'scene':>6} {'arrMB':>6} {'updt':>4} {'orph':>4} {'rmAlive':>7} {'cacheMB':>7} {'RSS':>6}"
+        lines = [f"memory of {self.scene_name}", header]
+        for i, s in enumerate(self.segments):
+            name = f"{s['kind']}: {s['name']}"
+            name = name if len(name) <= 40 else name[:37] + "..."
+            lines.append(
+                f"{i:>3}  {name:<40} {s['mobjects_live']:>6} {s['mobjects_on_scene']:>6} {s['array_mb']:>6.1f} "
+                f"{s['updaters']:>4} {s['orphan_updaters']:>4} {s['removed_alive']:>7} "
+                f"{sum(s['caches_mb'].values()):>7.1f} {s['rss_mb']:>6.0f}"
+                + (f"  dropped {', '.join(s['dropped'])}" if s["dropped"] else "")
+            )
+        return "\n".join(lines)
+
+    def write(self, directory, leaks):
+        directory.mkdir(parents=True, exist_ok=True)
+        report = {
+            "scene": self.scene_name,
+            "quality": config.quality,
+            "budget_mb": self.budget_mb,
+            "segments": self.segments,
+            "leaks": leaks,
+        }
+        (directory / f"{self.scene_name}.memory.json").write_text(json.dumps(report, indent=1))
+
+
+@watch_segments
+class WatchMemory:
+    """Scene mixin that tracks memory per segment when ``MEMORY_WATCH`` is set."""
+
+    memory = None
+
+    def render(self, preview=False):
+        directory = memory_directory()
+        if directory is None and memory_budget_mb() is None:
+            return super().render(preview)
+        self.memory = MemoryTimeline(config.output_file or type(self).__name__)
+        try:
+            return super().render(preview)
+        finally:
+            self.memory.snapshot("end", "render", self)
+            leaks = self.memory.leaks()
+            logger.info("\n" + self.memory.table())
+            for leak in leaks:
+                logger.warning(
+                    f"{leak['type']} removed after segment {leak['removed_after']} is still held by: "
+                    + ("; ".join(leak["held_by"]) or "unknown")
+                )
+            if directory is not None:
+                self.memory.write(directory, leaks)
+
+    def _watching(self):
+        return self.memory is not None
+
+    def _begin_segment(self):
+        return None
+
+    def _end_segment(self, kind, name, begun):
+        self.memory.snapshot(kind, name, self)
+
+def check(report, max_rss_mb=None, max_growth_mb=None, max_removed_alive=None):
+    """Problems of one report against the limits; an empty list passes."""
+    segments = report["segments"]
+    problems = []
+    if not segments:
+        return problems
+    peak = max(s["rss_mb"] for s in segments)
+    if max_rss_mb is not None and peak > max_rss_mb:
+        problems.append(f"resident memory reached {peak:.0f} MB (limit {max_rss_mb:.0f})")
+    growth = segments[-1]["rss_mb"] - segments[0]["rss_mb"]
+    if max_growth_mb is not None and growth > max_growth_mb:
+        problems.append(f"resident memory grew by {growth:.0f} MB (limit {max_growth_mb:.0f})")
+    if max_removed_alive is not None and len(report["leaks"]) > max_removed_alive:
+        held = ", ".join(f"{l['type']} ({'; '.join(l['held_by'][:2])})" for l in report["leaks"])
+        problems.append(f"{len(report['leaks'])} removed mobjects still alive: {held}")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check memory reports written by WatchMemory")
+    parser.add_argument("reports", nargs="+", help="<Scene>.memory.json files")
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    parser.add_argument("--max-growth-mb", type=float, default=None, help="from the first segment to the last")
+    parser.add_argument("--max-removed-alive", type=int, default=None, help="removed mobjects alive after the render")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.reports:
+        report = json.loads(Path(path).read_text())
+        segments = report["segments"]
+        peak = max((s["rss_mb"] for s in segments), default=0)
+        print(f"{report['scene']}: {len(segments)} segments, peak {peak:.0f} MB, {len(report['leaks'])} leaked mobjects")
+        for problem in check(report, args.max_rss_mb, args.max_growth_mb, args.max_removed_alive):
+            print(f"  FAIL {problem}")
+            failed = True
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,253 @@
+"""Morphs between parametric surfaces that share one (u, v) grid.
+
+    morph = MorphSurface(sphere_uv(2), cylinder_uv(2, 0.1), resolution=(48, 48), v_breaks=cylinder_breaks(2, 0.1))
+    self.play(FadeIn(morph))
+    self.play(morph.blend_to(1, run_time=2))
+
+``FadeTransform`` between two manim surfaces cross-fades two meshes whose
+faces do not correspond, so both are shaded and depth-sorted on every frame.
+Here both surfaces are sampled once on the same grid, vertex ``(i, j)`` of one
+going to vertex ``(i, j)`` of the other, and the mesh is a single vertex
+buffer: a frame is one in-place blend of the two grids, and the faces are
+rebuilt from it as views into one packed array of Bezier points.
+
+``DepthSortedScene`` draws with ``DepthSortedCamera``, which takes the depth
+and shading of morph faces from arrays computed once per blend instead of
+walking every face, and reuses the draw order of the previous frame while
+neither the camera nor any shaded mobject moved.  Move a morph through its
+surface functions: the arrays do not see in-place transforms of its faces.
+"""
+
+import numpy as np
+
+from manim import BLUE_D, BLUE_E, LIGHT_GREY, UP, ThreeDVMobject, UpdateFromAlphaFunc, VGroup
+from manim.camera.camera import Camera
+from manim.camera.three_d_camera import ThreeDCamera
+from manim.utils.color import ManimColor
+from manim.utils.space_ops import get_unit_normal
+
+from fields import polygons_to_bezier_points
+from preview import fewer
+from surfaces import evaluate_uv
+
+
+def sphere_uv(radius=1):
+    """Sphere on u in [0, tau] around the z axis, v in [0, 1] from the bottom pole up."""
+    return lambda u, v: radius * np.array([np.cos(u) * np.sin(np.pi * v), np.sin(u) * np.sin(np.pi * v), -np.cos(np.pi * v)])
+
+
+def cylinder_breaks(radius=1, height=2):
+    """The v where ``cylinder_uv`` goes from the bottom cap to the side and from the side to the top cap."""
+    a = radius / (2 * radius + height)
+    return (a, 1 - a)
+
+
+def cylinder_uv(radius=1, height=2):
+    """Closed cylinder on the parameters of ``sphere_uv``: bottom cap, side, top cap.
+
+    Each part gets a share of v proportional to its length along the
+    profile, so that the poles of a sphere land on the centers of the caps.
+    """
+    a, b = cylinder_breaks(radius, height)
+
+    def func(u, v):
+        rho = radius * np.minimum(1, np.minimum(v / a, (1 - v) / a))
+        z = height * (np.clip((v - a) / (b - a), 0, 1) - 0.5)
+        return np.array([rho * np.cos(u), rho * np.sin(u), z])
+
+    return func
+
+
+def split_range(low, high, count, breaks=()):
+    """``count + 1`` values from ``low`` to ``high`` that include every break.
+
+    Each piece between breaks gets a number of cells proportional to its
+    length, at least one.
+    """
+    edges = [low, *sorted(breaks), high]
+    lengths = np.diff(edges)
+    counts = np.maximum(1, np.round(count * lengths / (high - low)).astype(int))
+    pieces = [np.linspace(a, b, n, endpoint=False) for a, b, n in zip(edges[:-1], edges[1:], counts)]
+    return np.concatenate([*pieces, [high]])
+
+
+class MorphFace(ThreeDVMobject):
+    """Face ``index`` of a ``MorphSurface``."""
+
+    def __init__(self, morph, index, **kwargs):
+        super().__init__(**kwargs)
+        self.morph = morph
+        self.index = index
+
+    def get_z_index_reference_point(self):
+        return self.morph.face_centers[self.index]
+
+
+class MorphSurface(VGroup):
+    """A surface blended between ``start(u, v)`` and ``end(u, v)``.
+
+    ``resolution`` cells along u and v; ``v_breaks`` are values of v the grid
+    must contain, such as the edges of the caps of ``cylinder_uv``.  Styling
+    follows ``Surface``.  ``blend`` is 0 for the start surface and 1 for the
+    end one.
+    """
+
+    def __init__(
+        self,
+        start,
+        end,
+        u_range=(0, 2 * np.pi),
+        v_range=(0, 1),
+        resolution=(32, 32),
+        v_breaks=(),
+        blend=0.0,
+        fill_color=BLUE_D,
+        fill_opacity=1.0,
+        checkerboard_colors=(BLUE_D, BLUE_E),
+        stroke_color=LIGHT_GREY,
+        stroke_width=0.5,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        nu, nv = (fewer(resolution), fewer(resolution)) if isinstance(resolution, int) else map(fewer, resolution)
+        u_values = np.linspace(*u_range, nu + 1)
+        v_values = split_range(*v_range, nv, v_breaks)
+        u, v = np.meshgrid(u_values, v_values, indexing="ij")
+        self.start_grid = evaluate_uv(start, u, v)
+        self.end_grid = evaluate_uv(end, u, v)
+        self.delta = self.end_grid - self.start_grid
+        self.grid = np.empty_like(self.start_grid)
+
+        # corner (i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1) of every cell
+        i, j = np.meshgrid(np.arange(nu), np.arange(len(v_values) - 1), indexing="ij")
+        i, j = i.ravel(), j.ravel()
+        self.corner_index = (
+            np.stack([i, i + 1, i + 1, i], axis=1),
+            np.stack([j, j, j + 1, j + 1], axis=1),
+        )
+        n = len(i)
+        self.corners = np.empty((n, 4, 3))
+        self.face_points = np.empty((n, 16, 3))
+        self.face_centers = np.empty((n, 3))
+        self.version = 0
+        self._light = None
+
+        faces = [MorphFace(self, k) for k in range(n)]
+        self.add(*faces)
+        self.set_fill(color=fill_color, opacity=fill_opacity)
+        self.set_stroke(color=stroke_color, width=stroke_width)
+        if checkerboard_colors:
+            colors = [ManimColor(c) for c in checkerboard_colors]
+            for face, a, b in zip(faces, i, j):
+                face.set_fill(colors[(a + b) % len(colors)], opacity=fill_opacity)
+        self.set_blend(blend)
+
+    def set_blend(self, alpha):
+        """Show the surface at ``alpha`` between start (0) and end (1), in place."""
+        self.blend = alpha
+        np.multiply(self.delta, alpha, out=self.grid)
+        self.grid += self.start_grid
+        ci, cj = self.corner_index
+        self.corners[...] = self.grid[ci, cj]
+        polygons_to_bezier_points(self.corners, out=self.face_points.reshape(-1, 3))
+        np.mean(self.corners, axis=1, out=self.face_centers)
+        for face, points in zip(self.submobjects, self.face_points):
+            face.points = points
+        self.version += 1
+        return self
+
+    def blend_to(self, alpha=1.0, **kwargs):
+        """Animation from the current blend to ``alpha``."""
+        start = self.blend
+        return UpdateFromAlphaFunc(self, lambda mob, t: mob.set_blend(start + (alpha - start) * t), **kwargs)
+
+    def light_offsets(self, light_source):
+        """What ``get_shaded_rgb`` adds at the two shading corners of every face, shape (N, 2)."""
+        key = (self.version, light_source.tobytes())
+        if self._light is not None and self._light[0] == key:
+            return self._light[1]
+        p = self.face_points
+        # the corners and normals ThreeDCamera takes from each face: point 0
+        # and point 6, with the normal from the points three before and after
+        offsets = np.empty((len(p), 2))
+        for column, (c, before, after) in enumerate(((0, 12, 3), (6, 3, 9))):
+            normals = _unit_normals(p[:, after] - p[:, c], p[:, before] - p[:, c])
+            to_sun = light_source - p[:, c]
+            to_sun /= np.maximum(np.linalg.norm(to_sun, axis=1, keepdims=True), 1e-12)
+            light = 0.5 * np.einsum("ij,ij->i", normals, to_sun) ** 3
+            light[light < 0] *= 0.5
+            offsets[:, column] = light
+        self._light = (key, offsets)
+        return offsets
+
+
+def _unit_normals(v1, v2, tol=1e-6):
+    cross = np.cross(v1, v2)
+    norms = np.linalg.norm(cross, axis=1)
+    # scale-free test, as in get_unit_normal
+    scale = np.abs(v1).max(axis=1) * np.abs(v2).max(axis=1)
+    regular = norms > tol * np.maximum(scale, 1e-300)
+    normals = np.empty_like(cross)
+    normals[regular] = cross[regular] / norms[regular, None]
+    for k in np.flatnonzero(~regular):
+        # degenerate faces, at the poles: manim's fallbacks
+        normal = get_unit_normal(v1[k], v2[k])
+        normals[k] = normal if np.linalg.norm(normal) else UP
+    return normals
+
+
+class DepthSortedCamera(ThreeDCamera):
+    """``ThreeDCamera`` that reads morph faces from arrays and reuses its draw order."""
+
+    _order_state = None
+    _order = None
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = Camera.get_mobjects_to_display(self, *args, **kwargs)
+        rotation = self.get_rotation_matrix()
+        # what the order depends on: the rotation, the mobjects, and where
+        # the shaded ones are (a morph's version stands for its faces)
+        state = [rotation.tobytes()]
+        morphs = {}
+        for mob in mobjects:
+            if not getattr(mob, "shade_in_3d", False):
+                state.append(id(mob))
+            elif isinstance(mob, MorphFace):
+                state.append(id(mob))
+                if id(mob.morph) not in morphs:
+                    morphs[id(mob.morph)] = mob.morph
+                    state.append(mob.morph.version)
+            else:
+                state.append(mob.get_z_index_reference_point().tobytes())
+        if state == self._order_state:
+            return list(self._order)
+
+        depth_axis = rotation[2]
+        depths = {key: morph.face_centers @ depth_axis for key, morph in morphs.items()}
+
+        def z_key(mob):
+            if not getattr(mob, "shade_in_3d", False):
+                return np.inf
+            if isinstance(mob, MorphFace):
+                return depths[id(mob.morph)][mob.index]
+            return np.dot(mob.get_z_index_reference_point(), depth_axis)
+
+        self._order_state = state
+        self._order = sorted(mobjects, key=z_key)
+        return list(self._order)
+
+    def modified_rgbas(self, vmobject, rgbas):
+        if not (self.should_apply_shading and isinstance(vmobject, MorphFace) and vmobject.get_num_points()):
+            return super().modified_rgbas(vmobject, rgbas)
+        offsets = vmobject.morph.light_offsets(self.light_source.points[0])[vmobject.index]
+        shaded = rgbas.repeat(2, axis=0) if len(rgbas) < 2 else np.array(rgbas[:2])
+        shaded[:, :3] += offsets[:, None]
+        return shaded
+
+
+class DepthSortedScene:
+    """``ThreeDScene`` mixin drawing with ``DepthSortedCamera``."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("camera_class", DepthSortedCamera)
+        super().__init__(**kwargs)
@@ -0,0 +1,53 @@
+"""Draft renders with less geometry, sharing their caches with the final render.
+
+    python render_all.py --preview -s Divergence Mountain   # rehearsal
+    python render_all.py -q h -s Divergence Mountain        # final
+
+With ``RENDER_PREVIEW`` set to an integer scale (``--preview`` sets 2), the
+primitives of this repo build coarser geometry: arrow and seed grid steps and
+streamline separations grow by the scale, ``BatchSurface`` and the fluid
+solver divide their resolution by it, and ``FieldHeatmap`` samples a coarser
+grid.  What does not depend on the level of detail is kept for the final
+render:
+
+- TeX SVGs land in the shared ``media/Tex`` cache (and are batch-compiled
+  by ``tex_batch`` before the draft);
+- evenly spaced streamlines are stored in the streamline cache, and the
+  final render starts from the draft's lines and only traces the ones that
+  fit between them at the finer separation (``evenly_spaced_streamlines``
+  with ``initial``).
+
+Field samples are not stored: since the fields are evaluated as single NumPy
+calls, sampling the final grid costs less than reading it back.
+"""
+
+import os
+
+# draft scales the final render looks for in the streamline cache
+DRAFT_SCALES = (2, 3, 4)
+
+
+def preview_scale():
+    """The draft scale, 1 for a final render."""
+    value = os.environ.get("RENDER_PREVIEW", "")
+    if value in ("", "0"):
+        return 1
+    scale = int(value)
+    if scale < 1:
+        raise ValueError(f"RENDER_PREVIEW must be a positive integer, not {value!r}")
+    return scale
+
+
+def coarser(length):
+    """A step or distance of the final render, at draft detail."""
+    return length * preview_scale()
+
+
+def fewer(count):
+    """A resolution of the final render, at draft detail.
+
+    Counts the scale does not divide are kept, so that grids nested in
+    powers of two (``BatchSurface``) stay valid.
+    """
+    scale = preview_scale()
+    return count // scale if count % scale == 0 and count >= scale else count
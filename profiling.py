@@ -0,0 +1,276 @@
+"""Opt-in timing of every play/wait of a scene render.
+
+Set ``PROFILE_RENDERS=1`` (or ``render_all.py --profile``/``batch.py
+--profile``) and every scene using the ``ProfileRender`` mixin records, per
+``play`` and ``wait``: wall time, frames written, frames per second, time in
+mobject updaters, in frame rasterization and in encoding, the number of
+mobjects on screen, the resident memory at its end and how much it grew
+during it (the render summary adds the peak of the process).  The code that runs
+between animations (building mobjects, TeX, surfaces...) is recorded as
+``construct`` segments, with the time spent in LaTeX/dvisvgm.  At the end of
+the render a table goes to the log and two files to ``media/profiles`` (or the
+directory ``PROFILE_RENDERS`` names):
+
+- ``<Scene>.trace.json``: Chrome trace events (chrome://tracing, Perfetto),
+  with the counters of each segment as arguments;
+- ``history.jsonl``: one summary line per render, for comparing nightly runs.
+
+Only counters and ``time.perf_counter`` calls are involved, no tracing or
+allocation hooks, so the overhead is a few microseconds per frame.
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+
+import manim.utils.tex_file_writing as tex_file_writing
+from manim import config, logger
+
+MB = 1024 * 1024
+
+
+def profile_directory():
+    """Where reports go, or None when profiling is off."""
+    value = os.environ.get("PROFILE_RENDERS", "")
+    if value in ("", "0"):
+        return None
+    if value == "1":
+        return Path(config.media_dir) / "profiles"
+    return Path(value)
+
+
+def peak_memory_mb():
+    """Peak resident memory of the process so far, never lower than an earlier call."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def resident_memory_mb():
+    """Resident memory of the process now."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError):
+        # no procfs: the peak is the best we have
+        return peak_memory_mb()
+
+
+def describe(animations):
+    names = []
+    for animation in animations:
+        mobject = getattr(animation, "mobject", None)
+        name = type(animation).__name__
+        names.append(f"{name}({type(mobject).__name__})" if mobject is not None else name)
+    return ", ".join(names) or "nothing"
+
+
+class RenderProfile:
+    def __init__(self, scene_name):
+        self.scene_name = scene_name
+        self.segments = []
+        self.counters = dict.fromkeys(("frames", "updaters", "raster", "encode", "tex"), 0.0)
+        self.start = time.perf_counter()
+        self.mark = self.start
+        self.rss = resident_memory_mb()
+        self._patched = []
+
+    def wrap(self, owner, name, counter, count_frames=False):
+        """Replace ``owner.name`` by a version that adds its time to ``counter``."""
+        original = getattr(owner, name)
+        counters = self.counters
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                counters[counter] += time.perf_counter() - start
+                if count_frames:
+                    counters["frames"] += kwargs.get("num_frames", args[1] if len(args) > 1 else 1)
+
+        setattr(owner, name, timed)
+        self._patched.append((owner, name, original))
+
+    def install(self, scene):
+        renderer = scene.renderer
+        self.wrap(renderer, "update_frame", "raster")
+        self.wrap(renderer, "add_frame", "encode", count_frames=True)
+        self.wrap(tex_file_writing, "compile_tex", "tex")
+        self.wrap(tex_file_writing, "convert_to_svg", "tex")
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+        self._patched.clear()
+
+    def begin(self, scene):
+        """Close the construct segment that ran since the previous animation."""
+        now = time.perf_counter()
+        if now - self.mark > 1e-4:
+            self.record("construct", "construct", self.mark, now, scene)
+        return now
+
+    def end(self, kind, name, start, scene):
+        self.record(kind, name, start, time.perf_counter(), scene)
+        self.mark = time.perf_counter()
+
+    def record(self, kind, name, start, end, scene):
+        previous = getattr(self, "before", None) or dict.fromkeys(self.counters, 0.0)
+        delta = {key: self.counters[key] - previous[key] for key in self.counters}
+        self.before = dict(self.counters)
+        wall = end - start
+        frames = int(delta["frames"])
+        rss, self.rss = self.rss, resident_memory_mb()
+        self.segments.append(
+            {
+                "kind": kind,
+                "name": name,
+                "start": start - self.start,
+                "wall": wall,
+                "frames": frames,
+                "fps": frames / wall if frames and wall > 0 else 0.0,
+                "updaters": delta["updaters"],
+                "raster": delta["raster"],
+                # time in add_frame, which hands the frames to the encoder
+                "encode": delta["encode"],
+                "tex": delta["tex"],
+                "mobjects": len(scene.get_mobject_family_members()),
+                "rss_mb": self.rss,
+                "rss_growth_mb": self.rss - rss,
+            }
+        )
+
+    def table(self):
+        header = f"{'#':>3}  {'segment':<48} {'wall':>7} {'frames':>6} {'fps':>6} {'updt':>6} {'rast':>6} {'enc':>6} {'tex':>6} {'mobs':>5} {'MB':>6} {'+MB':>6}"
+        lines = [f"profile of {self.scene_name}", header]
+        for i, s in enumerate(self.segments):
+            name = f"{s['kind']}: {s['name']}"
+            name = name if len(name) <= 48 else name[:45] + "..."
+            lines.append(
+                f"{i:>3}  {name:<48} {s['wall']:>7.2f} {s['frames']:>6} {s['fps']:>6.1f} {s['updaters']:>6.2f} "
+                f"{s['raster']:>6.2f} {s['encode']:>6.2f} {s['tex']:>6.2f} {s['mobjects']:>5} {s['rss_mb']:>6.0f} {s['rss_growth_mb']:>+6.0f}"
+            )
+        total = sum(s["wall"] for s in self.segments)
+        frames = sum(s["frames"] for s in self.segments)
+        lines.append(f"{'':>3}  {'total':<48} {total:>7.2f} {frames:>6}")
+        return "\n".join(lines)
+
+    def trace(self):
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.scene_name}}]
+        for s in self.segments:
+            args = {k: v for k, v in s.items() if k not in ("kind", "name", "start", "wall")}
+            events.append(
+                {
+                    "name": s["name"],
+                    "cat": s["kind"],
+                    "ph": "X",
+                    "ts": s["start"] * 1e6,
+                    "dur": s["wall"] * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, directory):
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{self.scene_name}.trace.json").write_text(json.dumps(self.trace()))
+        summary = {
+            "scene": self.scene_name,
+            "time": time.time(),
+            "quality": config.quality,
+            "wall": sum(s["wall"] for s in self.segments),
+            "frames": sum(s["frames"] for s in self.segments),
+            # of the whole process, earlier renders in it included
+            "peak_mb": peak_memory_mb(),
+            "segments": [{"name": f"{s['kind']}: {s['name']}", "wall": s["wall"], "frames": s["frames"]} for s in self.segments],
+        }
+        # one O_APPEND write, renders in parallel processes share the file
+        fd = os.open(directory / "history.jsonl", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, (json.dumps(summary) + "\n").encode())
+        finally:
+            os.close(fd)
+
+
+def watch_segments(mixin):
+    """Class decorator giving a scene mixin ``play`` and ``wait`` overrides
+    that call its hooks around every top-level segment.
+
+    ``mixin`` defines ``_watching()``, ``_begin_segment()`` and
+    ``_end_segment(kind, name, begun)``, with ``begun`` what
+    ``_begin_segment`` returned.  They are looked up on ``mixin`` itself, so
+    several decorated mixins can share a scene, each with its own hooks and
+    its own nesting flag: a wait or play run inside another segment is part
+    of it.
+    """
+
+    def segment(self, kind, name, call):
+        # the mixins whose segment is running, keyed by class, not by name
+        running = self.__dict__.setdefault("_running_segments", set())
+        if not mixin._watching(self) or mixin in running:
+            return call()
+        running.add(mixin)
+        begun = mixin._begin_segment(self)
+        try:
+            return call()
+        finally:
+            running.discard(mixin)
+            mixin._end_segment(self, kind, name, begun)
+
+    def play(self, *args, **kwargs):
+        return segment(self, "play", describe(args), lambda: super(mixin, self).play(*args, **kwargs))
+
+    def wait(self, duration=None, *args, **kwargs):
+        name = f"{duration}s" if duration is not None else "default"
+        args = ((duration,) if duration is not None else ()) + args
+        return segment(self, "wait", name, lambda: super(mixin, self).wait(*args, **kwargs))
+
+    mixin.play = play
+    mixin.wait = wait
+    return mixin
+
+
+@watch_segments
+class ProfileRender:
+    """Scene mixin that profiles the render when ``PROFILE_RENDERS`` is set."""
+
+    profile = None
+
+    def render(self, preview=False):
+        directory = profile_directory()
+        if directory is None:
+            return super().render(preview)
+        # batch variants of one scene are told apart by their output name
+        self.profile = RenderProfile(config.output_file or type(self).__name__)
+        self.profile.install(self)
+        try:
+            return super().render(preview)
+        finally:
+            self.profile.uninstall()
+            self.profile.begin(self)
+            logger.info("\n" + self.profile.table())
+            self.profile.write(directory)
+
+    def update_mobjects(self, dt):
+        if self.profile is None:
+            return super().update_mobjects(dt)
+        start = time.perf_counter()
+        super().update_mobjects(dt)
+        self.profile.counters["updaters"] += time.perf_counter() - start
+
+    def _watching(self):
+        return self.profile is not None
+
+    def _begin_segment(self):
+        return self.profile.begin(self)
+
+    def _end_segment(self, kind, name, start):
+        self.profile.end(kind, name, start, self)
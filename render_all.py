@@ -0,0 +1,205 @@
+"""Render every scene of a module in parallel and join them into one video.
+
+    python render_all.py                     # the scenes package, low quality
+    python render_all.py -q h -o final.mp4   # high quality
+    python render_all.py -s Divergence Mountain
+    python render_all.py --preview           # draft, see preview.py
+    python render_all.py --list
+
+The TeX strings of the module are compiled first in one batch (see
+``tex_batch.py``), then the scenes are rendered in a process pool sized to the
+number of cores and the resulting movies are concatenated in presentation
+order without re-encoding.  The presentation order is the module's ``PRESENTATION`` list when it has one,
+otherwise the order in which the scenes are defined.
+
+manim and PyAV are imported where they are first needed, so that listing the
+scenes of a package with a registry (see ``scenes/__init__.py``) stays instant.
+"""
+
+import argparse
+import importlib
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def add_diagnostic_options(parser):
+    """The ``--profile``/``--memory``/``--memory-budget`` options of the render CLIs."""
+    parser.add_argument("--profile", action="store_true", help="write per-animation profiles (see profiling.py)")
+    parser.add_argument("--memory", action="store_true", help="write per-animation memory timelines (see memory_watch.py)")
+    parser.add_argument("--memory-budget", type=float, default=None, help="drop caches above this many MB resident")
+
+
+def export_diagnostics(args):
+    """Turn those options into the variables the scene mixins read.
+
+    Set in the environment, so the worker processes inherit them; a variable
+    already set wins.
+    """
+    if args.profile:
+        os.environ.setdefault("PROFILE_RENDERS", "1")
+    if args.memory:
+        os.environ.setdefault("MEMORY_WATCH", "1")
+    if args.memory_budget:
+        os.environ.setdefault("MEMORY_BUDGET_MB", str(args.memory_budget))
+
+
+def scene_names(module):
+    """Names of the scenes of ``module``, in presentation order.
+
+    The scenes of a module with a ``SCENES`` registry are listed without
+    importing them.
+    """
+    if hasattr(module, "SCENES"):
+        return list(getattr(module, "PRESENTATION", module.SCENES))
+    return [cls.__name__ for cls in find_scenes(module)]
+
+
+def find_scenes(module):
+    """Scene classes defined in ``module``, in presentation order."""
+    if hasattr(module, "SCENES"):
+        return [getattr(module, name) for name in scene_names(module)]
+
+    from manim import Scene
+
+    scenes = {
+        name: obj
+        for name, obj in vars(module).items()
+        if inspect.isclass(obj) and issubclass(obj, Scene) and obj.__module__ == module.__name__
+    }
+    order = getattr(module, "PRESENTATION", None)
+    if order is not None:
+        return [scenes[name] for name in order]
+    return sorted(scenes.values(), key=lambda cls: inspect.getsourcelines(cls)[1])
+
+
+def render_scene(module_name, scene_name, quality, media_dir, params=None, output_file=None):
+    """Render one scene in this process; returns its movie path and timings.
+
+    ``params`` override the scene's class attributes (its title, field,
+    durations...) for this render only; ``output_file`` names the movie, and
+    gives the render its own partial movie directory so that variants of one
+    scene can render side by side.
+    """
+    from manim import tempconfig
+
+    module = importlib.import_module(module_name)
+    cls = getattr(module, scene_name)
+    for key in params or {}:
+        if not hasattr(cls, key) or callable(getattr(cls, key)):
+            raise ValueError(f"{scene_name} has no parameter {key!r}")
+    options = {"quality": quality, "media_dir": media_dir}
+    if output_file:
+        options["output_file"] = output_file
+        options["partial_movie_dir"] = f"{{video_dir}}/partial_movie_files/{output_file}"
+    wall, cpu = time.perf_counter(), time.process_time()
+    with tempconfig(options):
+        scene = cls()
+        for key, value in (params or {}).items():
+            setattr(scene, key, value)
+        scene.render()
+        path = Path(scene.renderer.file_writer.movie_file_path)
+    return path, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def concat_videos(paths, output):
+    """Join movies that share codec and resolution, copying packets as they are."""
+    import av
+
+    manifest = Path(output).with_suffix(".txt")
+    manifest.write_text("ffconcat version 1.0\n" + "".join(f"file '{Path(p).absolute()}'\n" for p in paths))
+    try:
+        with av.open(str(manifest), format="concat", options={"safe": "0"}) as source, av.open(
+            str(output), mode="w"
+        ) as target:
+            stream = source.streams.video[0]
+            if hasattr(target, "add_stream_from_template"):
+                out_stream = target.add_stream_from_template(template=stream)
+            else:
+                out_stream = target.add_stream(template=stream)
+            for packet in source.demux(stream):
+                # skip the flushing packets demux yields at the end
+                if packet.dts is None:
+                    continue
+                # dts restarts in every file; let libav recompute it
+                packet.dts = None
+                packet.stream = out_stream
+                target.mux(packet)
+    finally:
+        manifest.unlink(missing_ok=True)
+
+
+def render_all(module_name="scenes", selected=None, quality="low_quality", media_dir="./media", output=None, workers=None):
+    from manim import tempconfig
+
+    from tex_batch import precompile_module
+
+    module = importlib.import_module(module_name)
+    scenes = scene_names(module)
+    if selected:
+        scenes = [name for name in scenes if name in selected]
+
+    start = time.perf_counter()
+    # one LaTeX run for the whole module before the workers start, so they
+    # all find their SVGs in the shared Tex cache
+    with tempconfig({"quality": quality, "media_dir": media_dir}):
+        precompile_module(module)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(render_scene, module_name, name, quality, media_dir): name for name in scenes
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            results[name] = future.result()
+            print(f"done: {name} ({results[name][1]:.1f}s)", flush=True)
+    total = time.perf_counter() - start
+
+    if output is None:
+        output = Path(media_dir) / "videos" / f"{module_name}_{quality}.mp4"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    concat_videos([results[name][0] for name in scenes], output)
+
+    width = max(len(name) for name in scenes)
+    print(f"\n{'scene':<{width}}  {'wall (s)':>9}  {'cpu (s)':>9}")
+    for name in scenes:
+        _, wall, cpu = results[name]
+        print(f"{name:<{width}}  {wall:>9.2f}  {cpu:>9.2f}")
+    print(f"{'total':<{width}}  {total:>9.2f}  {sum(r[2] for r in results.values()):>9.2f}")
+    print(f"\n{output}")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every scene in parallel and concatenate them")
+    parser.add_argument("module", nargs="?", default="scenes")
+    parser.add_argument("-s", "--scenes", nargs="+", default=None)
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-o", "--output", default=None)
+    parser.add_argument("--media-dir", default="./media")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    add_diagnostic_options(parser)
+    parser.add_argument("--preview", action="store_true", help="draft with coarser geometry (see preview.py)")
+    parser.add_argument("--list", action="store_true", help="print the scenes in presentation order and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(scene_names(importlib.import_module(args.module))))
+        raise SystemExit
+
+    export_diagnostics(args)
+    # inherited by the workers
+    if args.preview:
+        os.environ.setdefault("RENDER_PREVIEW", "2")
+
+    render_all(args.module, args.scenes, QUALITIES[args.quality], args.media_dir, args.output, args.workers)
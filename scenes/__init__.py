@@ -0,0 +1,62 @@
+"""The scenes of the presentation, imported one module at a time.
+
+    python render_all.py --list                 # instant, imports no scene
+    python render_all.py -s Divergence Mountain
+    python -m manim -pql scenes/vector_fields.py Divergence
+
+``SCENES`` maps every scene to the module of this package that defines it.
+``scenes.Divergence`` (or ``load("Divergence")``) imports that module only,
+and with it manim and the primitives its scenes use: listing scenes costs
+nothing, and a title card does not load the fluid solver, the surfaces or
+the particle code.
+"""
+
+import importlib
+
+SCENES = {
+    "Presentation": "titles",
+    "Axes3DExplanation": "vector_fields",
+    "VectorFieldScene": "vector_fields",
+    "Divergence": "vector_fields",
+    "Mountain": "gradient",
+    "Gradiente": "gradient",
+    "NavierStokes": "navier_stokes",
+    "FluidSimulation": "navier_stokes",
+    "ContinuousMotion": "vector_fields",
+    "References": "titles",
+    "TitleVideo": "titles",
+}
+
+# Order in which render_all.py joins the scenes into the final video.
+# TitleVideo asks for its title interactively, so it is rendered on its own.
+PRESENTATION = [
+    "Presentation",
+    "Axes3DExplanation",
+    "VectorFieldScene",
+    "Divergence",
+    "Mountain",
+    "Gradiente",
+    "NavierStokes",
+    "FluidSimulation",
+    "ContinuousMotion",
+    "References",
+]
+
+
+def load(name):
+    """The scene class ``name``, importing only the module that defines it."""
+    try:
+        module = SCENES[name]
+    except KeyError:
+        raise AttributeError(f"no scene {name!r} in {__name__}; known scenes: {', '.join(SCENES)}") from None
+    return getattr(importlib.import_module(f"{__name__}.{module}"), name)
+
+
+def __getattr__(name):
+    if name in SCENES:
+        return load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return [*globals(), *SCENES]
@@ -0,0 +1,79 @@
+"""What the scenes of this package share."""
+
+from manim import FadeIn, NumberPlane, Scene
+
+from fields import BatchStreamLines, PackedArrowVectorField
+from hold_frames import HoldStaticFrames
+from memory_watch import WatchMemory
+from profiling import ProfileRender
+from segment_cache import SegmentCache
+from streamline_cache import default_cache as streamline_cache
+from tex_batch import PrecompileTex
+from time_slices import TimeSlices
+import text_cache
+
+
+class PresentationScene(WatchMemory, ProfileRender, SegmentCache, TimeSlices, HoldStaticFrames, PrecompileTex, Scene):
+    """Scene with the render tools every scene of the package uses.
+
+    Subclass it together with ``ThreeDScene`` (or ``DepthSortedScene,
+    ThreeDScene``) for 3D scenes; the mixins stay ahead of the camera
+    classes in the MRO.
+    """
+
+    def setup(self):
+        # Text and Paragraph load their layout from media/cache/text
+        text_cache.enable()
+        super().setup()
+
+
+def axis_vector_field(scene: Scene, func, wait_time: int = 5, heatmap=None, particles=None):
+        # func may be a per-point lambda, a BatchField or an expression string or
+        # expression_field, all evaluated in batch, or a time-dependent F(pos, t)
+        # whose arrows and lines follow the scene clock.
+        # heatmap is an optional FieldHeatmap drawn behind the plane
+        # particles is an optional ParticleCloud of the same field (True for
+        # the default one), shown instead of the stream lines
+        if isinstance(func, str):
+            from field_dsl import expression_field
+
+            func = expression_field(func)
+        if particles is True:
+            from particles import ParticleCloud
+
+            particles = ParticleCloud(func)
+        numberplane = NumberPlane()
+        array_field = PackedArrowVectorField(func)
+        background = [heatmap] if heatmap is not None else []
+
+        scene.play(*[FadeIn(mob) for mob in background], FadeIn(array_field), FadeIn(numberplane))
+        if array_field.time_field is not None:
+            array_field.start_time_updates()
+        for mob in background:
+            if mob.time_field is not None:
+                mob.start_time_updates()
+
+        if particles:
+            scene.add(particles)
+            particles.start_flow()
+            flow = particles
+        else:
+            stream_lines = BatchStreamLines(
+                func, 
+                stroke_width=1,
+                max_anchors_per_line=10,
+                cache=streamline_cache,
+                # evenly spaced lines, except for fields that change over time
+                seeding="grid" if array_field.time_field is not None else "even",
+                separation=0.35,
+                # stroke_width=3, max_anchors_per_line=5, virtual_time=1
+            )
+
+            scene.add(stream_lines)
+            stream_lines.start_animation(warm_up=True, flow_speed=1, time_width=0.5, packed=True)
+            if stream_lines.time_field is not None:
+                stream_lines.start_time_updates()
+            flow = stream_lines
+        scene.wait(wait_time)
+        # scene.play(stream_lines.end_animation())
+        scene.remove(flow, numberplane, array_field, *background)
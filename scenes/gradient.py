@@ -0,0 +1,72 @@
+"""The gradient, over a landscape and as a field."""
+
+import numpy as np
+from manim import DEGREES, GREEN_A, GREEN_B, GREEN_C, FadeIn, FadeOut, MathTex, Text, ThreeDAxes, ThreeDScene, Write
+
+from surfaces import BatchSurface
+
+from .common import PresentationScene, axis_vector_field
+
+
+def landscape(x, y):
+    """Height of Mountain's surface over the point (x, y) of its axes."""
+    return np.sin(x) * np.cos(y)
+
+
+class Mountain(PresentationScene, ThreeDScene):
+    # finest grid; flat regions keep 8x8-sized faces (see surfaces.py)
+    resolution_fa = 64
+    tolerance = 0.02
+    rotation_time = 21
+
+    def construct(self):
+        title = Text('Gradiente')
+        self.play(FadeIn(title))
+        self.wait(2)
+        self.play(FadeOut(title))
+
+        resolution_fa = self.resolution_fa
+        self.set_camera_orientation(phi=75 * DEGREES, theta=-160 * DEGREES)
+        self.move_camera(zoom=0.8, run_time=1.5)
+        axes = ThreeDAxes(x_range=(0, 5, 1), y_range=(0, 5, 1), z_range=(-1, 1, 0.5))
+        surface_plane = BatchSurface(
+            lambda u, v: axes.c2p(u, v, landscape(u, v)),
+            resolution=(resolution_fa, resolution_fa),
+            v_range=[0, 5],
+            u_range=[0, 5],
+            base_resolution=8,
+            tolerance=self.tolerance,
+            )
+        surface_plane.set_style(fill_opacity=1)
+        surface_plane.set_fill_by_value(axes=axes, colorscale=[(GREEN_A, -0.5), (GREEN_B, 0), (GREEN_C, 0.5)], axis=2)
+        self.wait(2)
+        self.play(FadeIn(surface_plane))
+        self.begin_ambient_camera_rotation(rate=0.15)
+
+        self.wait(self.rotation_time)
+        self.play(FadeOut(surface_plane))
+
+
+class Gradiente(PresentationScene):
+    wait_time = 5
+    # the gradient of Mountain's landscape as a field, between the two
+    # formulas; off in the presentation, set it from a batch manifest
+    show_field = False
+
+    def construct(self):
+        grad = MathTex(r"\nabla = (\frac{\partial }{\partial x}, \frac{\partial }{\partial y})")
+        self.play(Write(grad))
+        self.wait(2)
+        self.play(FadeOut(grad))
+
+        if self.show_field:
+            from differential import FieldHeatmap, gradient_field
+
+            # over the steepness of its slopes
+            height = lambda pos: landscape(pos[0], pos[1])
+            axis_vector_field(self, gradient_field(height), self.wait_time, heatmap=FieldHeatmap(height, "gradient"))
+
+        grad_div = MathTex(r"\text{div} F = \nabla \cdot F")
+        self.play(Write(grad_div))
+        self.wait(2)
+        self.play(FadeOut(grad_div))
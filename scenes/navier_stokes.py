@@ -0,0 +1,129 @@
+"""The Navier-Stokes equations and a Stable Fluids simulation."""
+
+import numpy as np
+from manim import (
+    DOWN,
+    LEFT,
+    UP,
+    Create,
+    FadeIn,
+    FadeOut,
+    MathTex,
+    ReplacementTransform,
+    SurroundingRectangle,
+    Text,
+    VGroup,
+    Write,
+)
+
+
+from .common import PresentationScene, axis_vector_field
+
+
+class NavierStokes(PresentationScene):
+    def construct(self):
+        title = Text('Equações de fluidos incompressíveis')
+        self.play(FadeIn(title))
+        self.wait(2)
+        self.play(FadeOut(title))
+
+        t1 = MathTex(r"u: \text{ Campo de velocidade}")
+        t2 = MathTex(r"p: \text{ Campo de pressão}")
+        t3 = MathTex(r"t: \text{ Tempo}")
+        t4 = MathTex(r"\nu: \text{ Viscosidade}")
+        t5 = MathTex(r"\rho: \text{ Densidade do fluido}")
+        t6 = MathTex(r"f: \text{ Forças externas}")
+        x = VGroup(t1, t2, t3, t4, t5, t6).arrange(direction=DOWN, aligned_edge=LEFT).scale(0.7)
+        x.set_opacity(0.5)
+        self.play(FadeIn(x))
+
+        self.wait()
+        t1.set_opacity(1)
+
+        self.wait(3.5)
+        t2.set_opacity(1)
+        t1.set_opacity(0.5)
+
+        self.wait(3)
+        t3.set_opacity(1)
+        t2.set_opacity(0.5)
+
+        self.wait(2)
+        t4.set_opacity(1)
+        t3.set_opacity(0.5)
+
+        self.wait(3)
+        t5.set_opacity(1)
+        t4.set_opacity(0.5)
+
+        self.wait(2)
+        t6.set_opacity(1)
+        t5.set_opacity(0.5)
+
+        self.wait(3)
+        t6.set_opacity(0.5)
+        self.wait()
+        self.play(FadeOut(x))
+
+
+        ns_equation = MathTex(r"\frac{\partial u}{\partial t}", "=", 
+            r"-(u \cdot \nabla)u", "-", r"\frac{1}{\rho}\nabla p", "+", r"\nu \nabla ^ 2 u", 
+            "+", "f")
+        div0 = MathTex(r"\nabla \cdot u = 0")
+
+        ut_box = SurroundingRectangle(ns_equation[0], buff = .1)
+        div_box = SurroundingRectangle(ns_equation[2], buff = .1)
+        in_force_box = SurroundingRectangle(ns_equation[4], buff = .1)
+        diff_box = SurroundingRectangle(ns_equation[6], buff = .1)
+        ex_force_box = SurroundingRectangle(ns_equation[8], buff = .1)
+        
+        both_eq = VGroup(ns_equation.shift(UP), div0.shift(DOWN))
+
+        self.play(Write(both_eq))
+        self.wait(2)
+        self.play(FadeOut(both_eq))
+
+        self.play(Write(div0.shift(UP)))
+        self.wait(6)
+        self.play(FadeOut(div0))
+
+
+        self.play(Write(ns_equation.shift(DOWN)))
+        self.wait(12)
+        self.play(Create(ut_box))
+        self.wait(4)
+        self.play(ReplacementTransform(ut_box, div_box))
+        self.wait(3.5)
+        self.play(ReplacementTransform(div_box, in_force_box))
+        self.wait(5)
+        self.play(ReplacementTransform(in_force_box, diff_box))
+        self.wait(4)
+        self.play(ReplacementTransform(diff_box, ex_force_box))
+        self.wait(2)
+        self.play(FadeOut(ex_force_box))
+
+
+class FluidSimulation(PresentationScene):
+    resolution = 128
+    # seconds simulated before the field is shown
+    warm_up = 2
+    wait_time = 5
+
+    def construct(self):
+        from fluids import StableFluids
+
+        title = Text('Stable Fluids')
+        self.play(FadeIn(title))
+        self.wait(2)
+        self.play(FadeOut(title))
+
+        # two jets, one pushing right from the left and one pushing up from the bottom
+        def force(points, t):
+            f = np.zeros_like(points)
+            f[:, 0] = 4 * np.exp(-((points[:, 0] + 4) ** 2 + points[:, 1] ** 2))
+            f[:, 1] = 4 * np.exp(-(points[:, 0] ** 2 + (points[:, 1] + 3) ** 2))
+            return f
+
+        # the field evolves with the solver while the arrows and lines are shown
+        solver = StableFluids(resolution=self.resolution, force=force).run(self.warm_up)
+        axis_vector_field(self, solver.time_field(), self.wait_time)
@@ -0,0 +1,77 @@
+"""Opening, closing and title cards."""
+
+from manim import DOWN, LEFT, UP, FadeIn, FadeOut, Paragraph, Text, Write
+
+from fields import BatchStreamLines
+
+from .common import PresentationScene, streamline_cache
+
+
+class Presentation(PresentationScene):
+    def construct(self):
+        trab = Text("Trabalho de Cálculo 3").to_edge(UP).scale(0.75)
+        title = Text("Simulação Visual de Mecânica de Fluidos")
+        subtitle = Text("Bacharelado em Ciências da Computação").next_to(title, DOWN).scale(0.5)
+
+        self.play(Write(trab))
+        self.play(Write(title), Write(subtitle))
+
+        self.wait(2)
+
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        members = Paragraph(
+            "Davi Fagundes\n"
+            "Gabriel Freitas\n"
+            "Gustavo Sampaio\n"
+            "Thaís Ribeiro\n"
+            "Théo Riffel\n"
+            "Vítor Fróis").scale(0.7)
+
+        self.play(FadeIn(members))
+        self.wait(6)
+        self.play(FadeOut(members), FadeOut(trab))
+
+
+class References(PresentationScene):
+    # sin(x/3) * DOWN + cos(y/2) * RIGHT
+    field = "[cos(y / 2), -sin(x / 3)]"
+
+    def construct(self):
+        title = Text("Referências")
+        self.play(FadeIn(title))
+        self.wait(2)
+        self.play(FadeOut(title))
+
+        ref = Paragraph(
+            "Divergence and curl - 3Blue1Brown\n"
+            "Stable Fluids implemented in Python/NumPy - Machine Learning & Simulation\n"
+            "Stable Fluids - Jos Stam").scale(0.5).to_edge(LEFT)
+
+        self.play(FadeIn(ref))
+        self.wait(3)
+
+
+        from field_dsl import expression_field
+
+        func = expression_field(self.field)
+        stream_lines = BatchStreamLines(
+            func, stroke_width=3, max_anchors_per_line=30, cache=streamline_cache, seeding="even"
+        )
+        self.add(stream_lines)
+        stream_lines.start_animation(warm_up=True, flow_speed=1.5, packed=True)
+        self.play(FadeOut(ref, run_time=3))
+        self.wait(5)
+        self.play(stream_lines.end_animation())
+
+
+class TitleVideo(PresentationScene):
+    # set per video in a batch manifest (see batch.py); asked for when unset
+    title = None
+
+    def construct(self):
+        title_str = self.title if self.title is not None else input("Insira título do vídeo: ")
+        title = Text(title_str)
+        self.play(FadeIn(title))
+        self.wait(2)
+        self.play(FadeOut(title))
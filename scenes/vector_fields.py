@@ -0,0 +1,172 @@
+"""Vector fields, divergence and flow."""
+
+from manim import (
+    DEGREES,
+    DOWN,
+    RIGHT,
+    UP,
+    FadeIn,
+    FadeOut,
+    FadeTransform,
+    MathTex,
+    NumberPlane,
+    Tex,
+    Text,
+    ThreeDAxes,
+    ThreeDScene,
+    Transform,
+    VGroup,
+    Write,
+)
+
+from fields import BatchStreamLines, PackedArrowVectorField
+from morph import DepthSortedScene, MorphSurface, cylinder_breaks, cylinder_uv, sphere_uv
+
+from .common import PresentationScene, axis_vector_field, streamline_cache
+
+
+class Axes3DExplanation(PresentationScene, DepthSortedScene, ThreeDScene):
+    def construct(self):
+        title = Text('Universo 2D?')
+        self.play(FadeIn(title))
+        self.wait(2)
+        self.play(FadeOut(title))
+
+        axes = ThreeDAxes()
+
+        x_label = axes.get_x_axis_label(Tex("x"))
+        y_label = axes.get_y_axis_label(Tex("y")).shift(UP * 1.8)
+
+        # zoom out so we see the axes
+        self.set_camera_orientation(phi=75 * DEGREES, theta=30 * DEGREES)
+
+        self.play(FadeIn(axes), FadeIn(x_label), FadeIn(y_label))
+
+        self.wait(0.5)
+
+        # built-in updater which begins camera rotation
+        self.begin_ambient_camera_rotation(rate=0.15)
+        
+        # one mesh, sampled on the same grid as a sphere and as a flat cylinder
+        sphere = MorphSurface(sphere_uv(2), cylinder_uv(2, 0.1), resolution=(36, 36), v_breaks=cylinder_breaks(2, 0.1))
+
+        self.wait(8)
+
+        self.play(FadeIn(sphere))
+
+        self.wait(2)
+
+        # animate the move of the camera to properly see the axes
+        self.move_camera(phi=0 * DEGREES, theta=270 * DEGREES, zoom=0.5, run_time=1.5)
+        
+        self.stop_ambient_camera_rotation()
+        
+        self.play(sphere.blend_to(1))
+
+        self.wait(4)
+
+
+class VectorFieldScene(PresentationScene):
+    def construct(self):
+        from field_dsl import expression_field
+
+        f1 = expression_field("(sin(x), y**2)")
+        f2 = expression_field("(-y, x)")
+        ftex = MathTex(r"F(x,y)").move_to(3 * RIGHT + 2.3 * UP)
+        f1tex = f1.tex().move_to(3 * RIGHT + 2.3 * UP)
+        f2tex = f2.tex().move_to(3 * RIGHT + 2.3 * UP)
+
+        numberplane = NumberPlane()
+        self.play(FadeIn(numberplane), FadeIn(ftex))
+
+        self.wait(2)
+        array_field1 = PackedArrowVectorField(f1)
+
+        self.play(Transform(ftex, f1tex))
+        self.wait(2)
+        self.play(FadeIn(array_field1))
+        self.bring_to_back(array_field1)
+
+
+        self.wait(3)
+        array_field2 = PackedArrowVectorField(f2)
+        # self.remove(array_field1)
+        self.play(FadeTransform(array_field1, array_field2), FadeTransform(ftex, f2tex))
+        # self.bring_to_back(array_field2)
+
+        self.wait(3)
+
+        self.remove(numberplane, array_field2, f2tex)
+
+
+class Divergence(PresentationScene):
+    wait_time = 5
+    # particle clouds instead of stream lines
+    particles = False
+
+    def construct(self):
+        from differential import FieldHeatmap
+        from field_dsl import expression_field
+
+        title = Text('Divergente')
+        self.play(FadeIn(title))
+        self.wait(4)
+        self.play(FadeOut(title))
+
+        # self.wait(3)
+        positive_func = expression_field("(x, y)")
+        positive_div = MathTex(r"\text{div} > 0")
+        positive_tex = positive_func.tex().next_to(positive_div, DOWN)
+        positive_group = VGroup(positive_div, positive_tex)
+        self.play(Write(positive_group))
+        self.wait(2)
+        self.play(FadeOut(positive_group))
+
+        axis_vector_field(
+            self,
+            positive_func,
+            self.wait_time,
+            heatmap=FieldHeatmap(positive_func, "divergence"),
+            particles=self.particles,
+        )
+
+        negative_func = expression_field("(-x, -y)")
+        negative_div = MathTex(r"\text{div} < 0")
+        negative_tex = negative_func.tex().next_to(negative_div, DOWN)
+        negative_group = VGroup(negative_div, negative_tex)
+        self.play(Write(negative_group))
+        self.wait(2)
+        self.play(FadeOut(negative_group))
+
+        axis_vector_field(
+            self,
+            negative_func,
+            self.wait_time,
+            heatmap=FieldHeatmap(negative_func, "divergence"),
+            particles=self.particles,
+        )
+
+
+class ContinuousMotion(PresentationScene):
+    # sin(x/2) * UR + cos(y/2) * LEFT
+    field = "[sin(x / 2) - cos(y / 2), sin(x / 2)]"
+    flow_speed = 1.5
+    # tracers riding on the lines
+    particles = False
+
+    def construct(self):
+        from field_dsl import expression_field
+
+        func = expression_field(self.field)
+        stream_lines = BatchStreamLines(
+            func, stroke_width=3, max_anchors_per_line=30, cache=streamline_cache, seeding="even"
+        )
+        self.add(stream_lines)
+        stream_lines.start_animation(warm_up=False, flow_speed=self.flow_speed, packed=True)
+        if self.particles:
+            from particles import ParticleCloud
+
+            particles = ParticleCloud(func, count=10000, stroke_width=1, warm_up=False)
+            self.add(particles)
+            particles.start_flow(self.flow_speed)
+        self.wait(stream_lines.virtual_time / stream_lines.flow_speed)
@@ -0,0 +1,294 @@
+"""Reuse the encoded movie of every play/wait whose inputs did not change.
+
+manim already names each partial movie after a hash of the play call and
+skips the plays whose file exists, but for this repo that hash falls short:
+
+- arrays of more than 1000 values are hashed through their truncated
+  ``repr``, so a change in the middle of a packed arrow field, a streamline
+  buffer or a surface goes unnoticed;
+- the render config is not part of it, and the digest is a 32-bit CRC;
+- a reused play is fast-forwarded in a single ``dt``, so updaters that
+  integrate over time (camera rotation, streamline flow, the fluid solver)
+  leave a different state than a real render, and every later play misses;
+- the directory keeps the 100 most recent files, whatever their size.
+
+``SegmentCache`` fingerprints each segment with BLAKE2 over the exact bytes
+of the mobjects going in (points, colors, every array), the animations and
+their parameters, the camera state, the render config and the code of every
+updater and rate function.  A reused segment is stepped frame by frame
+without rasterizing, so the state handed to the next segment is the one a
+full render produces: after an edit only the changed segments and those whose
+inputs it changed are rasterized again.  The partial movie files stay where
+manim keeps them, so the cache is shared by every process rendering into the
+same media directory; it is bounded in bytes (``SEGMENT_CACHE_BYTES``,
+default 2 GiB) and evicts the least recently used segments of all scenes.
+
+Objects that should not count, or count differently, can define
+``cache_key()``, as for ``streamline_cache``.
+"""
+
+import hashlib
+import os
+import time
+import types
+from pathlib import Path
+
+import numpy as np
+
+import manim.renderer.cairo_renderer as cairo_renderer
+from manim import __version__ as manim_version, config, logger
+from manim.camera.camera import Camera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene import Scene
+from manim.scene.scene_file_writer import SceneFileWriter
+
+SEGMENT_VERSION = 1
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# outputs and caches of the camera, not inputs of the frame
+_CAMERA_OUTPUTS = {"pixel_array", "pixel_array_to_cairo_context", "canvas", "display_funcs", "background"}
+_RENDER_CONFIG = (
+    "pixel_width",
+    "pixel_height",
+    "frame_width",
+    "frame_height",
+    "frame_rate",
+    "background_color",
+    "background_opacity",
+    "transparent",
+    "movie_file_extension",
+    "format",
+    "renderer",
+)
+# attributes holding an id(), which differs from one process to the next
+_IDENTITY_ATTRS = {"original_id"}
+# hashed by type only: their state is not what a frame shows
+_OPAQUE = (Scene, CairoRenderer, SceneFileWriter, types.ModuleType)
+# module-level values a function may read, hashed with it
+_GLOBAL_STATE = (types.FunctionType, bool, int, float, complex, str, bytes, tuple, list, dict, np.ndarray, np.generic)
+
+
+def global_names(code):
+    """Names ``code`` and the lambdas and comprehensions nested in it look up globally."""
+    names = dict.fromkeys(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(dict.fromkeys(global_names(const)))
+    return list(names)
+
+
+class StateHasher:
+    """Deterministic digest of nested Python/NumPy state.
+
+    Objects already visited are written as a back-reference to the order in
+    which they were first seen, which keeps shared and cyclic references
+    finite and identical from one process to the next.  Nothing hashes an
+    ``id()`` or a default ``repr``.
+
+    ``stable`` turns False when some object could only be hashed by its type
+    (a scene, a renderer, an object with neither ``__dict__`` nor slots):
+    enough to tell frames apart, but caches that must never return stale
+    data (``streamline_cache``, ``text_cache``) do not store such entries.
+    """
+
+    def __init__(self):
+        self.h = hashlib.blake2b(digest_size=16)
+        self.stable = True
+        self.seen = {}
+        # keeps every visited object alive, so that no id() is reused by a
+        # temporary while hashing
+        self.visited = []
+
+    def hexdigest(self):
+        return self.h.hexdigest()
+
+    def tag(self, *parts):
+        self.h.update(repr(parts).encode())
+
+    def update(self, obj):
+        if obj is None or obj is Ellipsis or isinstance(obj, (bool, int, float, complex, str, bytes)):
+            self.tag(type(obj).__name__, obj)
+            return
+        if isinstance(obj, slice):
+            self.tag("slice", obj.start, obj.stop, obj.step)
+            return
+        if isinstance(obj, np.generic):
+            self.tag(obj.dtype.str, obj.item())
+            return
+        key = id(obj)
+        if key in self.seen:
+            self.tag("ref", self.seen[key])
+            return
+        self.seen[key] = len(self.seen)
+        self.visited.append(obj)
+
+        if callable(getattr(obj, "cache_key", None)) and not isinstance(obj, type):
+            self.tag("key", type(obj).__qualname__)
+            self.update(obj.cache_key())
+        elif isinstance(obj, np.ndarray):
+            self.tag("array", obj.dtype.str, obj.shape)
+            if obj.dtype == object:
+                for item in obj.ravel():
+                    self.update(item)
+            else:
+                self.h.update(np.ascontiguousarray(obj).data)
+        elif isinstance(obj, (list, tuple)):
+            self.tag(type(obj).__name__, len(obj))
+            for item in obj:
+                self.update(item)
+        elif isinstance(obj, dict):
+            self.tag("dict", len(obj))
+            for k, v in sorted(obj.items(), key=lambda item: repr(item[0])):
+                self.update(k)
+                self.update(v)
+        elif isinstance(obj, (set, frozenset)):
+            # order-free: hash the items apart and sort the digests
+            digests = []
+            for item in obj:
+                sub = StateHasher()
+                sub.update(item)
+                digests.append(sub.hexdigest())
+                self.stable &= sub.stable
+            self.tag("set", sorted(digests))
+        elif isinstance(obj, types.FunctionType):
+            self.tag("function", obj.__qualname__)
+            self.update(obj.__code__)
+            self.update(obj.__defaults__)
+            self.update(obj.__kwdefaults__)
+            for cell in obj.__closure__ or ():
+                try:
+                    self.update(cell.cell_contents)
+                except ValueError:  # empty cell
+                    self.tag("empty")
+            # module-level helpers and constants the function refers to,
+            # nested lambdas included; modules and classes are left out
+            for name in global_names(obj.__code__):
+                value = obj.__globals__.get(name)
+                if isinstance(value, _GLOBAL_STATE) or (
+                    callable(getattr(value, "cache_key", None)) and not isinstance(value, type)
+                ):
+                    self.tag("global", name)
+                    self.update(value)
+        elif isinstance(obj, types.CodeType):
+            # not the file name or line numbers: moving code does not change frames
+            self.tag("code", obj.co_code, obj.co_names, obj.co_varnames)
+            self.update(obj.co_consts)
+        elif isinstance(obj, types.MethodType):
+            self.update(obj.__func__)
+            self.update(obj.__self__)
+        elif isinstance(obj, (types.BuiltinFunctionType, np.ufunc, type)):
+            self.tag("named", getattr(obj, "__module__", None), getattr(obj, "__qualname__", obj.__name__))
+        elif isinstance(obj, _OPAQUE):
+            self.tag("opaque", type(obj).__qualname__)
+            if not isinstance(obj, types.ModuleType):
+                self.stable = False
+        elif isinstance(obj, Path):
+            self.tag("path", str(obj))
+        elif hasattr(obj, "__dict__") or hasattr(type(obj), "__slots__"):
+            self.tag("object", type(obj).__module__, type(obj).__qualname__)
+            state = {k: v for k, v in getattr(obj, "__dict__", {}).items() if k not in _IDENTITY_ATTRS}
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, "__slots__", ()):
+                    if name not in state and hasattr(obj, name):
+                        state[name] = getattr(obj, name)
+            if isinstance(obj, Camera):
+                state = {k: v for k, v in state.items() if k not in _CAMERA_OUTPUTS}
+            self.update(state)
+        else:
+            self.tag("opaque", type(obj).__qualname__)
+            self.stable = False
+
+
+def segment_fingerprint(scene, camera, animations, mobjects):
+    start = time.perf_counter()
+    hasher = StateHasher()
+    hasher.tag("segment", SEGMENT_VERSION, manim_version, type(scene.renderer.file_writer).__qualname__)
+    hasher.update({key: config[key] for key in _RENDER_CONFIG})
+    hasher.update(round(scene.renderer.time, 6))
+    hasher.update(camera)
+    hasher.update(list(animations))
+    hasher.update(list(mobjects))
+    logger.debug(f"segment fingerprint in {time.perf_counter() - start:.4f}s")
+    return hasher.hexdigest()
+
+
+_manim_hash = cairo_renderer.get_hash_from_play_call
+
+
+def _get_hash_from_play_call(scene, camera, animations, mobjects):
+    if isinstance(scene, SegmentCache):
+        return segment_fingerprint(scene, camera, animations, mobjects)
+    return _manim_hash(scene, camera, animations, mobjects)
+
+
+# the renderer looks the function up in its module at every play
+cairo_renderer.get_hash_from_play_call = _get_hash_from_play_call
+
+
+def evict(directory, max_bytes):
+    """Delete the least recently used partial movies under ``directory`` beyond ``max_bytes``."""
+    entries = []
+    for path in Path(directory).glob(f"*/*{config.movie_file_extension}"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"segment cache: evicted {removed} partial movies, {total / 1e6:.0f} MB kept")
+
+
+class SegmentCache:
+    """Scene mixin that fingerprints and reuses play/wait segments (Cairo only)."""
+
+    # number of the last play found in the cache
+    _reused_play = None
+
+    def render(self, preview=False):
+        writer = self.renderer.file_writer
+        is_already_cached = writer.is_already_cached
+
+        def cached(hash_invocation):
+            hit = is_already_cached(hash_invocation)
+            if hit:
+                self._reused_play = self.renderer.num_plays
+                # the mtime is the LRU clock
+                path = writer.partial_movie_directory / f"{hash_invocation}{config.movie_file_extension}"
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    pass
+            return hit
+
+        writer.is_already_cached = cached
+        # size-bounded and across scenes, instead of the newest 100 files of this one
+        max_bytes = int(os.environ.get("SEGMENT_CACHE_BYTES", DEFAULT_MAX_BYTES))
+        writer.clean_cache = lambda: evict(writer.partial_movie_directory.parent, max_bytes)
+        return super().render(preview)
+
+    def segment_reused(self):
+        """Whether the play being run reuses its partial movie."""
+        # keyed by play, so a hit never outlives its play: waits frozen into
+        # one frame and skipped plays do not reach play_internal
+        return self._reused_play == self.renderer.num_plays
+
+    def play_internal(self, skip_rendering=False):
+        if not self.segment_reused():
+            return super().play_internal(skip_rendering)
+        # A reused segment: run its updates frame by frame like the render
+        # that encoded it, without drawing, so the next segment starts from
+        # the same state.  With TimeSlices after this mixin, a sliced render
+        # steps its reused segments here too.
+        self.renderer.skip_animations = False
+        try:
+            super().play_internal(skip_rendering=True)
+        finally:
+            self.renderer.skip_animations = True
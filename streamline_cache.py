@@ -0,0 +1,219 @@
+"""On-disk cache of integrated streamline trajectories.
+
+Entries are compressed ``.npz`` files named after a hash of the field function
+(its code, constants, defaults, closure values and the module globals it
+reads, with ``segment_cache.StateHasher``) and of the integration parameters
+and seeds.  Fields holding state that cannot be hashed are not cached.  The directory is bounded in size and evicts the least
+recently used entries.  Every hit or miss is appended to ``stats.jsonl`` so
+that runs in different processes can be summed up with::
+
+    python streamline_cache.py            # print hit/miss counters
+    python streamline_cache.py --clear    # drop every entry
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from segment_cache import StateHasher
+
+CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def field_fingerprint(func):
+    """Digest of a field: its code, constants, closures and the globals they read.
+
+    None when part of it can only be hashed by type (see ``StateHasher``),
+    so that no cache ever mistakes two such fields for one.
+    """
+    hasher = StateHasher()
+    hasher.update(func)
+    return hasher.hexdigest() if hasher.stable else None
+
+
+class DiskCache:
+    """Directory of cache entries shared by concurrent processes.
+
+    Entries are written to a temporary file and renamed into place, the
+    directory is bounded in bytes with the least recently used entries
+    evicted first, and hits and misses are appended to ``stats.jsonl``.
+    """
+
+    suffix = ""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def path(self, key):
+        return self.directory / f"{key}{self.suffix}"
+
+    def write(self, key, dump):
+        """Write an entry with ``dump(file)``, atomically, then evict."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                dump(f)
+            # atomic, so concurrent renders never read a half-written entry
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key`` or compute and store it.
+
+        Subclasses provide ``load(key) -> (value, seconds) or None`` and
+        ``store(key, value, seconds)``.  A None key is computed every time.
+        """
+        if key is None:
+            return compute()
+        cached = self.load(key)
+        if cached is not None:
+            value, seconds = cached
+            self.hits += 1
+            self.saved_seconds += seconds
+            self._log("hit", seconds)
+            return value
+        start = time.perf_counter()
+        value = compute()
+        seconds = time.perf_counter() - start
+        self.misses += 1
+        self.store(key, value, seconds)
+        self._log("miss", seconds)
+        return value
+
+    def evict(self):
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for path in self.directory.glob(f"*{self.suffix}"):
+            path.unlink(missing_ok=True)
+        (self.directory / "stats.jsonl").unlink(missing_ok=True)
+
+    def _log(self, event, seconds):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"event": event, "seconds": seconds, "time": time.time()}) + "\n"
+        # a single O_APPEND write per event keeps lines intact across processes
+        fd = os.open(self.directory / "stats.jsonl", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+    def stats(self):
+        """Hit/miss counters summed over every process that used this directory."""
+        summary = {"hits": 0, "misses": 0, "saved_seconds": 0.0, "compute_seconds": 0.0}
+        try:
+            lines = (self.directory / "stats.jsonl").read_text().splitlines()
+        except FileNotFoundError:
+            lines = []
+        for line in lines:
+            entry = json.loads(line)
+            if entry["event"] == "hit":
+                summary["hits"] += 1
+                summary["saved_seconds"] += entry["seconds"]
+            else:
+                summary["misses"] += 1
+                summary["compute_seconds"] += entry["seconds"]
+        summary["entries"] = len(list(self.directory.glob(f"*{self.suffix}")))
+        summary["bytes"] = sum(p.stat().st_size for p in self.directory.glob(f"*{self.suffix}"))
+        return summary
+
+
+class TrajectoryCache(DiskCache):
+    suffix = ".npz"
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(
+            directory or os.environ.get("STREAMLINE_CACHE_DIR") or Path("media") / "cache" / "streamlines",
+            max_bytes,
+        )
+
+    def cache_key(self):
+        # where trajectories are kept does not change them (see segment_cache.py)
+        return type(self).__name__
+
+    def key(self, func, start_points, **params):
+        """Digest of the field and the integration; None for a field that cannot be hashed."""
+        fingerprint = field_fingerprint(func)
+        if fingerprint is None:
+            return None
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}".encode())
+        h.update(fingerprint.encode())
+        h.update(repr(sorted(params.items())).encode())
+        h.update(np.ascontiguousarray(start_points, dtype=float).tobytes())
+        return h.hexdigest()
+
+    def load(self, key):
+        if key is None:
+            return None
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                points, offsets, seconds = data["points"], data["offsets"], float(data["seconds"])
+        except (OSError, KeyError, ValueError):
+            return None
+        # mtime is the LRU clock
+        os.utime(path)
+        # offsets is [0] alone when there are no trajectories, and np.split
+        # would still return one empty piece
+        trajectories = np.split(points, offsets[1:-1]) if len(offsets) > 1 else []
+        return trajectories, seconds
+
+    def store(self, key, trajectories, seconds):
+        offsets = np.cumsum([0] + [len(t) for t in trajectories])
+        self.write(
+            key,
+            lambda f: np.savez_compressed(
+                f,
+                points=np.concatenate(trajectories) if trajectories else np.empty((0, 3)),
+                offsets=offsets,
+                seconds=seconds,
+            ),
+        )
+
+
+default_cache = TrajectoryCache()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streamline trajectory cache")
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+
+    cache = TrajectoryCache(args.dir)
+    if args.clear:
+        cache.clear()
+    s = cache.stats()
+    total = s["hits"] + s["misses"]
+    rate = s["hits"] / total if total else 0.0
+    print(f"entries: {s['entries']} ({s['bytes'] / 1e6:.1f} MB) in {cache.directory}")
+    print(f"hits: {s['hits']}  misses: {s['misses']}  hit rate: {rate:.0%}")
+    print(f"integration time saved: {s['saved_seconds']:.2f}s (spent: {s['compute_seconds']:.2f}s)")
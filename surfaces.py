@@ -0,0 +1,340 @@
+"""Parametric surfaces built from arrays.
+
+manim's ``Surface`` creates its faces in (u, v) space and then maps every
+point through ``func`` one call at a time, and ``set_fill_by_value`` walks the
+faces again.  ``BatchSurface`` evaluates ``func`` once over the whole
+(u, v) grid, builds every face polygon with NumPy, creates the faces from
+one styled template and colors them from arrays.  With a ``tolerance`` it
+also refines adaptively: starting from ``base_resolution`` cells, a cell is
+split in four while the surface inside it strays more than ``tolerance``
+scene units from the bilinear patch spanned by its corners, down to the
+cells of ``resolution``.
+"""
+
+import warnings
+
+import numpy as np
+
+from manim import BLUE_D, BLUE_E, LIGHT_GREY, Surface, ThreeDVMobject, VGroup, config, logger
+from manim.constants import RendererType
+from manim.utils.color import ManimColor
+
+from preview import coarser, fewer
+
+
+def evaluate_uv(func, u, v):
+    """``func`` over arrays ``u``, ``v`` of the same shape; returns (..., 3).
+
+    Functions built from NumPy operations (``axes.c2p`` included) are called
+    once with the flattened arrays, after checking a few samples against
+    per-point calls; anything else is evaluated point by point.
+    """
+    shape = np.shape(u)
+    u, v = np.ravel(u).astype(float), np.ravel(v).astype(float)
+    expected = np.array([func(a, b) for a, b in zip(u[:5], v[:5])], dtype=float)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = np.asarray(func(u, v), dtype=float)
+        if result.shape == (3, len(u)):
+            result = result.T
+        if result.shape != (len(u), 3) or not np.allclose(result[:5], expected, equal_nan=True):
+            raise ValueError
+    except Exception:
+        result = np.array([func(a, b) for a, b in zip(u, v)], dtype=float).reshape(-1, 3)
+    return result.reshape(*shape, 3)
+
+
+def bilinear_error(points, size):
+    """Largest distance between ``points`` and the bilinear patches of size ``size``.
+
+    ``points`` is the (nu + 1, nv + 1, 3) grid; returns one value per cell
+    of ``size`` x ``size`` grid steps, shape (nu // size, nv // size).
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(points, (size + 1, size + 1), axis=(0, 1))
+    windows = windows[::size, ::size]  # (cu, cv, 3, size + 1, size + 1)
+    s = np.linspace(0, 1, size + 1)
+    a, b = s[:, None], s[None, :]
+    c00 = windows[..., :1, :1]
+    c10 = windows[..., -1:, :1]
+    c01 = windows[..., :1, -1:]
+    c11 = windows[..., -1:, -1:]
+    patch = (1 - a) * (1 - b) * c00 + a * (1 - b) * c10 + (1 - a) * b * c01 + a * b * c11
+    return np.linalg.norm(windows - patch, axis=2).max(axis=(-2, -1))
+
+
+def refine_cells(points, base_size, tolerance):
+    """Quadtree cells ``(i, j, size)`` in grid steps, coarse where the surface is flat."""
+    nu, nv = points.shape[0] - 1, points.shape[1] - 1
+    cells = []
+    size = base_size
+    active = np.ones((nu // size, nv // size), dtype=bool)
+    while True:
+        if size == 1:
+            split = np.zeros_like(active)
+        else:
+            split = active & (bilinear_error(points, size) > tolerance)
+        for ci, cj in zip(*np.nonzero(active & ~split)):
+            cells.append((ci * size, cj * size, size))
+        if not split.any():
+            return cells
+        # each split cell becomes its four children at the next level
+        active = np.kron(split, np.ones((2, 2), dtype=bool))
+        size //= 2
+
+
+def cell_outlines(cells, size):
+    """Grid indices around the border of each ``size`` cell, shape (N, 4 * size, 2)."""
+    k = np.arange(size)
+    offsets = np.concatenate(
+        [
+            np.stack([k, np.zeros(size, int)], axis=1),
+            np.stack([np.full(size, size), k], axis=1),
+            np.stack([size - k, np.full(size, size)], axis=1),
+            np.stack([np.zeros(size, int), size - k], axis=1),
+        ]
+    )
+    corners = np.array([(i, j) for i, j, _ in cells])
+    return corners[:, None, :] + offsets[None, :, :]
+
+
+def uv_with_handles(values, factor):
+    """``values`` with, inside each step, the points ``factor`` of the way to its handles.
+
+    The handles of a straight step sit a third of the way from each end;
+    this is where ``VMobject.apply_function`` samples the function for them.
+    """
+    steps = np.diff(values)
+    fine = np.stack([values[:-1], values[:-1] + factor * steps / 3, values[1:] - factor * steps / 3], axis=1)
+    return np.append(fine.ravel(), values[-1])
+
+
+def scale_handles(fine, factor, axis):
+    """Undo ``uv_with_handles`` along ``axis`` once mapped: the handles move back out by 1 / ``factor``."""
+    fine = np.moveaxis(fine, axis, 0)
+    anchors = fine[::3]
+    fine[1::3] = anchors[:-1] + (fine[1::3] - anchors[:-1]) / factor
+    fine[2::3] = anchors[1:] + (fine[2::3] - anchors[1:]) / factor
+
+
+def bezier_midpoints(points):
+    """What ``VMobject.get_midpoint`` returns for faces of the same size, at once.
+
+    ``points`` is (N, k * 4, 3): k cubic curves per face.  Like
+    ``point_from_proportion(0.5)``, each curve's length is measured on ten
+    samples and the point is taken halfway along the summed length.
+    """
+    curves = points.reshape(len(points), -1, 4, 3)
+    t = np.linspace(0, 1, 10)[:, None]
+    bernstein = np.hstack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t**2, t**3])
+    samples = np.einsum("si,nkid->nksd", bernstein, curves)
+    lengths = np.linalg.norm(np.diff(samples, axis=2), axis=3).sum(axis=2)
+    ends = np.cumsum(lengths, axis=1)
+    target = ends[:, -1:] / 2
+    index = np.argmax(ends >= target, axis=1)
+    rows = np.arange(len(points))
+    length = lengths[rows, index]
+    before = ends[rows, index] - length
+    residue = np.divide(target[:, 0] - before, length, out=np.zeros_like(length), where=length != 0)[:, None]
+    r = 1 - residue
+    weights = np.hstack([r**3, 3 * r**2 * residue, 3 * r * residue**2, residue**3])
+    return np.einsum("ni,nid->nd", weights, curves[rows, index])
+
+
+def faces_like(template, points):
+    """Faces with ``template``'s style and the rows of ``points`` (N, k, 3), built in bulk.
+
+    ``__init__`` and the color setters cost about 100 µs per face, most of
+    a surface's construction; here the template's attributes are copied
+    instead, and each array attribute (points, fill, stroke...) is a view
+    into one buffer shared by all the faces, one row each.
+    """
+    state = {key: value for key, value in vars(template).items() if key not in ("submobjects", "updaters")}
+    buffers = {key: np.repeat(value[None], len(points), axis=0) for key, value in state.items() if isinstance(value, np.ndarray)}
+    buffers["points"] = points
+    cls = type(template)
+    faces = []
+    for k in range(len(points)):
+        face = cls.__new__(cls)
+        face.__dict__.update(state)
+        face.submobjects, face.updaters = [], []
+        for key, buffer in buffers.items():
+            setattr(face, key, buffer[k])
+        faces.append(face)
+    return faces
+
+
+class BatchSurface(Surface):
+    """``Surface`` evaluated over the whole (u, v) grid in one call.
+
+    ``resolution`` is the finest number of cells along u and v.  Without a
+    ``tolerance`` every face has that size, as in ``Surface``.  With one,
+    faces start at ``base_resolution`` (which must divide ``resolution`` by a
+    power of two) and are split only where the surface bends.  A coarse face
+    follows every grid point along its border, so it meets finer neighbours
+    without cracks.
+
+    The handles of each edge come from ``func`` sampled just off its ends,
+    as ``Surface`` gets them through ``apply_function`` and
+    ``pre_function_handle_to_anchor_scale_factor``, so without a
+    ``tolerance`` the faces have the same points as ``Surface``'s.
+    """
+
+    def __init__(
+        self,
+        func,
+        u_range=[0, 1],
+        v_range=[0, 1],
+        resolution=32,
+        surface_piece_config={},
+        fill_color=BLUE_D,
+        fill_opacity=1.0,
+        checkerboard_colors=[BLUE_D, BLUE_E],
+        stroke_color=LIGHT_GREY,
+        stroke_width=0.5,
+        should_make_jagged=False,
+        pre_function_handle_to_anchor_scale_factor=0.00001,
+        base_resolution=None,
+        tolerance=None,
+        **kwargs,
+    ):
+        # Same attributes as Surface.__init__, which would map every point
+        # through func one by one after _setup_in_uv_space.
+        self.u_range = u_range
+        self.v_range = v_range
+        VGroup.__init__(self, **kwargs)
+        self.resolution = fewer(resolution) if isinstance(resolution, int) else tuple(fewer(n) for n in resolution)
+        self.surface_piece_config = surface_piece_config
+        self.fill_color = ManimColor(fill_color)
+        self.fill_opacity = fill_opacity
+        if checkerboard_colors:
+            self.checkerboard_colors = [ManimColor(x) for x in checkerboard_colors]
+        else:
+            self.checkerboard_colors = checkerboard_colors
+        self.stroke_color = ManimColor(stroke_color)
+        self.stroke_width = stroke_width
+        self.should_make_jagged = should_make_jagged
+        self.pre_function_handle_to_anchor_scale_factor = pre_function_handle_to_anchor_scale_factor
+        self.base_resolution = base_resolution
+        self.tolerance = coarser(tolerance) if tolerance is not None else None
+        self._func = func
+        self._setup_in_uv_space()
+        if self.should_make_jagged:
+            self.make_jagged()
+
+    def _setup_in_uv_space(self):
+        u_values, v_values = self._get_u_values_and_v_values()
+        nu, nv = len(u_values) - 1, len(v_values) - 1
+        # the anchors and the handles of every grid edge, on a grid three
+        # times finer whose points off the grid lines are unused
+        factor = self.pre_function_handle_to_anchor_scale_factor
+        fine = np.full((3 * nu + 1, 3 * nv + 1, 3), np.nan)
+        u, v = np.meshgrid(uv_with_handles(u_values, factor), v_values, indexing="ij")
+        along_u = evaluate_uv(self._func, u, v)
+        scale_handles(along_u, factor, axis=0)
+        fine[:, ::3] = along_u
+        u, v = np.meshgrid(u_values, uv_with_handles(v_values, factor), indexing="ij")
+        along_v = evaluate_uv(self._func, u, v)
+        scale_handles(along_v, factor, axis=1)
+        fine[::3, :] = along_v
+        self.grid_points = fine[::3, ::3]
+
+        if self.tolerance is None:
+            cells = [(i, j, 1) for i in range(nu) for j in range(nv)]
+        else:
+            base = self.base_resolution or 8
+            base_size = max(1, nu // base)
+            if nu % base_size or nv % base_size or base_size & (base_size - 1):
+                raise ValueError(
+                    f"base_resolution {base} must divide resolution {(nu, nv)} by a power of two"
+                )
+            cells = refine_cells(self.grid_points, base_size, self.tolerance)
+
+        template = ThreeDVMobject()
+        template.set_fill(color=self.fill_color, opacity=self.fill_opacity)
+        template.set_stroke(color=self.stroke_color, width=self.stroke_width, opacity=self.stroke_opacity)
+        faces = []
+        by_size = {}
+        for cell in cells:
+            by_size.setdefault(cell[2], []).append(cell)
+        for size, group in sorted(by_size.items()):
+            index = cell_outlines(group, size)
+            # each border step k -> k + 1 is the curve 3k, 3k + 1, 3k + 2, 3k + 3 on the fine grid
+            step = np.roll(index, -1, axis=1) - index
+            curves = 3 * index[:, :, None, :] + np.arange(4)[:, None] * step[:, :, None, :]
+            points = fine[curves[..., 0], curves[..., 1]].reshape(len(group), -1, 3)
+            for (i, j, _), face in zip(group, faces_like(template, points)):
+                face.u_index, face.v_index = i // size, j // size
+                face.u1, face.u2 = u_values[i], u_values[i + size]
+                face.v1, face.v2 = v_values[j], v_values[j + size]
+                faces.append(face)
+        if self.tolerance is not None:
+            logger.debug(f"BatchSurface: {len(faces)} faces instead of {nu * nv}")
+
+        self.add(*faces)
+        if self.checkerboard_colors:
+            self.set_fill_by_checkerboard(*self.checkerboard_colors)
+
+    def set_fill_by_checkerboard(self, *colors, opacity=None):
+        """Same coloring as ``Surface.set_fill_by_checkerboard``, each color computed once."""
+        if config.renderer == RendererType.OPENGL:
+            return super().set_fill_by_checkerboard(*colors, opacity=opacity)
+        faces = self.submobjects
+        if not faces:
+            return self
+        # what face.set_fill(color, opacity) writes, sheen included
+        rgbas = [faces[0].generate_rgbas_array(color, opacity) for color in colors]
+        for face in faces:
+            index = (face.u_index + face.v_index) % len(colors)
+            rgba = rgbas[index]
+            if len(face.fill_rgbas) != len(rgba):  # a gradient set on this face
+                face.set_fill(colors[index], opacity=opacity)
+                continue
+            face.fill_rgbas[:, :3] = rgba[:, :3]
+            if opacity is not None:
+                face.fill_rgbas[:, 3] = rgba[:, 3]
+                face.fill_opacity = opacity
+        return self
+
+    def set_fill_by_value(self, axes, colorscale=None, axis=2, **kwargs):
+        """Same coloring as ``Surface.set_fill_by_value``, computed for all faces at once.
+
+        A face's value is taken at ``get_midpoint()``, halfway along its
+        border, as manim does.
+        """
+        if "colors" in kwargs and colorscale is None:
+            colorscale = kwargs.pop("colors")
+        if kwargs:
+            raise ValueError(f"Unsupported keyword argument(s): {', '.join(str(key) for key in kwargs)}")
+        if colorscale is None:
+            logger.warning(
+                "The value passed to the colorscale keyword argument was None, "
+                "the surface fill color has not been changed"
+            )
+            return self
+
+        if type(colorscale[0]) is tuple:
+            colors, pivots = [c for c, _ in colorscale], [p for _, p in colorscale]
+        else:
+            colors = colorscale
+            low, high = [axes.x_range, axes.y_range, axes.z_range][axis][:2]
+            pivots = np.linspace(low, high, len(colors))
+        rgbs = np.array([ManimColor(c).to_rgb() for c in colors])
+
+        faces = self.family_members_with_points()
+        midpoints = np.empty((len(faces), 3))
+        by_size = {}
+        for k, face in enumerate(faces):
+            by_size.setdefault(len(face.points), []).append(k)
+        for rows in by_size.values():
+            midpoints[rows] = bezier_midpoints(np.array([faces[k].points for k in rows]))
+        values = np.asarray(axes.point_to_coords(midpoints))[:, axis]
+        face_rgbs = np.stack([np.interp(values, pivots, rgbs[:, k]) for k in range(3)], axis=1)
+        for face, rgb in zip(faces, face_rgbs):
+            # what set_color(..., family=False) does, without building colors
+            if config.renderer == RendererType.OPENGL:
+                face.set_color(ManimColor(rgb), recurse=False)
+            else:
+                face.fill_rgbas[:, :3] = rgb
+                face.stroke_rgbas[:, :3] = rgb
+        return self
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the modules of this repository live at its top level
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
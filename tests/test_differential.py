@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pytest
+
+from differential import FieldDerivatives, FieldHeatmap, gradient_field
+
+RANGES = dict(x_range=[-2, 2], y_range=[-1, 1])
+
+
+def bowl(pos):
+    return pos[0] ** 2 + pos[1] ** 2
+
+
+def ripple(pos):
+    # math functions: evaluated point by point
+    return math.sin(pos[0]) * pos[1]
+
+
+def interior(values):
+    # np.gradient is one-sided, and less accurate, on the border
+    return values[1:-1, 1:-1]
+
+
+@pytest.fixture
+def grid():
+    return FieldDerivatives(resolution=0.1, **RANGES)
+
+
+def test_gradient_field_matches_the_analytic_gradient():
+    points = np.random.default_rng(0).uniform(-2, 2, (50, 3))
+    x, y = points[:, 0], points[:, 1]
+
+    np.testing.assert_allclose(gradient_field(bowl).batch(points), np.stack([2 * x, 2 * y, 0 * x], axis=1), atol=1e-6)
+    np.testing.assert_allclose(
+        gradient_field(ripple).batch(points), np.stack([np.cos(x) * y, np.sin(x), 0 * x], axis=1), atol=1e-6
+    )
+
+
+def test_grid_is_laid_out_like_an_image(grid):
+    assert grid.shape == (21, 41)
+    np.testing.assert_allclose(grid.points[0], [-2, 1, 0])
+    np.testing.assert_allclose(grid.points[-1], [2, -1, 0])
+
+
+@pytest.mark.parametrize(
+    "func, divergence, curl",
+    [
+        # source, rotation, and a field with both that varies in space
+        (lambda p: np.array([p[0], p[1], 0 * p[0]]), lambda x, y: 2 + 0 * x, lambda x, y: 0 * x),
+        (lambda p: np.array([-p[1], p[0], 0 * p[0]]), lambda x, y: 0 * x, lambda x, y: 2 + 0 * x),
+        (lambda p: np.array([p[0] * p[1], p[0] ** 2, 0 * p[0]]), lambda x, y: y, lambda x, y: x),
+    ],
+)
+def test_divergence_and_curl(grid, func, divergence, curl):
+    x, y = grid.points[:, 0].reshape(grid.shape), grid.points[:, 1].reshape(grid.shape)
+
+    np.testing.assert_allclose(interior(grid.divergence(func)), interior(divergence(x, y)), atol=1e-9)
+    np.testing.assert_allclose(interior(grid.curl(func)), interior(curl(x, y)), atol=1e-9)
+    np.testing.assert_allclose(interior(grid.compute("curl", func)), interior(curl(x, y)), atol=1e-9)
+
+
+def test_gradient_magnitude(grid):
+    x, y = grid.points[:, 0].reshape(grid.shape), grid.points[:, 1].reshape(grid.shape)
+    np.testing.assert_allclose(interior(grid.gradient_magnitude(bowl)), interior(2 * np.hypot(x, y)), atol=1e-9)
+    with pytest.raises(ValueError):
+        grid.compute("laplacian", bowl)
+
+
+def test_heatmap_follows_a_time_dependent_field():
+    # divergence cos(t): positive, then zero, then negative
+    heatmap = FieldHeatmap(lambda pos, t: np.array([np.cos(t) * pos[0], 0 * pos[1], 0 * pos[0]]), resolution=0.25, **RANGES)
+    array = heatmap.pixel_array
+    first = array.copy()
+    alpha = first[..., 3].copy()
+    low, high = heatmap.rgbs[0], heatmap.rgbs[-1]
+    np.testing.assert_allclose(first[..., :3], np.broadcast_to(high, first[..., :3].shape), atol=1)
+
+    heatmap.start_time_updates()
+    heatmap.update(np.pi / 2)
+    assert heatmap.time == pytest.approx(np.pi / 2)
+    # a zero divergence is the middle of the palette, white
+    np.testing.assert_array_equal(heatmap.pixel_array[..., :3], 255)
+    heatmap.update(np.pi / 2)
+    assert not np.array_equal(heatmap.pixel_array, first)
+    # the color range of the first frame is kept: cos(pi) is its other end
+    np.testing.assert_allclose(heatmap.pixel_array[..., :3], np.broadcast_to(low, first[..., :3].shape), atol=1)
+
+    heatmap.stop_time_updates()
+    heatmap.update(1.0)
+    assert heatmap.time == pytest.approx(np.pi)
+    # rewritten in place, alpha untouched
+    assert heatmap.pixel_array is array
+    np.testing.assert_array_equal(heatmap.pixel_array[..., 3], alpha)
+
+
+def test_static_heatmaps_refuse_time_updates():
+    with pytest.raises(ValueError):
+        FieldHeatmap(lambda pos: pos, resolution=0.5, **RANGES).start_time_updates()
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from field_dsl import ExpressionField, TimeExpressionField, compile_expression, expression_field
+
+
+@pytest.mark.parametrize(
+    "expression, label",
+    [
+        ("(sin(x), y**2)", r"F(x, y) = \left(\sin x, y^{2}\right)"),
+        ("(-y, x)", r"F(x, y) = \left(-y, x\right)"),
+        (
+            "[sin(x / 2) - cos(y / 2), sin(x / 2)]",
+            r"F(x, y) = \left(\sin\left(\frac{x}{2}\right) - \cos\left(\frac{y}{2}\right), \sin\left(\frac{x}{2}\right)\right)",
+        ),
+        ("(x*sin(y)**2, -2*x + exp(-t))", r"F(x, y, t) = \left(x \sin^{2} y, -2 x + e^{-t}\right)"),
+        ("(x - (-y), sqrt(x**2 + y**2))", r"F(x, y) = \left(x - \left(-y\right), \sqrt{x^{2} + y^{2}}\right)"),
+        ("(2*3, x*(y+1), 0)", r"F(x, y) = \left(2 \cdot 3, x \left(y + 1\right)\right)"),
+    ],
+)
+def test_label(expression, label):
+    assert compile_expression(expression).label() == label
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "x + y",  # not a tuple
+        "(x,)",
+        "(x, y)^2",
+        "(x, (y, z))",
+        "(w, y)",
+        "(__import__('os'), y)",
+        "(x.real, y)",
+        "(sin(x=1), y)",
+        "(x if y else 1, y)",
+        "(x @ y, y)",
+        "('x', y)",
+        "(x, y",
+    ],
+)
+def test_rejects(expression):
+    with pytest.raises(ValueError):
+        compile_expression(expression)
+
+
+def test_kernel_matches_numpy():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-5, 5, (100, 3))
+    x, y = points[:, 0], points[:, 1]
+
+    field = expression_field("[sin(x / 2) - cos(y / 2), sin(x / 2)]")
+    assert isinstance(field, ExpressionField)
+    expected = np.stack([np.sin(x / 2) - np.cos(y / 2), np.sin(x / 2), np.zeros_like(x)], axis=1)
+    np.testing.assert_allclose(field.batch(points), expected)
+    np.testing.assert_allclose(field(points[0]), expected[0])
+
+    moving = expression_field("(cos(t) * x, y % 2, exp(-t))")
+    assert isinstance(moving, TimeExpressionField)
+    expected = np.stack([np.cos(1.5) * x, y % 2, np.full_like(x, np.exp(-1.5))], axis=1)
+    np.testing.assert_allclose(moving.at(1.5).batch(points), expected)
+    np.testing.assert_allclose(moving(points[0], 1.5), expected[0])
+
+
+def test_spacing_does_not_change_the_key():
+    assert expression_field("(-y,x)").cache_key() == expression_field("( -y , x )").cache_key()
+    assert expression_field("(-y, x)").cache_key() != expression_field("(y, -x)").cache_key()
@@ -0,0 +1,76 @@
+import numpy as np
+from manim import ORIGIN, PI, RIGHT, ArrowVectorField, StreamLines
+
+from fields import BatchArrowVectorField, BatchField, BatchStreamLines, PackedArrowVectorField, TimeField, grid_points
+
+
+def field(pos):
+    # ContinuousMotion's field
+    return np.array([np.sin(pos[0] / 2) - np.cos(pos[1] / 2), np.sin(pos[0] / 2), 0 * pos[0]])
+
+
+RANGES = dict(x_range=[-3, 3], y_range=[-2, 2])
+
+
+def test_stream_lines_match_manim():
+    options = dict(stroke_width=1, max_anchors_per_line=10, padding=1, **RANGES)
+    ours = BatchStreamLines(field, **options)
+    theirs = StreamLines(field, **options)
+
+    assert len(ours.stream_lines) == len(theirs.stream_lines) > 0
+    for a, b in zip(ours.stream_lines, theirs.stream_lines):
+        np.testing.assert_allclose(a.points, b.points, atol=1e-9)
+        np.testing.assert_allclose(a.get_stroke_rgbas(), b.get_stroke_rgbas(), atol=1e-9)
+
+
+def test_stream_lines_leave_the_global_random_state_alone():
+    np.random.seed(7)
+    expected = np.random.random_sample(3)
+    np.random.seed(7)
+    BatchStreamLines(field, max_anchors_per_line=5, **RANGES)
+    np.testing.assert_array_equal(np.random.random_sample(3), expected)
+
+
+def test_arrows_match_manim():
+    ours = BatchArrowVectorField(field, **RANGES)
+    theirs = ArrowVectorField(field, **RANGES)
+
+    assert len(ours) == len(theirs)
+    for a, b in zip(ours, theirs):
+        np.testing.assert_allclose(a.get_all_points(), b.get_all_points(), atol=1e-9)
+        np.testing.assert_allclose(a.get_fill_rgbas(), b.get_fill_rgbas(), atol=1e-9)
+
+
+def test_batch_evaluation():
+    points = np.random.default_rng(0).uniform(-4, 4, (50, 3))
+    expected = np.array([field(p) for p in points])
+
+    vectorized = BatchField(field)
+    np.testing.assert_allclose(vectorized.batch(points), expected)
+    assert vectorized.is_vectorized
+
+    # the same field, written so that it only works point by point
+    looped = BatchField(lambda pos: np.array([field(pos)[0], field(pos)[1], 0]))
+    np.testing.assert_allclose(looped.batch(points), expected)
+    assert not looped.is_vectorized
+
+
+def test_point_by_point_time_fields_stay_looped():
+    moving = TimeField(lambda pos, t: np.array([t, 0 * pos[1], 0 * pos[2]]))
+    points = np.zeros((4, 3))
+
+    for t in (0.0, 0.5, 1.0):
+        np.testing.assert_allclose(moving.at(t).batch(points)[:, 0], t)
+
+
+def test_packed_arrows_keep_their_place_when_recolored():
+    arrows = PackedArrowVectorField(field, **RANGES)
+    arrows.shift(3 * RIGHT).rotate(PI / 2, about_point=ORIGIN)
+    moved = arrows.get_all_points().copy()
+
+    arrows.set_color_values(arrows.values[::-1])
+
+    np.testing.assert_allclose(np.sort(arrows.get_all_points(), axis=0), np.sort(moved, axis=0), atol=1e-9)
+    # the same arrows as a field built there, pointing as the field did
+    rotated = np.array([[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    np.testing.assert_allclose(arrows.origins, (grid_points(arrows.ranges) + 3 * RIGHT) @ rotated.T, atol=1e-9)
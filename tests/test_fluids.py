@@ -0,0 +1,47 @@
+import numpy as np
+
+from fluids import StableFluids
+
+
+def divergence(solver):
+    """Central-difference divergence of the inner cells, as ``project`` computes it."""
+    u, v, h = solver.u, solver.v, solver.h
+    return (u[2:, 1:-1] - u[:-2, 1:-1] + v[1:-1, 2:] - v[1:-1, :-2]) / (2 * h)
+
+
+def test_projection_removes_divergence():
+    solver = StableFluids(resolution=32, x_range=(-2, 2), y_range=(-2, 2), iterations=5000)
+    x = solver.points[:, 0].reshape(solver.nx, solver.ny)
+    y = solver.points[:, 1].reshape(solver.nx, solver.ny)
+    # the swirl of the stream function cos(pi x / 4) cos(pi y / 4), which
+    # does not cross the walls, plus the gradient of cos(pi x / 2) cos(pi y / 2),
+    # which projection removes
+    swirl_u = -np.pi / 4 * np.cos(np.pi * x / 4) * np.sin(np.pi * y / 4)
+    swirl_v = np.pi / 4 * np.sin(np.pi * x / 4) * np.cos(np.pi * y / 4)
+    solver.u[1:-1, 1:-1] = swirl_u - np.pi / 2 * np.sin(np.pi * x / 2) * np.cos(np.pi * y / 2)
+    solver.v[1:-1, 1:-1] = swirl_v - np.pi / 2 * np.cos(np.pi * x / 2) * np.sin(np.pi * y / 2)
+    solver.set_boundary(1, solver.u)
+    solver.set_boundary(2, solver.v)
+    before = np.abs(divergence(solver)).max()
+
+    solver.project(solver.u, solver.v, solver.p, solver.div)
+
+    # the collocated grid leaves a discretization error, not a divergence
+    # of the size of the gradient's
+    assert np.abs(divergence(solver)).max() < 0.05 * before
+    error = np.hypot(solver.u[1:-1, 1:-1] - swirl_u, solver.v[1:-1, 1:-1] - swirl_v)
+    assert error.max() < 0.05 * np.hypot(swirl_u, swirl_v).max()
+
+
+def test_step_keeps_flow_nearly_divergence_free():
+    def force(points, t):
+        f = np.zeros_like(points)
+        f[:, 0] = np.exp(-(points[:, 0] ** 2 + points[:, 1] ** 2))
+        return f
+
+    solver = StableFluids(resolution=32, x_range=(-2, 2), y_range=(-2, 2), iterations=400, force=force).run(0.5)
+    # the divergence of a field of that size that nothing projected
+    scale = np.abs(solver.u).max() / solver.h
+
+    assert scale > 0
+    assert np.abs(divergence(solver)).max() < 1e-2 * scale
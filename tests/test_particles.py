@@ -0,0 +1,58 @@
+import numpy as np
+
+from particles import ParticleCloud
+
+A = np.array([[0.3, -1, 0], [1, -0.2, 0], [0, 0, 0]])
+
+
+def linear(pos):
+    return A @ pos
+
+
+def test_rk4_step_of_a_linear_field():
+    cloud = ParticleCloud(linear, count=500, warm_up=False)
+    start = cloud.points.copy()
+    dt = 0.1
+
+    cloud.rk4_step(dt)
+
+    # RK4 applies the Taylor polynomial of exp(dt A) up to dt^4 exactly
+    hA = dt * A
+    step = np.eye(3) + hA + hA @ hA / 2 + hA @ hA @ hA / 6 + hA @ hA @ hA @ hA / 24
+    np.testing.assert_allclose(cloud.points, start @ step.T, atol=1e-12)
+    assert cloud.time == dt
+
+
+def test_rk4_follows_a_rotation():
+    cloud = ParticleCloud(lambda pos: np.array([-pos[1], pos[0], 0 * pos[0]]), count=500, warm_up=False)
+    start = cloud.points.copy()
+
+    for _ in range(20):
+        cloud.rk4_step(0.05)
+
+    c, s = np.cos(1.0), np.sin(1.0)
+    expected = start @ np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]]).T
+    np.testing.assert_allclose(cloud.points, expected, atol=1e-6)
+
+
+def test_rk4_samples_time_dependent_fields_at_the_stages():
+    # dx/dt = t integrates to t^2 / 2, exactly for RK4
+    cloud = ParticleCloud(lambda pos, t: np.array([t + 0 * pos[0], 0 * pos[1], 0 * pos[2]]), count=100, warm_up=False)
+    start = cloud.points.copy()
+
+    for _ in range(4):
+        cloud.rk4_step(0.25)
+
+    np.testing.assert_allclose(cloud.points[:, 0], start[:, 0] + 0.5, atol=1e-12)
+    np.testing.assert_allclose(cloud.points[:, 1], start[:, 1])
+
+
+def test_particles_leaving_the_frame_are_reseeded():
+    cloud = ParticleCloud(lambda pos: np.array([5.0, 0, 0]), count=1000, x_range=(-1, 1), y_range=(-1, 1), lifetime=(10, 20), warm_up=False)
+
+    for _ in range(10):
+        cloud.step(0.1)
+
+    assert (np.abs(cloud.points[:, :2]) <= 1).all()
+    assert (cloud.ages < cloud.lifetimes).all()
+    assert ((cloud.rgbas >= 0) & (cloud.rgbas <= 1)).all()
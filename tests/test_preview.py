@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+import fields
+from differential import FieldHeatmap
+from fields import BatchStreamLines, field_ranges
+from fluids import StableFluids
+from preview import DRAFT_SCALES, coarser, fewer, preview_scale
+from streamline_cache import TrajectoryCache
+from surfaces import BatchSurface
+
+
+def swirl(pos):
+    return np.array([np.sin(pos[1]) - 0.3 * pos[0], np.cos(pos[0]) + 0.2 * pos[1], 0 * pos[0]])
+
+
+def plane(u, v):
+    return np.array([u, v, 0 * u])
+
+
+@pytest.mark.parametrize("value, scale", [("", 1), ("0", 1), ("1", 1), ("2", 2), ("4", 4)])
+def test_preview_scale(monkeypatch, value, scale):
+    monkeypatch.setenv("RENDER_PREVIEW", value)
+    assert preview_scale() == scale
+    assert coarser(0.25) == 0.25 * scale
+
+
+def test_preview_scale_must_be_positive(monkeypatch):
+    monkeypatch.setenv("RENDER_PREVIEW", "-2")
+    with pytest.raises(ValueError):
+        preview_scale()
+
+
+@pytest.mark.parametrize("count, expected", [(32, 16), (256, 128), (33, 33), (1, 1)])
+def test_fewer_keeps_counts_the_scale_does_not_divide(monkeypatch, count, expected):
+    monkeypatch.setenv("RENDER_PREVIEW", "2")
+    assert fewer(count) == expected
+
+
+def test_primitives_build_coarser_geometry(monkeypatch):
+    def build():
+        return (
+            field_ranges([-3, 3], [-2, 2, 0.25], None, False),
+            len(BatchSurface(plane, resolution=8).submobjects),
+            FieldHeatmap(swirl, resolution=0.25, x_range=[-2, 2], y_range=[-1, 1]).derivatives.shape,
+            StableFluids(resolution=32).nx,
+        )
+
+    monkeypatch.delenv("RENDER_PREVIEW", raising=False)
+    final = build()
+    monkeypatch.setenv("RENDER_PREVIEW", "2")
+    draft = build()
+
+    # seed and arrow grid steps double, over the same ranges
+    assert [r[2] for r in final[0]] == [0.5, 0.25, 0.5]
+    assert [r[2] for r in draft[0]] == [1.0, 0.5, 1.0]
+    assert [r[1] - r[2] for r in draft[0]] == [r[1] - r[2] for r in final[0]]
+    # resolutions halve: a quarter of the faces, of the heatmap samples
+    assert (final[1], draft[1]) == (64, 16)
+    assert (final[2], draft[2]) == ((9, 17), (5, 9))
+    assert (final[3], draft[3]) == (32, 16)
+
+
+@pytest.mark.parametrize("draft_scale", DRAFT_SCALES)
+def test_final_render_starts_from_the_draft_lines(monkeypatch, tmp_path, draft_scale):
+    options = dict(seeding="even", x_range=[-3, 3], y_range=[-2, 2, 0.5], cache=TrajectoryCache(tmp_path))
+    calls = []
+    trace = fields.evenly_spaced_streamlines
+
+    def traced(*args, initial=(), **kwargs):
+        lines = trace(*args, initial=initial, **kwargs)
+        calls.append((list(initial), lines))
+        return lines
+
+    monkeypatch.setattr(fields, "evenly_spaced_streamlines", traced)
+
+    monkeypatch.setenv("RENDER_PREVIEW", str(draft_scale))
+    draft = BatchStreamLines(swirl, **options)
+    monkeypatch.setenv("RENDER_PREVIEW", "0")
+    final = BatchStreamLines(swirl, **options)
+
+    assert draft.separation == draft_scale * final.separation
+    # the draft traced from nothing, the final render from the draft's lines
+    assert len(calls) == 2 and calls[0][0] == []
+    (_, draft_lines), (initial, final_lines) = calls
+    assert len(initial) == len(draft_lines) > 0
+    for ours, theirs in zip(initial, draft_lines):
+        np.testing.assert_array_equal(ours, theirs)
+    assert len(final_lines) > len(draft_lines) == len(draft.stream_lines)
+    assert len(final.stream_lines) == len(final_lines)
+
+    # stored under the final separation: a third render traces nothing
+    BatchStreamLines(swirl, **options)
+    assert len(calls) == 2
@@ -0,0 +1,73 @@
+from memory_watch import CACHES
+from profiling import watch_segments
+from field_dsl import compile_expression
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def play(self, *animations):
+        self.calls.append("play")
+        # a play whose animation waits, as a nested segment
+        if "nested" in animations:
+            self.wait(0.5)
+
+    def wait(self, duration=1.0):
+        self.calls.append(f"wait {duration}")
+
+
+def segment_log(label):
+    @watch_segments
+    class Watcher:
+        on = True
+
+        def _watching(self):
+            return self.on
+
+        def _begin_segment(self):
+            return len(self.calls)
+
+        def _end_segment(self, kind, name, begun):
+            getattr(self, label).append((kind, name, self.calls[begun:]))
+
+    return Watcher
+
+
+First, Second = segment_log("first"), segment_log("second")
+
+
+class Scene(First, Second, Recorder):
+    def __init__(self):
+        super().__init__()
+        self.first, self.second = [], []
+
+
+def test_stacked_watchers_each_see_top_level_segments_once():
+    scene = Scene()
+    scene.play("nested")
+    scene.wait()
+    scene.wait(2)
+    expected = [
+        ("play", "str", ["play", "wait 0.5"]),
+        ("wait", "default", ["wait 1.0"]),
+        ("wait", "2s", ["wait 2"]),
+    ]
+    assert scene.first == expected
+    assert scene.second == expected
+
+
+def test_watcher_off_leaves_calls_alone():
+    scene = Scene()
+    scene.on = False
+    scene.play("nested")
+    assert scene.calls == ["play", "wait 0.5"]
+    assert scene.first == scene.second == []
+
+
+def test_memory_budget_can_drop_compiled_expressions():
+    size, clear = CACHES["compiled_expressions"]
+    compile_expression("(y, -x)")
+    assert size(None) > 0
+    clear(None)
+    assert size(None) == 0
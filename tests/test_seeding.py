@@ -0,0 +1,56 @@
+import numpy as np
+
+from fields import SpatialHash, evenly_spaced_streamlines
+
+LOWER, UPPER = (-4, -3), (4, 3)
+SEPARATION = 0.5
+
+
+def rotation(p):
+    return np.array([-p[1], p[0], 0.0])
+
+
+def test_spatial_hash_matches_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-3, 3, (500, 2))
+    grid = SpatialHash(0.4)
+    for k, p in enumerate(points):
+        grid.add(p, k)
+    for query in rng.uniform(-3, 3, (200, 2)):
+        distances = np.linalg.norm(points - query, axis=1)
+        assert grid.near(query, 0.3) == bool((distances < 0.3).any())
+        assert grid.near(query, 0.3, ignore=lambda k: k % 2) == bool((distances[::2] < 0.3).any())
+
+
+def test_lines_keep_their_distance():
+    test_ratio = 0.5
+    lines = evenly_spaced_streamlines(rotation, LOWER, UPPER, SEPARATION, test_ratio)
+
+    assert len(lines) > 5
+    for a in range(len(lines)):
+        for b in range(a):
+            distances = np.linalg.norm(lines[a][:, None, :2] - lines[b][None, :, :2], axis=2)
+            assert distances.min() >= test_ratio * SEPARATION - 1e-9
+
+
+def test_lines_follow_the_field():
+    lines = evenly_spaced_streamlines(rotation, LOWER, UPPER, SEPARATION)
+
+    for line in lines:
+        # circles around the origin, up to the error of the midpoint steps,
+        # which grows on the smallest circles
+        radius = np.linalg.norm(line[:, :2], axis=1)
+        if radius.mean() > SEPARATION:
+            assert np.ptp(radius) < 1e-2 * radius.mean()
+
+
+def test_lines_fill_the_box():
+    uniform = lambda p: np.array([1.0, 0.0, 0.0])
+    lines = evenly_spaced_streamlines(uniform, LOWER, UPPER, SEPARATION)
+
+    # horizontal lines, one separation apart
+    heights = np.sort([line[0, 1] for line in lines])
+    for line in lines:
+        np.testing.assert_allclose(line[:, 1], line[0, 1])
+    np.testing.assert_allclose(np.diff(heights), SEPARATION)
+    assert heights[0] - LOWER[1] <= SEPARATION and UPPER[1] - heights[-1] <= SEPARATION
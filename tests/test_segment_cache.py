@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pytest
+
+from manim import RIGHT, FadeIn, Scene, Square, VMobject, tempconfig
+
+from segment_cache import SegmentCache, evict, segment_fingerprint
+
+
+class CachedScene(SegmentCache, Scene):
+    pass
+
+
+@pytest.fixture
+def scene(tmp_path):
+    with tempconfig({"media_dir": str(tmp_path)}):
+        yield CachedScene()
+
+
+def fingerprint(scene, animations, mobjects):
+    return segment_fingerprint(scene, scene.renderer.camera, animations, mobjects)
+
+
+def test_fingerprint_is_stable(scene):
+    square = Square()
+    first = fingerprint(scene, [FadeIn(square)], [square])
+    assert fingerprint(scene, [FadeIn(square)], [square]) == first
+    # the same state in another object
+    copy = square.copy()
+    assert fingerprint(scene, [FadeIn(copy)], [copy]) == first
+
+
+def test_fingerprint_follows_mobjects_and_animation_parameters(scene):
+    square = Square()
+    base = fingerprint(scene, [FadeIn(square)], [square])
+
+    assert fingerprint(scene, [FadeIn(square, run_time=2)], [square]) != base
+    assert fingerprint(scene, [FadeIn(square, shift=RIGHT)], [square]) != base
+    moved = square.copy().shift(1e-6 * RIGHT)
+    assert fingerprint(scene, [FadeIn(moved)], [moved]) != base
+    recolored = square.copy().set_fill(opacity=0.5)
+    assert fingerprint(scene, [FadeIn(recolored)], [recolored]) != base
+
+
+def test_fingerprint_sees_the_middle_of_large_arrays(scene):
+    # manim hashes arrays of more than 1000 values through their truncated repr
+    curve = VMobject().set_points(np.linspace(0, 1, 3 * 4000).reshape(-1, 3))
+    base = fingerprint(scene, [], [curve])
+    curve.points[2000, 1] += 1e-9
+    assert fingerprint(scene, [], [curve]) != base
+
+
+def test_fingerprint_follows_updater_code(scene):
+    square = Square()
+    square.add_updater(lambda m, dt: m.rotate(dt))
+    base = fingerprint(scene, [], [square])
+    square.clear_updaters().add_updater(lambda m, dt: m.rotate(2 * dt))
+    assert fingerprint(scene, [], [square]) != base
+
+
+class ReplayScene(CachedScene):
+    """Three plays, the second one found in the cache."""
+
+    def construct(self):
+        writer = self.renderer.file_writer
+        writer.partial_movie_directory.mkdir(parents=True, exist_ok=True)
+        (writer.partial_movie_directory / "cached.mp4").write_bytes(b"movie")
+        os.utime(writer.partial_movie_directory / "cached.mp4", (0, 0))
+        self.reused = []
+        for hash_invocation in ("fresh", "cached", "fresh_again"):
+            writer.is_already_cached(hash_invocation)
+            self.reused.append(self.segment_reused())
+            self.renderer.num_plays += 1
+        self.reused.append(self.segment_reused())
+
+
+def test_a_hit_is_scoped_to_its_play(tmp_path, monkeypatch):
+    # SegmentCache.render around a bare construct, without manim's file output
+    monkeypatch.setattr(Scene, "render", lambda scene, preview=False: scene.construct())
+    with tempconfig({"media_dir": str(tmp_path)}):
+        scene = ReplayScene()
+        scene.render()
+
+    assert scene.reused == [False, True, False, False]
+    # a hit refreshes the LRU clock
+    assert (scene.renderer.file_writer.partial_movie_directory / "cached.mp4").stat().st_mtime > 0
+
+
+def partial_movies(directory, sizes):
+    """Partial movies of two scenes, the first one the oldest."""
+    paths = []
+    for i, size in enumerate(sizes):
+        path = directory / f"Scene{i % 2}" / f"segment{i}.mp4"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(bytes(size))
+        os.utime(path, (i, i))
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("max_bytes", [0, 250, 600, 1000, 10_000])
+def test_evict_keeps_the_most_recent_within_the_limit(tmp_path, max_bytes):
+    sizes = [100, 200, 300, 400]
+    paths = partial_movies(tmp_path, sizes)
+    other = tmp_path / "Scene0" / "partial_movie_file_list.txt"
+    other.write_bytes(bytes(5000))
+
+    evict(tmp_path, max_bytes)
+
+    kept = [path.exists() for path in paths]
+    assert sum(size for size, k in zip(sizes, kept) if k) <= max_bytes
+    # the oldest go first: what is kept is a suffix of the list
+    assert kept == sorted(kept)
+    # and no more than needed
+    first = kept.index(True) if True in kept else len(kept)
+    assert first == 0 or sum(sizes[first - 1 :]) > max_bytes
+    assert other.exists()
+
+
+def test_evict_follows_use_not_creation(tmp_path):
+    paths = partial_movies(tmp_path, [100, 100, 100])
+    # a hit on the oldest one, as SegmentCache.render records it
+    os.utime(paths[0], (10, 10))
+
+    evict(tmp_path, 200)
+
+    assert [path.exists() for path in paths] == [True, False, True]
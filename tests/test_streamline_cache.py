@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pytest
+
+from streamline_cache import TrajectoryCache
+
+
+@pytest.mark.parametrize("lengths", [[], [1], [4, 1, 7], [0, 3]])
+def test_round_trip(tmp_path, lengths):
+    cache = TrajectoryCache(tmp_path)
+    rng = np.random.default_rng(0)
+    trajectories = [rng.standard_normal((n, 3)) for n in lengths]
+
+    cache.store("entry", trajectories, 1.5)
+    loaded, seconds = cache.load("entry")
+
+    assert seconds == 1.5
+    assert len(loaded) == len(trajectories)
+    for a, b in zip(loaded, trajectories):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_missing_or_broken_entries_are_misses(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    assert cache.load("missing") is None
+    cache.path("broken").write_bytes(b"not an npz file")
+    assert cache.load("broken") is None
+
+
+def test_get_or_compute_counts_hits_and_misses(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [np.zeros((2, 3))]
+
+    for _ in range(3):
+        result = cache.get_or_compute("entry", compute)
+        np.testing.assert_array_equal(result[0], np.zeros((2, 3)))
+
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+    # summed from stats.jsonl, as other processes would see them
+    stats = TrajectoryCache(tmp_path).stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+
+def test_key_follows_the_field_and_parameters(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    seeds = np.zeros((4, 3))
+
+    def rotation(speed):
+        return lambda pos: np.array([-speed * pos[1], speed * pos[0], 0])
+
+    key = cache.key(rotation(1), seeds, dt=0.05)
+    assert cache.key(rotation(1), seeds, dt=0.05) == key
+    assert cache.key(rotation(2), seeds, dt=0.05) != key
+    assert cache.key(rotation(1), seeds, dt=0.1) != key
+    assert cache.key(rotation(1), seeds + 1, dt=0.05) != key
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    trajectories = [np.random.default_rng(0).standard_normal((1000, 3))]
+    for i, name in enumerate(["old", "used", "new"]):
+        cache.store(name, trajectories, 0.0)
+        os.utime(cache.path(name), (i, i))
+    size = cache.path("old").stat().st_size
+    # a hit refreshes an entry
+    cache.load("used")
+
+    cache.max_bytes = 2.5 * size
+    cache.evict()
+
+    assert not cache.path("old").exists()
+    assert cache.path("used").exists() and cache.path("new").exists()
+
+
+SPEED = 1.0
+
+
+def test_key_follows_the_globals_the_field_reads(tmp_path):
+    global SPEED
+    cache = TrajectoryCache(tmp_path)
+    seeds = np.zeros((4, 3))
+    field = lambda pos: SPEED * np.array([-pos[1], pos[0], 0])
+    nested = lambda pos: (lambda p: SPEED * p)(pos)
+
+    keys = cache.key(field, seeds), cache.key(nested, seeds)
+    SPEED = 2.0
+    try:
+        assert cache.key(field, seeds) != keys[0]
+        assert cache.key(nested, seeds) != keys[1]
+        calls = []
+        for speed in (1.0, 2.0):
+            SPEED = speed
+            cache.get_or_compute(cache.key(field, seeds), lambda: calls.append(SPEED) or [np.zeros((1, 3))])
+        assert calls == [1.0, 2.0]
+    finally:
+        SPEED = 1.0
+
+
+def test_fields_that_cannot_be_hashed_are_not_cached(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    # no __dict__ and no slots: only its address would tell two apart
+    rng = np.random.default_rng(0)
+    field = lambda pos: pos + rng.normal(size=3)
+    calls = []
+
+    assert cache.key(field, np.zeros((4, 3))) is None
+    for _ in range(2):
+        cache.get_or_compute(cache.key(field, np.zeros((4, 3))), lambda: calls.append(1) or [])
+
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,94 @@
+import numpy as np
+from manim import BLUE, GREEN, GREEN_A, GREEN_B, GREEN_C, RED, RIGHT, Surface, ThreeDAxes
+
+from surfaces import BatchSurface, bilinear_error, refine_cells
+
+
+def landscape(u, v):
+    # Mountain's surface, without its axes
+    return np.array([u, v, np.sin(u) * np.cos(v)])
+
+
+def uv_area(face):
+    return (face.u2 - face.u1) * (face.v2 - face.v1)
+
+
+def test_matches_surface():
+    options = dict(u_range=[0, 5], v_range=[0, 5], resolution=(8, 6))
+    axes = ThreeDAxes(x_range=(0, 5, 1), y_range=(0, 5, 1), z_range=(-1, 1, 0.5))
+    colorscale = [(GREEN_A, -0.5), (GREEN_B, 0), (GREEN_C, 0.5)]
+    batch = BatchSurface(landscape, **options).set_fill_by_value(axes=axes, colorscale=colorscale)
+    surface = Surface(landscape, **options).set_fill_by_value(axes=axes, colorscale=colorscale)
+
+    batch_faces = batch.family_members_with_points()
+    surface_faces = surface.family_members_with_points()
+    assert len(batch_faces) == len(surface_faces) == 48
+    for ours, theirs in zip(batch_faces, surface_faces):
+        np.testing.assert_allclose(ours.points, theirs.points, atol=1e-9)
+        np.testing.assert_allclose(ours.fill_rgbas, theirs.fill_rgbas, atol=1e-9)
+
+
+def test_faces_have_the_state_of_surface_faces():
+    options = dict(u_range=[0, 5], v_range=[0, 5], resolution=6, checkerboard_colors=[RED, GREEN, BLUE], fill_opacity=0.7)
+    batch = BatchSurface(landscape, **options)
+    surface = Surface(landscape, **options)
+
+    for ours, theirs in zip(batch.submobjects, surface.submobjects, strict=True):
+        assert type(ours) is type(theirs)
+        assert vars(ours).keys() == vars(theirs).keys()
+        for key, value in vars(theirs).items():
+            if isinstance(value, np.ndarray):
+                np.testing.assert_allclose(getattr(ours, key), value, atol=1e-9, err_msg=key)
+            elif key not in ("submobjects", "updaters"):
+                assert getattr(ours, key) == value, key
+
+    batch.set_fill_by_checkerboard(RED, BLUE, opacity=0.3)
+    surface.set_fill_by_checkerboard(RED, BLUE, opacity=0.3)
+    for ours, theirs in zip(batch.submobjects, surface.submobjects):
+        np.testing.assert_allclose(ours.fill_rgbas, theirs.fill_rgbas, atol=1e-9)
+        assert ours.fill_opacity == theirs.fill_opacity
+
+
+def test_faces_built_in_bulk_are_independent():
+    faces = BatchSurface(landscape, u_range=[0, 5], v_range=[0, 5], resolution=4).submobjects
+    before = [face.points.copy() for face in faces]
+
+    faces[1].shift(RIGHT).set_fill(RED, opacity=0.2)
+    faces[2].add_updater(lambda m, dt: None)
+
+    for k, face in enumerate(faces):
+        if k != 1:
+            np.testing.assert_array_equal(face.points, before[k])
+            assert face.fill_opacity == 1.0
+    assert [len(face.updaters) for face in faces[:4]] == [0, 0, 1, 0]
+
+
+def test_flat_surface_keeps_base_cells():
+    plane = BatchSurface(
+        lambda u, v: np.array([u, v, 0 * u]),
+        u_range=[0, 5],
+        v_range=[0, 5],
+        resolution=64,
+        base_resolution=8,
+        tolerance=0.01,
+    )
+
+    assert len(plane.family_members_with_points()) == 64
+
+
+def test_refinement_covers_the_surface_within_tolerance():
+    tolerance = 0.02
+    surface = BatchSurface(landscape, u_range=[0, 5], v_range=[0, 5], resolution=64, base_resolution=8, tolerance=tolerance)
+    faces = surface.family_members_with_points()
+
+    assert 64 < len(faces) < 64 * 64
+    assert np.isclose(sum(uv_area(face) for face in faces), 25)
+    for face in faces:
+        # every face starts at its (u1, v1) corner, on the surface
+        np.testing.assert_allclose(face.points[0], landscape(face.u1, face.v1), atol=1e-12)
+
+    # cells left coarse are within tolerance of their bilinear patch
+    for i, j, size in refine_cells(surface.grid_points, 8, tolerance):
+        if size > 1:
+            window = surface.grid_points[i : i + size + 1, j : j + size + 1]
+            assert bilinear_error(window, size).max() <= tolerance
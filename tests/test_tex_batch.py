@@ -0,0 +1,94 @@
+import subprocess
+import types
+
+import pytest
+
+from manim import MathTex, Tex, tempconfig
+
+import tex_batch
+
+SCENE_SOURCE = '''
+from manim import MathTex, Tex
+from field_dsl import expression_field
+
+title = Tex("Campos vetoriais")
+sum_ = MathTex("x^2", "+ y")
+dynamic = MathTex(f"{value}")
+colored = MathTex("a + b", tex_to_color_map={"a": RED})
+field = expression_field("(-y, x)")
+broken = expression_field("(import, x)")
+'''
+
+
+@pytest.fixture
+def package(tmp_path):
+    (tmp_path / "scene.py").write_text(SCENE_SOURCE, encoding="utf-8")
+    # read from disk, never imported
+    return types.SimpleNamespace(__path__=[str(tmp_path)])
+
+
+def test_collect_tex_finds_constant_calls(package):
+    found = tex_batch.collect_tex(package)
+
+    assert (Tex, ("Campos vetoriais",)) in found
+    assert (MathTex, ("x^2", "+ y")) in found
+    # the label of the expression field, not the dynamic, colored or broken calls
+    assert len(found) == 3
+    assert found[2][0] is MathTex and "F(x, y)" in found[2][1][0]
+
+
+def test_tex_expressions_cover_the_joined_string_and_parts():
+    assert tex_batch.tex_expressions(MathTex, ("x^2", "+ y")) == [
+        ("x^2 + y", "align*"),
+        ("x^2", "align*"),
+        ("+ y", "align*"),
+    ]
+    assert tex_batch.tex_expressions(Tex, ("Olá",))[0] == ("Olá", "center")
+
+
+def fake_tools(dvisvgm_returncode):
+    """A ``subprocess.run`` where latex succeeds and dvisvgm writes one SVG per page."""
+
+    def run(args, **kwargs):
+        if args[0] != "dvisvgm":
+            return subprocess.CompletedProcess(args, 0)
+        output = next(a for a in args if a.startswith("--output="))[len("--output=") :]
+        document = (tex_batch.Path(output).parent / "batch.tex").read_text(encoding="utf-8")
+        # a failing run may still leave some pages behind
+        for page in range(1, document.count(rf"\begin{{{tex_batch._PAGE_ENV}}}") + 1):
+            tex_batch.Path(output.replace("%p", str(page))).write_text("<svg/>")
+        return subprocess.CompletedProcess(args, dvisvgm_returncode)
+
+    return run
+
+
+def cached_svgs(tmp_path):
+    return sorted(p.name for p in (tmp_path / "Tex").glob("*.svg"))
+
+
+def test_failed_dvisvgm_leaves_the_cache_untouched(tmp_path, monkeypatch):
+    monkeypatch.setattr(tex_batch.subprocess, "run", fake_tools(dvisvgm_returncode=1))
+    jobs = tex_batch.tex_expressions(MathTex, ("x^2", "+ y"))
+    with tempconfig({"media_dir": str(tmp_path)}):
+        assert tex_batch.compile_batch(jobs) == 0
+        assert cached_svgs(tmp_path) == []
+
+
+def test_missing_tools_fall_back(tmp_path, monkeypatch):
+    def run(args, **kwargs):
+        raise FileNotFoundError(args[0])
+
+    monkeypatch.setattr(tex_batch.subprocess, "run", run)
+    with tempconfig({"media_dir": str(tmp_path)}):
+        assert tex_batch.compile_batch([("x", "align*")]) == 0
+        assert cached_svgs(tmp_path) == []
+
+
+def test_batch_fills_the_files_manim_looks_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(tex_batch.subprocess, "run", fake_tools(dvisvgm_returncode=0))
+    jobs = tex_batch.tex_expressions(MathTex, ("x^2", "+ y"))
+    with tempconfig({"media_dir": str(tmp_path)}):
+        assert tex_batch.compile_batch(jobs) == 3
+        assert all(tex_batch.svg_path(*job).exists() for job in jobs)
+        # cached now: nothing left to compile
+        assert tex_batch.compile_batch(jobs) == 0
@@ -0,0 +1,75 @@
+from collections import Counter
+
+import pytest
+
+from manim import Animation, Mobject, Scene, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from time_slices import TimeSlices, count_frames, slice_bounds
+
+# at the 15 fps of low quality: play 15 frames, frozen wait 7, play with an
+# updater 30, wait with an updater 15
+FRAMES_PER_SEGMENT = [15, 7, 30, 15]
+
+
+class SmallScene(TimeSlices, Scene):
+    def construct(self):
+        # not drawn: the frames are counted, never rasterized
+        mob = Mobject()
+        self.add(mob)
+        self.play(Animation(mob, run_time=1))
+        self.wait(0.5)
+        mob.add_updater(lambda m, dt: None)
+        self.play(Animation(mob, run_time=2))
+        self.wait(1)
+
+
+def frames_by_segment(monkeypatch, tmp_path, frame_slice=None):
+    """Frames written per play/wait, by number, for a render of ``frame_slice``."""
+    written = Counter()
+
+    def add_frame(renderer, frame, num_frames=1):
+        written[renderer.num_plays] += num_frames
+
+    monkeypatch.setattr(CairoRenderer, "add_frame", add_frame)
+    with tempconfig({"quality": "low_quality", "media_dir": str(tmp_path), "write_to_movie": False, "progress_bar": "none"}):
+        scene = SmallScene()
+        scene.frame_slice = frame_slice
+        scene.render()
+    return dict(written)
+
+
+def test_count_frames(tmp_path):
+    assert count_frames(__name__, "SmallScene", "low_quality", str(tmp_path)) == sum(FRAMES_PER_SEGMENT)
+
+
+@pytest.mark.parametrize("slices", [1, 2, 3, 5, 8])
+def test_slices_add_up_to_the_full_render(monkeypatch, tmp_path, slices):
+    total = count_frames(__name__, "SmallScene", "low_quality", str(tmp_path))
+    bounds = slice_bounds(total, slices)
+    assert bounds[0][0] == 0 and bounds[-1][1] == total
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+
+    combined = Counter()
+    for frame_slice in bounds:
+        written = frames_by_segment(monkeypatch, tmp_path, frame_slice)
+        assert sum(written.values()) == frame_slice[1] - frame_slice[0]
+        combined.update(written)
+    assert dict(combined) == frames_by_segment(monkeypatch, tmp_path) == dict(enumerate(FRAMES_PER_SEGMENT))
+
+
+@pytest.mark.parametrize(
+    "frame_slice, expected",
+    [
+        # inside the first play
+        ((3, 9), {0: 6}),
+        # the end of the first play, the frozen wait, the start of the second play
+        ((10, 40), {0: 5, 1: 7, 2: 18}),
+        # exactly the frozen wait
+        ((15, 22), {1: 7}),
+        # the end of the second play and the last wait
+        ((50, 67), {2: 2, 3: 15}),
+    ],
+)
+def test_slice_boundaries_land_in_their_segments(monkeypatch, tmp_path, frame_slice, expected):
+    assert frames_by_segment(monkeypatch, tmp_path, frame_slice) == expected
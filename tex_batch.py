@@ -0,0 +1,203 @@
+"""Compile every MathTex/Tex of a scene module in a single LaTeX run.
+
+manim compiles each TeX string with its own ``latex`` and ``dvisvgm`` call and
+keeps the SVG in ``media/Tex`` under a hash of the full TeX document.  This
+module finds the ``MathTex``/``Tex`` calls of a module with constant strings,
+works out the exact expressions manim will ask for (the joined string and
+every part of a multi-part ``MathTex``), typesets the missing ones as pages of
+one document and splits it with one ``dvisvgm`` call into the files manim
+looks up.  The cache is the same content-addressed directory manim uses, so
+it is shared by every scene and every render worker using that media dir::
+
+    python tex_batch.py scenes
+"""
+
+import argparse
+import ast
+import importlib
+import inspect
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from manim import MathTex, Tex, config, logger
+from manim.utils.tex_file_writing import make_tex_compilation_command, tex_hash
+
+
+# keyword arguments that change the compiled expression; calls using them
+# are left to manim
+_EXPRESSION_KWARGS = {"arg_separator", "substrings_to_isolate", "tex_to_color_map", "tex_environment", "tex_template"}
+_PAGE_ENV = "manimbatchpage"
+
+
+def module_sources(module):
+    """Source of ``module``, or of every module of a package, without importing them."""
+    if hasattr(module, "__path__"):
+        return [path.read_text(encoding="utf-8") for d in module.__path__ for path in sorted(Path(d).glob("*.py"))]
+    return [inspect.getsource(module)]
+
+
+def collect_tex(module):
+    """``(cls, strings)`` for every MathTex/Tex call with constant arguments.
+
+    The default label (``.tex()``) of every ``expression_field`` with a
+    constant expression is included too.
+    """
+    from field_dsl import compile_expression
+
+    found = []
+    nodes = (node for source in module_sources(module) for node in ast.walk(ast.parse(source)))
+    for node in nodes:
+        if not isinstance(node, ast.Call):
+            continue
+        name = getattr(node.func, "id", None) or getattr(node.func, "attr", None)
+        if name == "expression_field" and len(node.args) == 1 and isinstance(node.args[0], ast.Constant):
+            try:
+                found.append((MathTex, (compile_expression(node.args[0].value).label(),)))
+            except (TypeError, ValueError):
+                # reported when the scene builds the field
+                pass
+            continue
+        if name not in ("MathTex", "Tex") or not node.args:
+            continue
+        if not all(isinstance(a, ast.Constant) and isinstance(a.value, str) for a in node.args):
+            continue
+        if any(k.arg in _EXPRESSION_KWARGS or k.arg is None for k in node.keywords):
+            continue
+        found.append((MathTex if name == "MathTex" else Tex, tuple(a.value for a in node.args)))
+    return found
+
+
+def tex_expressions(cls, strings):
+    """The ``(expression, environment)`` pairs manim compiles for ``cls(*strings)``."""
+    # reuse manim's own string handling without running __init__
+    mob = cls.__new__(cls)
+    mob.substrings_to_isolate = []
+    mob.tex_to_color_map = {}
+    mob.brace_notation_split_occurred = False
+    environment = "align*" if cls is MathTex else "center"
+    separator = " " if cls is MathTex else ""
+    parts = mob._break_up_tex_strings(strings)
+    expressions = [mob._get_modified_expression(separator.join(parts))]
+    expressions += [mob._get_modified_expression(part) for part in parts]
+    return [(e, environment) for e in expressions]
+
+
+def svg_path(expression, environment, tex_template=None):
+    tex_template = tex_template or config.tex_template
+    code = tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return config.get_dir("tex_dir") / (tex_hash(code) + ".svg")
+
+
+def compile_batch(jobs, tex_template=None):
+    """Typeset the jobs whose SVG is not cached yet; returns how many were added.
+
+    Anything that goes wrong leaves the cache untouched, and manim then
+    compiles (and reports errors for) those strings one by one as usual.
+    """
+    tex_template = tex_template or config.tex_template
+    missing = {}
+    for expression, environment in jobs:
+        target = svg_path(expression, environment, tex_template)
+        if not target.exists():
+            missing[target] = (expression, environment)
+    if not missing:
+        return 0
+
+    body_prefix, found, suffix = tex_template.body.partition(tex_template.placeholder_text)
+    documentclass = tex_template.documentclass
+    if not (
+        found
+        and documentclass.startswith(r"\documentclass[")
+        and documentclass.endswith("]{standalone}")
+        and documentclass in body_prefix
+    ):
+        return 0
+    # standalone's multi mode makes one cropped page per environment
+    options = documentclass[len(r"\documentclass[") : -len("]{standalone}")]
+    prefix = body_prefix.replace(
+        documentclass,
+        rf"\documentclass[{options},multi={_PAGE_ENV}]{{standalone}}"
+        + "\n"
+        + rf"\newenvironment{{{_PAGE_ENV}}}{{}}{{}}",
+    )
+    pages = []
+    for expression, environment in missing.values():
+        code = tex_template.get_texcode_for_expression_in_env(expression, environment)
+        pages.append(rf"\begin{{{_PAGE_ENV}}}" + code[len(body_prefix) : len(code) - len(suffix)] + rf"\end{{{_PAGE_ENV}}}")
+    document = prefix + "\n".join(pages) + suffix
+
+    tex_dir = config.get_dir("tex_dir")
+    tex_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=tex_dir) as work:
+        work = Path(work)
+        tex_file = work / "batch.tex"
+        tex_file.write_text(document, encoding="utf-8")
+        command = make_tex_compilation_command(
+            tex_template.tex_compiler, tex_template.output_format, tex_file, work
+        )
+        dvi_file = tex_file.with_suffix(tex_template.output_format)
+        dvisvgm = [
+            "dvisvgm",
+            *(["--pdf"] if tex_template.output_format == ".pdf" else []),
+            "--page=1-",
+            "--no-fonts",
+            "--verbosity=0",
+            f"--output={(work / '%p.svg').as_posix()}",
+            dvi_file.as_posix(),
+        ]
+        for step, args in (("TeX compilation", command), ("dvisvgm conversion", dvisvgm)):
+            try:
+                failed = subprocess.run(args, stdout=subprocess.DEVNULL).returncode != 0
+            except OSError:  # the program is not installed
+                failed = True
+            if failed:
+                logger.warning(f"Batched {step} failed, falling back to one run per string")
+                return 0
+        svgs = sorted(work.glob("*.svg"), key=lambda p: int(p.stem))
+        if len(svgs) != len(missing):
+            logger.warning(
+                f"Batched TeX produced {len(svgs)} pages for {len(missing)} strings, "
+                "falling back to one run per string"
+            )
+            return 0
+        for svg, target in zip(svgs, missing):
+            # atomic, other workers may be looking for the same file
+            os.replace(svg, target)
+    return len(missing)
+
+
+def precompile_module(module):
+    jobs = dict.fromkeys(job for cls, strings in collect_tex(module) for job in tex_expressions(cls, strings))
+    added = compile_batch(list(jobs))
+    if added:
+        logger.info(f"Compiled {added} TeX strings in one batch")
+    return added
+
+
+_precompiled = set()
+
+
+class PrecompileTex:
+    """Scene mixin that runs ``precompile_module`` once per module and process."""
+
+    def setup(self):
+        super().setup()
+        module = sys.modules[type(self).__module__]
+        key = (module.__name__, str(config.get_dir("tex_dir")))
+        if key not in _precompiled:
+            _precompiled.add(key)
+            precompile_module(module)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompile the TeX strings of a scene module")
+    parser.add_argument("module", nargs="?", default="scenes")
+    parser.add_argument("--media-dir", default="./media")
+    args = parser.parse_args()
+
+    config.media_dir = args.media_dir
+    module = importlib.import_module(args.module)
+    print(f"{precompile_module(module)} TeX strings compiled")
@@ -0,0 +1,120 @@
+"""Persistent cache of laid-out ``Text`` (and so ``Paragraph``) mobjects.
+
+manim keeps the SVG Pango writes for a text in ``media/texts``, but every
+render still parses that SVG with svgelements, builds the glyph outlines and
+closes every glyph curve point by point in Python.  ``enable()`` (called by
+every scene of the ``scenes`` package in ``setup``) wraps ``Text.__init__``:
+a text is looked up by a digest of its string and
+every constructor argument (font, weight, slant, size, colors...), the manim
+version and the renderer, and a hit restores the finished mobject, with its
+glyph point arrays, from a pickle instead of going through Pango and the SVG
+parser.  ``Paragraph`` lays its lines out as one ``Text`` and is covered by
+the same entries.  ``TEXT_CACHE=0`` leaves ``Text`` alone.
+
+The directory (``media/cache/text``, or ``TEXT_CACHE_DIR``) is written
+atomically and shared by every render worker, and every hit or miss is
+counted in ``stats.jsonl``::
+
+    python text_cache.py            # print hit/miss counters
+    python text_cache.py --clear    # drop every entry, e.g. after changing fonts
+"""
+
+import argparse
+import os
+import pickle
+from pathlib import Path
+
+from manim import Text, __version__ as manim_version, config, logger
+
+from segment_cache import StateHasher
+from streamline_cache import DiskCache
+
+TEXT_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class TextCache(DiskCache):
+    suffix = ".pickle"
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(
+            directory or os.environ.get("TEXT_CACHE_DIR") or Path("media") / "cache" / "text",
+            max_bytes,
+        )
+
+    def key(self, cls, args, kwargs):
+        hasher = StateHasher()
+        hasher.tag("text", TEXT_CACHE_VERSION, manim_version, str(config.renderer), cls.__module__, cls.__qualname__)
+        hasher.update(args)
+        hasher.update(kwargs)
+        # None: an argument only hashable by type, built without the cache
+        return hasher.hexdigest() if hasher.stable else None
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                mobject, seconds = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            return None
+        try:
+            # mtime is the LRU clock
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return mobject, seconds
+
+    def store(self, key, mobject, seconds):
+        try:
+            data = pickle.dumps((mobject, seconds), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            # an argument that cannot be pickled, such as a lambda in a color map
+            logger.debug(f"text cache: not storing {mobject!r}: {e}")
+            return
+        self.write(key, lambda f: f.write(data))
+
+
+default_cache = TextCache()
+
+_text_init = Text.__init__
+
+
+def _cached_text_init(self, *args, **kwargs):
+    cls = type(self)
+    built = default_cache.get_or_compute(default_cache.key(cls, args, kwargs), lambda: _build_text(cls, args, kwargs))
+    self.__dict__.update(built.__dict__)
+
+
+def _build_text(cls, args, kwargs):
+    mob = cls.__new__(cls)
+    _text_init(mob, *args, **kwargs)
+    return mob
+
+
+def enable():
+    """Build ``Text`` through the cache, unless ``TEXT_CACHE`` is 0; True when on."""
+    if os.environ.get("TEXT_CACHE", "") == "0":
+        return False
+    Text.__init__ = _cached_text_init
+    return True
+
+
+def disable():
+    Text.__init__ = _text_init
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Text mobject cache")
+    parser.add_argument("--dir", default=None)
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+
+    cache = TextCache(args.dir)
+    if args.clear:
+        cache.clear()
+    s = cache.stats()
+    total = s["hits"] + s["misses"]
+    rate = s["hits"] / total if total else 0.0
+    print(f"entries: {s['entries']} ({s['bytes'] / 1e6:.1f} MB) in {cache.directory}")
+    print(f"hits: {s['hits']}  misses: {s['misses']}  hit rate: {rate:.0%}")
+    print(f"layout time saved: {s['saved_seconds']:.2f}s (spent: {s['compute_seconds']:.2f}s)")
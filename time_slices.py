@@ -0,0 +1,199 @@
+"""Render one scene as time slices in parallel processes.
+
+    python time_slices.py Mountain -n 8 -q h
+    python time_slices.py Axes3DExplanation -n 4 -o axes.mp4
+
+``render_all.py`` renders scenes side by side, which does not help a scene
+like ``Mountain`` that is one long camera rotation.  Here every worker builds
+the whole scene and renders only the frames ``[start, end)`` of its slice:
+
+- animations entirely before the slice are skipped the way manim skips
+  them with ``-n``, their partial movies never opened;
+- frames before the slice inside a partially covered animation are stepped
+  through with the normal ``1 / frame_rate`` updates but not rasterized, so
+  camera rotations, streamline flows and solvers reach the slice in exactly
+  the state a full render would have;
+- the worker stops at the first animation after its slice.
+
+A first pass with every animation skipped counts the frames of the scene.
+The slice movies are then joined without re-encoding (see
+``render_all.concat_videos``).  Scenes must build the same mobjects in every
+process, which holds for every scene of the ``scenes`` package: the only randomness is
+seeded.  ``wait_until`` conditions are not supported, since their length is
+unknown until they run.
+"""
+
+import argparse
+import importlib
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from manim import config, tempconfig
+from manim.utils.exceptions import EndSceneEarlyException
+
+from render_all import QUALITIES, concat_videos, render_scene
+from tex_batch import precompile_module
+
+
+class TimeSlices:
+    """Scene mixin that renders only the frames of ``frame_slice``.
+
+    ``frame_slice`` is ``(start, end)`` in frames from the beginning of the
+    scene; left as None the scene renders as usual.  ``frames_played``
+    counts the frames of the animations played so far in either case.
+    """
+
+    frame_slice = None
+    frames_played = 0
+
+    def render(self, preview=False):
+        if self.frame_slice is not None:
+            self.frame_index = 0
+            self._slice_frames(self.renderer)
+        return super().render(preview)
+
+    def _slice_frames(self, renderer):
+        start, end = self.frame_slice
+        add_frame = renderer.add_frame
+        scene = self
+
+        def sliced_add_frame(frame, num_frames=1):
+            first = scene.frame_index
+            scene.frame_index += num_frames
+            kept = max(0, min(end, first + num_frames) - max(start, first))
+            # skipped animations already advanced renderer.time in play()
+            if not renderer.skip_animations:
+                renderer.time += (num_frames - kept) / config.frame_rate
+            if kept:
+                add_frame(frame, num_frames=kept)
+
+        renderer.add_frame = sliced_add_frame
+
+    def play_frame_count(self):
+        """Frames the animations being played will add, as the renderer counts them."""
+        if self.is_current_animation_frozen_frame():
+            return int(self.duration * config.frame_rate)
+        return len(np.arange(0, self.duration, 1 / config.frame_rate))
+
+    def compile_animation_data(self, *animations, **play_kwargs):
+        result = super().compile_animation_data(*animations, **play_kwargs)
+        frames = self.play_frame_count()
+        self.frames_played += frames
+        if self.frame_slice is not None:
+            start, end = self.frame_slice
+            if self.frame_index >= end:
+                raise EndSceneEarlyException()
+            if self.frame_index + frames <= start and self.stop_condition is None:
+                self.renderer.skip_animations = True
+        return result
+
+    def play_internal(self, skip_rendering=False):
+        if self.frame_slice is None:
+            return super().play_internal(skip_rendering)
+        # Scene.play_internal, but always one update per frame, even when the
+        # renderer skips this animation, and rasterizing only inside the slice
+        start, end = self.frame_slice
+        self.duration = self.get_run_time(self.animations)
+        for t in np.arange(0, self.duration, 1 / config.frame_rate):
+            self.update_to_time(t)
+            if skip_rendering:
+                # a segment reused by SegmentCache: its movie already has the
+                # frames and play() advanced the clock, only count them
+                self.frame_index += 1
+            elif start <= self.frame_index < end and not self.renderer.skip_animations:
+                self.renderer.render(self, t, self.moving_mobjects)
+            else:
+                self.renderer.add_frame(None)
+            if self.stop_condition is not None and self.stop_condition():
+                break
+            if self.frame_index >= end:
+                break
+        for animation in self.animations:
+            animation.finish()
+            animation.clean_up_from_scene(self)
+        self.update_mobjects(0)
+        self.renderer.static_image = None
+
+
+def count_frames(module_name, scene_name, quality, media_dir):
+    """Frames of a full render, from a pass that skips every animation."""
+    cls = getattr(importlib.import_module(module_name), scene_name)
+    with tempfile.TemporaryDirectory() as images_dir, tempconfig(
+        {
+            "quality": quality,
+            "media_dir": media_dir,
+            "images_dir": images_dir,
+            "save_last_frame": True,
+            "write_to_movie": False,
+            "progress_bar": "none",
+        }
+    ):
+        scene = cls()
+        scene.render()
+        return scene.frames_played
+
+
+def slice_bounds(total, slices):
+    edges = np.linspace(0, total, slices + 1).round().astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def render_sliced(module_name, scene_name, quality="low_quality", media_dir="./media", slices=None, workers=None, output=None):
+    module = importlib.import_module(module_name)
+    if not issubclass(getattr(module, scene_name), TimeSlices):
+        raise ValueError(f"{scene_name} does not use the TimeSlices mixin")
+    slices = slices or os.cpu_count()
+
+    start = time.perf_counter()
+    with tempconfig({"quality": quality, "media_dir": media_dir}):
+        precompile_module(module)
+    with ProcessPoolExecutor(max_workers=workers or slices) as pool:
+        total = pool.submit(count_frames, module_name, scene_name, quality, media_dir).result()
+        bounds = slice_bounds(total, slices)
+        print(f"{scene_name}: {total} frames in {len(bounds)} slices", flush=True)
+        futures = {
+            pool.submit(
+                render_scene,
+                module_name,
+                scene_name,
+                quality,
+                media_dir,
+                {"frame_slice": bounds[i]},
+                # named after the bounds, so that manim's partial movie cache
+                # never mixes frames of different slicings
+                f"{scene_name}_{bounds[i][0]:06d}-{bounds[i][1]:06d}",
+            ): i
+            for i in range(len(bounds))
+        }
+        results = {}
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            print(f"done: frames {bounds[i][0]}-{bounds[i][1]} ({results[i][1]:.1f}s)", flush=True)
+
+    if output is None:
+        output = Path(media_dir) / "videos" / f"{scene_name}_{quality}_sliced.mp4"
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    concat_videos([results[i][0] for i in range(len(bounds))], output)
+    total_time = time.perf_counter() - start
+    print(f"{output} ({total_time:.1f}s, {sum(r[2] for r in results.values()):.1f}s cpu)")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render one scene as parallel time slices")
+    parser.add_argument("scene")
+    parser.add_argument("-m", "--module", default="scenes")
+    parser.add_argument("-n", "--slices", type=int, default=None, help="number of slices (default: cores)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="l")
+    parser.add_argument("-o", "--output", default=None)
+    parser.add_argument("--media-dir", default="./media")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    render_sliced(args.module, args.scene, QUALITIES[args.quality], args.media_dir, args.slices, args.workers, args.output)